@@ -0,0 +1,89 @@
+"""
+Django command to measure the time taken to build the Studio outline of a
+synthetic course, as the course outline requests it.
+
+The course is created in the split modulestore with the given number of
+sections, subsections per section, units per subsection and problems per unit
+(3,110 blocks with the defaults), published, and deleted afterwards.
+
+Example usage:
+    $ ./manage.py cms benchmark_course_outline --repeat 5
+"""
+from __future__ import absolute_import, division
+
+import time
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from edx_django_utils.cache import RequestCache
+from six.moves import range
+
+from contentstore.views.item import create_xblock_info
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    benchmark_course_outline command
+    """
+    help = "Measure the time taken to build the Studio outline of a synthetic course."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, default=10, help='Number of sections of the course.')
+        parser.add_argument('--subsections', type=int, default=10, help='Number of subsections of each section.')
+        parser.add_argument('--units', type=int, default=10, help='Number of units of each subsection.')
+        parser.add_argument('--problems', type=int, default=2, help='Number of problems of each unit.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of times the outline is built.')
+
+    def handle(self, *args, **options):
+        store = modulestore()
+        user_id = ModuleStoreEnum.UserID.mgmt_command
+        with store.default_store(ModuleStoreEnum.Type.split):
+            course = store.create_course(u'benchmark', uuid4().hex, u'outline', user_id)
+        try:
+            num_blocks = self._populate(store, course.location, user_id, options)
+            self.stdout.write(u'{} blocks.'.format(num_blocks))
+
+            self._build_outline(store, course.id)
+            start = time.time()
+            for _ in range(options['repeat']):
+                self._build_outline(store, course.id)
+            elapsed = (time.time() - start) / options['repeat']
+            self.stdout.write(u'{:.0f} ms per outline'.format(elapsed * 1000))
+        finally:
+            store.delete_course(course.id, user_id)
+
+    def _populate(self, store, course_location, user_id, options):
+        """
+        Creates and publishes the blocks of the course, and returns the number of blocks.
+        """
+        num_blocks = 1
+        with store.bulk_operations(course_location.course_key):
+            for _ in range(options['sections']):
+                section = store.create_child(user_id, course_location, 'chapter')
+                for _ in range(options['subsections']):
+                    subsection = store.create_child(user_id, section.location, 'sequential')
+                    for _ in range(options['units']):
+                        unit = store.create_child(user_id, subsection.location, 'vertical')
+                        for _ in range(options['problems']):
+                            store.create_child(user_id, unit.location, 'problem')
+                        num_blocks += 1 + options['problems']
+                    num_blocks += 1
+                num_blocks += 1
+        store.publish(course_location, user_id)
+        return num_blocks
+
+    def _build_outline(self, store, course_key):
+        """
+        Builds the outline of the course, as part of a new request.
+        """
+        RequestCache.clear_all_namespaces()
+        with store.bulk_operations(course_key):
+            course = store.get_course(course_key, depth=None)
+            create_xblock_info(
+                course,
+                include_child_info=True,
+                course_outline=True,
+                include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+            )
@@ -181,7 +181,7 @@ def is_currently_visible_to_students(xblock):
     return True
 
 
-def has_children_visible_to_specific_partition_groups(xblock):
+def has_children_visible_to_specific_partition_groups(xblock, course=None):
     """
     Returns True if this xblock has children that are limited to specific user partition groups.
     Note that this method is not recursive (it does not check grandchildren).
@@ -190,20 +190,25 @@ def has_children_visible_to_specific_partition_groups(xblock):
         return False
 
     for child in xblock.get_children():
-        if is_visible_to_specific_partition_groups(child):
+        if is_visible_to_specific_partition_groups(child, course=course):
             return True
 
     return False
 
 
-def is_visible_to_specific_partition_groups(xblock):
+def is_visible_to_specific_partition_groups(xblock, course=None, user_partitions=None):
     """
     Returns True if this xblock has visibility limited to specific user partition groups.
+
+    The user partition information of the xblock, as returned by get_user_partition_info, is
+    looked up unless it is given as user_partitions.
     """
     if not xblock.group_access:
         return False
 
-    for partition in get_user_partition_info(xblock):
+    if user_partitions is None:
+        user_partitions = get_user_partition_info(xblock, course=course)
+    for partition in user_partitions:
         if any(g["selected"] for g in partition["groups"]):
             return True
 
@@ -436,7 +441,7 @@ def get_user_partition_info(xblock, schemes=None, course=None):
     return partitions
 
 
-def get_visibility_partition_info(xblock, course=None):
+def get_visibility_partition_info(xblock, course=None, user_partitions=None):
     """
     Retrieve user partition information for the component visibility editor.
 
@@ -449,12 +454,24 @@ def get_visibility_partition_info(xblock, course=None):
             instead of loading the course.  This is useful if we're calling this function multiple
             times for the same course want to minimize queries to the modulestore.
 
+        user_partitions (list): The user partition information of the component, as returned by
+            get_user_partition_info without schemes.  If provided, the partitions of each scheme are
+            taken from it instead of being looked up again.
+
     Returns: dict
 
     """
+    def get_partitions(scheme):
+        """
+        Returns the user partition information of the component for the given scheme.
+        """
+        if user_partitions is None:
+            return get_user_partition_info(xblock, schemes=[scheme], course=course)
+        return [partition for partition in user_partitions if partition["scheme"] == scheme]
+
     selectable_partitions = []
     # We wish to display enrollment partitions before cohort partitions.
-    enrollment_user_partitions = get_user_partition_info(xblock, schemes=["enrollment_track"], course=course)
+    enrollment_user_partitions = get_partitions("enrollment_track")
 
     # For enrollment partitions, we only show them if there is a selected group or
     # or if the number of groups > 1.
@@ -465,10 +482,10 @@ def get_visibility_partition_info(xblock, course=None):
     course_key = xblock.scope_ids.usage_id.course_key
     is_library = isinstance(course_key, LibraryLocator)
     if not is_library and ContentTypeGatingConfig.current(course_key=course_key).studio_override_enabled:
-        selectable_partitions += get_user_partition_info(xblock, schemes=[CONTENT_TYPE_GATING_SCHEME], course=course)
+        selectable_partitions += get_partitions(CONTENT_TYPE_GATING_SCHEME)
 
     # Now add the cohort user partitions.
-    selectable_partitions = selectable_partitions + get_user_partition_info(xblock, schemes=["cohort"], course=course)
+    selectable_partitions = selectable_partitions + get_partitions("cohort")
 
     # Find the first partition with a selected group. That will be the one initially enabled in the dialog
     # (if the course has only been added in Studio, only one partition should have a selected group).
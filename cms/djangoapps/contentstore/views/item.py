@@ -33,7 +33,8 @@ from contentstore.utils import (
     get_visibility_partition_info,
     has_children_visible_to_specific_partition_groups,
     is_currently_visible_to_students,
-    is_self_paced
+    is_self_paced,
+    is_visible_to_specific_partition_groups
 )
 from contentstore.views.helpers import (
     create_xblock,
@@ -1283,10 +1284,12 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
             else:
                 xblock_info['staff_only_message'] = False
 
-            xblock_info['has_partition_group_components'] = has_children_visible_to_specific_partition_groups(
-                xblock
+            xblock_info['has_partition_group_components'] = _has_partition_group_components(
+                xblock, child_info, course
             )
-        xblock_info['user_partition_info'] = get_visibility_partition_info(xblock, course=course)
+        xblock_info['user_partition_info'] = get_visibility_partition_info(
+            xblock, course=course, user_partitions=user_partitions
+        )
 
     return xblock_info
 
@@ -1452,6 +1455,19 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
     return child_info
 
 
+def _has_partition_group_components(xblock, child_info, course):
+    """
+    Returns whether the xblock has children limited to specific user partition groups, reusing the
+    user partition information of the children if their info has been created.
+    """
+    if child_info and 'children' in child_info:
+        return any(
+            is_visible_to_specific_partition_groups(child, course=course, user_partitions=info['user_partitions'])
+            for child, info in zip(xblock.get_children(), child_info['children'])
+        )
+    return has_children_visible_to_specific_partition_groups(xblock, course=course)
+
+
 def _get_release_date(xblock, user=None):
     """
     Returns the release date for the xblock, or None if the release date has never been set.
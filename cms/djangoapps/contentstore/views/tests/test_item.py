@@ -52,6 +52,7 @@ from xmodule.course_module import DEFAULT_START_DATE
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.split_mongo.split_draft import DraftVersioningModuleStore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, LibraryFactory, check_mongo_calls
 from xmodule.partitions.partitions import (
@@ -2525,6 +2526,73 @@ class TestXBlockInfo(ItemTest):
             with check_mongo_calls(chapter_queries_1):
                 self.client.get(outline_url, HTTP_ACCEPT='application/json')
 
+    def test_course_outline_has_changes_checked_once(self):
+        """
+        The changes of each block are checked once for the whole course outline, instead of once
+        for each ancestor of the block.
+        """
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            course = CourseFactory.create()
+            for __ in range(2):
+                chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+                for __ in range(2):
+                    sequential = ItemFactory.create(parent_location=chapter.location, category='sequential')
+                    vertical = ItemFactory.create(parent_location=sequential.location, category='vertical')
+                    ItemFactory.create(parent_location=vertical.location, category='problem')
+            self.store.publish(course.location, self.user.id)
+            course = self.store.get_course(course.id, depth=None)
+
+            with patch.object(
+                DraftVersioningModuleStore,
+                '_get_version',
+                autospec=True,
+                side_effect=DraftVersioningModuleStore._get_version,
+            ) as mock_get_version:
+                xblock_info = create_xblock_info(
+                    course,
+                    include_child_info=True,
+                    course_outline=True,
+                    include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+                )
+
+        self.assertFalse(xblock_info['has_changes'])
+        # The draft and published versions of the course, its 2 chapters and their 4 sequentials, units and
+        # problems are compared once.
+        self.assertEqual(mock_get_version.call_count, 2 * 15)
+
+    def test_course_outline_partition_group_components(self):
+        """
+        The blocks of the course outline with children restricted to groups are flagged.
+        """
+        self.course.user_partitions = [
+            UserPartition(
+                MINIMUM_STATIC_PARTITION_ID, 'Cohorts', 'Cohort partition',
+                [Group(1, 'alpha'), Group(2, 'beta')], scheme_id='cohort',
+            )
+        ]
+        self.store.update_item(self.course, self.user.id)
+        ItemFactory.create(
+            parent_location=self.sequential.location, category='vertical', display_name='Unit 2',
+            user_id=self.user.id, group_access={MINIMUM_STATIC_PARTITION_ID: [1]},
+        )
+        course = modulestore().get_course(self.course.id, depth=None)
+
+        xblock_info = create_xblock_info(
+            course,
+            include_child_info=True,
+            course_outline=True,
+            include_children_predicate=lambda xblock: not xblock.category == 'vertical',
+        )
+        chapter_info = xblock_info['child_info']['children'][0]
+        sequential_info = chapter_info['child_info']['children'][0]
+        self.assertFalse(chapter_info['has_partition_group_components'])
+        self.assertTrue(sequential_info['has_partition_group_components'])
+        unit_infos = sequential_info['child_info']['children']
+        self.assertEqual(
+            [unit_info['user_partition_info']['selected_groups_label'] for unit_info in unit_infos],
+            ['', 'alpha'],
+        )
+
     def test_entrance_exam_chapter_xblock_info(self):
         chapter = ItemFactory.create(
             parent_location=self.course.location, category='chapter', display_name="Entrance Exam",
@@ -240,6 +240,10 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
     else:
         CODE_JAIL[name] = value
 
+CODE_JAIL_POOL.update(ENV_TOKENS.get("CODE_JAIL_POOL", {}))
+SAFE_EXEC_LOCAL_CACHE_SIZE = ENV_TOKENS.get("SAFE_EXEC_LOCAL_CACHE_SIZE", SAFE_EXEC_LOCAL_CACHE_SIZE)
+PARSED_PROBLEM_CACHE_SIZE = ENV_TOKENS.get("PARSED_PROBLEM_CACHE_SIZE", PARSED_PROBLEM_CACHE_SIZE)
+
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
@@ -404,6 +408,18 @@ XBLOCK_FIELD_DATA_WRAPPERS = ENV_TOKENS.get(
 
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
+
+CONTENTSERVER_STREAM_ASSETS = ENV_TOKENS.get('CONTENTSERVER_STREAM_ASSETS', CONTENTSERVER_STREAM_ASSETS)
+CONTENTSERVER_SENDFILE_ROOT = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_ROOT', CONTENTSERVER_SENDFILE_ROOT)
+CONTENTSERVER_SENDFILE_URL = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_URL', CONTENTSERVER_SENDFILE_URL)
+CONTENTSERVER_SENDFILE_MAX_SIZE = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_MAX_SIZE', CONTENTSERVER_SENDFILE_MAX_SIZE)
+CONTENTSERVER_SENDFILE_MIN_REQUESTS = ENV_TOKENS.get(
+    'CONTENTSERVER_SENDFILE_MIN_REQUESTS', CONTENTSERVER_SENDFILE_MIN_REQUESTS
+)
+CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE', CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE
+)
+
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
 DATADOG.update(ENV_TOKENS.get("DATADOG", {}))
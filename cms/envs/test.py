@@ -182,6 +182,9 @@ CACHES = {
     },
 }
 
+# Structures cached locally would persist across tests.
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = 0
+
 ################################# CELERY ######################################
 
 CELERY_ALWAYS_EAGER = True
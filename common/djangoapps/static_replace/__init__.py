@@ -2,6 +2,9 @@ from __future__ import absolute_import
 
 import logging
 import re
+import threading
+from collections import OrderedDict
+
 import six
 from six import text_type
 
@@ -16,6 +19,9 @@ from opaque_keys.edx.locator import AssetLocator
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# Number of staticfiles_storage lookups remembered by each process.
+STATICFILES_LOOKUP_CACHE_SIZE = 5000
+
 
 def _url_replace_regex(prefix):
     """
@@ -33,13 +39,79 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+class StaticfilesLookupCache(object):
+    """
+    Remembers the results of staticfiles_storage lookups, which are the same
+    until the static files are collected again, in a least recently used
+    cache of at most `max_size` entries.
+
+    The cache is emptied when staticfiles_storage or STATIC_URL changes.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._storage = None
+        self._static_url = None
+
+    def exists(self, path):
+        """
+        Returns staticfiles_storage.exists(path).
+        """
+        return self._lookup('exists', path)
+
+    def url(self, path):
+        """
+        Returns staticfiles_storage.url(path).
+        """
+        return self._lookup('url', path)
+
+    def clear(self):
+        """
+        Forgets all the lookups.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, method, path):
+        """
+        Returns the cached result of `method` of staticfiles_storage for
+        `path`, calling it if it isn't cached.  Exceptions aren't cached.
+        """
+        if settings.DEBUG:
+            # Static files are added while developing.
+            return getattr(staticfiles_storage, method)(path)
+
+        key = (method, path)
+        with self._lock:
+            if self._storage is not staticfiles_storage or self._static_url != settings.STATIC_URL:
+                self._entries.clear()
+                self._storage = staticfiles_storage
+                self._static_url = settings.STATIC_URL
+            elif key in self._entries:
+                result = self._entries.pop(key)
+                self._entries[key] = result
+                return result
+
+        result = getattr(staticfiles_storage, method)(path)
+
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return result
+
+
+staticfiles_lookups = StaticfilesLookupCache(STATICFILES_LOOKUP_CACHE_SIZE)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
     a dead link instead of raising an exception.
     """
     try:
-        url = staticfiles_storage.url(path)
+        url = staticfiles_lookups.url(path)
     except Exception as err:
         log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
             path, str(err)))
@@ -112,28 +184,38 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        if _is_xblock_resource_url(prefix + rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
+    return re.sub(_static_url_prefix_regex(data_dir), wrap_part_extraction, text)
+
+
+def _static_url_prefix_regex(data_dir):
+    """
+    Returns the regex matching the prefix of static urls which aren't in
+    `data_dir`.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
     )
 
 
+def _is_xblock_resource_url(full_url):
+    """
+    Returns whether `full_url` is an XBlock resource link, which is not
+    rewritten.
+    """
+    # Probably wasn't a good idea that /static works for actual static assets
+    # and for magical course asset URLs....
+    starts_with_static_url = full_url.startswith(six.text_type(settings.STATIC_URL))
+    starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
+
+
 def make_static_urls_absolute(request, html):
     """
     Converts relative URLs referencing static assets to absolute URLs
@@ -170,63 +252,161 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     if static_paths_out is None:
         static_paths_out = []
 
-    def replace_static_url(original, prefix, quote, rest):
+    return process_static_urls(
+        text,
+        _StaticUrlReplacer(data_directory, course_id, static_asset_path, static_paths_out),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_urls(text, data_directory=None, course_id=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Does the replacements of replace_static_urls, replace_course_urls and
+    replace_jump_to_id_urls at once, in a single scan of `text`.
+
+    For well-formed HTML, this returns the same text as applying the three
+    in turn, which each scan the whole text.  The urls of the course are
+    only replaced if `course_id` is given, and the jump_to_id urls if
+    `jump_to_id_base_url` is.
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    jump_to_id_base_url: The base of the jump_to_id urls (see replace_jump_to_id_urls)
+    """
+    data_dir = static_asset_path or data_directory
+    regex = _get_combined_url_regex(data_dir, course_id is not None, jump_to_id_base_url is not None)
+    replace_static_url = _StaticUrlReplacer(data_directory, course_id, static_asset_path, [])
+    course_url_base = u'/courses/{}/'.format(text_type(course_id))
+
+    def replace_url(match):
+        """
+        Replaces a single matched url, of any of the three kinds.
+        """
+        original = match.group(0)
+        quote = match.group('quote')
+        rest = match.group('rest')
+        prefix = match.group('prefix')
+        if prefix is not None:
+            if _is_xblock_resource_url(prefix + rest):
+                return original
+            return replace_static_url(original, prefix, quote, rest)
+        elif match.group('course_prefix') is not None:
+            return u"".join([quote, course_url_base, rest, quote])
+        return u"".join([quote, jump_to_id_base_url + rest, quote])
+
+    return regex.sub(replace_url, text)
+
+
+# The regexes of replace_urls, by STATIC_URL and arguments.
+_combined_url_regexes = {}
+
+
+def _get_combined_url_regex(data_dir, course_urls, jump_to_id_urls):
+    """
+    Returns the compiled regex matching the urls replaced by replace_urls:
+    static urls, and optionally course and jump_to_id urls.
+    """
+    key = (settings.STATIC_URL, data_dir, course_urls, jump_to_id_urls)
+    regex = _combined_url_regexes.get(key)
+    if regex is None:
+        prefixes = [u'(?P<prefix>{})'.format(_static_url_prefix_regex(data_dir))]
+        if course_urls:
+            prefixes.append(u'(?P<course_prefix>/course/)')
+        if jump_to_id_urls:
+            prefixes.append(u'(?P<jump_to_id_prefix>/jump_to_id/)')
+        regex = re.compile(
+            u"""
+            (?P<quote>\\\\?['"])      # the opening quotes
+            (?:{prefixes})            # the prefix of any kind of url
+            (?P<rest>.*?)             # everything else in the url
+            (?P=quote)                # the first matching closing quote
+            """.format(prefixes=u'|'.join(prefixes)),
+            re.VERBOSE
+        )
+        _combined_url_regexes[key] = regex
+    return regex
+
+
+class _StaticUrlReplacer(object):
+    """
+    Replaces single static urls matched by process_static_urls, as described
+    by replace_static_urls.
+    """
+    def __init__(self, data_directory, course_id, static_asset_path, static_paths_out):
+        self.data_directory = data_directory
+        self.course_id = course_id
+        self.static_asset_path = static_asset_path
+        self.static_paths_out = static_paths_out
+        self._asset_config = None
+
+    def __call__(self, original, prefix, quote, rest):
         """
         Replace a single matched url.
         """
         original_uri = "".join([prefix, rest])
         # Don't mess with things that end in '?raw'
         if rest.endswith('?raw'):
-            static_paths_out.append((original_uri, original_uri))
+            self.static_paths_out.append((original_uri, original_uri))
             return original
 
         # In debug mode, if we can find the url as is,
         if settings.DEBUG and finders.find(rest, True):
-            static_paths_out.append((original_uri, original_uri))
+            self.static_paths_out.append((original_uri, original_uri))
             return original
 
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
-        elif (not static_asset_path) and course_id:
+        elif (not self.static_asset_path) and self.course_id:
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
             exists_in_staticfiles_storage = False
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                exists_in_staticfiles_storage = staticfiles_lookups.exists(rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
 
             if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
+                url = staticfiles_lookups.url(rest)
             else:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
-                # Import is placed here to avoid model import at project startup.
-                from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
+                base_url, excluded_exts = self._get_asset_config()
+                url = StaticContent.get_canonicalized_asset_path(self.course_id, rest, base_url, excluded_exts)
 
                 if AssetLocator.CANONICAL_NAMESPACE in url:
                     url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
-            course_path = "/".join((static_asset_path or data_directory, rest))
+            course_path = "/".join((self.static_asset_path or self.data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
+                if staticfiles_lookups.exists(rest):
+                    url = staticfiles_lookups.url(rest)
                 else:
-                    url = staticfiles_storage.url(course_path)
+                    url = staticfiles_lookups.url(course_path)
             # And if that fails, assume that it's course content, and add manually data directory
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
                 url = "".join([prefix, course_path])
 
-        static_paths_out.append((original_uri, url))
+        self.static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    def _get_asset_config(self):
+        """
+        Returns the base url and the excluded extensions of course assets,
+        read once for all the urls of the text.
+        """
+        if self._asset_config is None:
+            # Import is placed here to avoid model import at project startup.
+            from static_replace.models import AssetBaseUrlConfig, AssetExcludedExtensionsConfig
+            self._asset_config = (
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            )
+        return self._asset_config
@@ -0,0 +1,103 @@
+"""
+Django command to measure the time taken to rewrite the urls of the HTML of
+each vertical of a course, as done when rendering it in the LMS.
+
+The HTML of the blocks of each vertical is rewritten by replace_urls, in a
+single pass, and by replace_static_urls, replace_course_urls and
+replace_jump_to_id_urls in turn, without the staticfiles lookups remembered
+from previous verticals, as they were before replace_urls.
+
+Example usage:
+    $ ./manage.py lms benchmark_url_replacement course-v1:edX+DemoX+Demo_Course --repeat 20
+"""
+from __future__ import absolute_import, division
+
+import time
+
+import six
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six.moves import range
+
+from static_replace import (
+    replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls,
+    staticfiles_lookups
+)
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    benchmark_url_replacement command
+    """
+    help = "Measure the time taken to rewrite the urls of the HTML of each vertical of a course."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help='ID of the course whose HTML is rewritten.')
+        parser.add_argument('--repeat', type=int, default=10, help='Number of times each vertical is rewritten.')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course ID: {}'.format(options['course_id']))
+
+        store = modulestore()
+        course = store.get_course(course_key)
+        if course is None:
+            raise CommandError(u'Course not found: {}'.format(options['course_id']))
+
+        verticals = [
+            self._vertical_html(vertical)
+            for vertical in store.get_items(course_key, qualifiers={'category': 'vertical'})
+        ]
+        if not verticals:
+            raise CommandError(u'The course has no verticals.')
+
+        kwargs = {
+            'data_directory': getattr(course, 'data_dir', None),
+            'course_id': course_key,
+            'static_asset_path': course.static_asset_path,
+        }
+        jump_to_id_base_url = u'/courses/{}/jump_to_id/'.format(six.text_type(course_key))
+
+        def replace_in_passes(html):
+            """
+            Rewrites the urls as the LMS used to, with a pass for each kind.
+            """
+            staticfiles_lookups.clear()
+            html = replace_static_urls(html, **kwargs)
+            html = replace_course_urls(html, course_key)
+            return replace_jump_to_id_urls(html, course_key, jump_to_id_base_url)
+
+        def replace_in_single_pass(html):
+            """
+            Rewrites the urls as the LMS does.
+            """
+            return replace_urls(html, jump_to_id_base_url=jump_to_id_base_url, **kwargs)
+
+        self.stdout.write(u'{} verticals, {} characters of HTML on average.'.format(
+            len(verticals), sum(len(html) for html in verticals) // len(verticals)
+        ))
+        for name, replace in (('Separate passes', replace_in_passes), ('Single pass', replace_in_single_pass)):
+            for html in verticals:
+                replace(html)
+            start = time.time()
+            for _ in range(options['repeat']):
+                for html in verticals:
+                    replace(html)
+            elapsed = (time.time() - start) / (options['repeat'] * len(verticals))
+            self.stdout.write(u'{}: {:.3f} ms per vertical'.format(name, elapsed * 1000))
+
+    def _vertical_html(self, vertical):
+        """
+        Returns the HTML of the blocks of `vertical`, as stored.
+        """
+        return u''.join(
+            child.data for child in vertical.get_children()
+            if isinstance(getattr(child, 'data', None), six.string_types)
+        )
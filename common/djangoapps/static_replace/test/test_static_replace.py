@@ -19,7 +19,9 @@ from static_replace import (
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -201,6 +203,47 @@ def test_static_paths_out(mock_modulestore, mock_storage):
     assert static_paths == [(static_url, static_course_url), (raw_url, raw_url)]
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_storage_lookups_cached(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.abc123.png'
+
+    for _ in range(2):
+        assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY) == '"/static/file.abc123.png"'
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+@pytest.mark.django_db
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('xmodule.modulestore.django.modulestore', autospec=True)
+def test_replace_urls(mock_modulestore, mock_storage):
+    """
+    Make sure that replace_urls replaces the urls as replace_static_urls,
+    replace_course_urls and replace_jump_to_id_urls do in turn.
+    """
+    mock_storage.exists.return_value = False
+    mock_modulestore.return_value = Mock(MongoModuleStore)
+    jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+    pre_text = (
+        '<img src="/static/file.png"/><a href=\'/course/info\'>Info</a>'
+        '<a href="/jump_to_id/intro">Intro</a><a href="/static/foo.png?raw">'
+        '<img src="/static/xblock/resources/babys_first.lil_xblock/public/images/pacifier.png"/>'
+    )
+    post_text = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        jump_to_id_base_url,
+    )
+    assert post_text != pre_text
+    assert replace_urls(pre_text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url=jump_to_id_base_url) == post_text
+
+    # Without a jump_to_id base url, only the static and course urls are replaced.
+    assert replace_urls(pre_text, DATA_DIRECTORY, COURSE_KEY) == \
+        replace_course_urls(replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY)
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
@@ -1618,10 +1618,10 @@ class CourseEnrollment(models.Model):
         We try to preload all CourseOverviews, which are usually lazily loaded
         as the .course_overview property. This is to avoid making an extra
         query for every enrollment when displaying something like the student
-        dashboard. If some of the CourseOverviews are not found, we make no
-        attempt to initialize them -- we just fall back to existing lazy-load
-        behavior. The goal is to optimize the most common case as simply as
-        possible, without changing any of the existing contracts.
+        dashboard. The CourseOverviews are loaded with their image sets and
+        tabs, and outdated ones are updated in the background instead of
+        during the request. If some of the CourseOverviews can't be loaded, we
+        just fall back to existing lazy-load behavior.
 
         The name of this method is long, but was the end result of hashing out a
         number of alternatives, so pylint can stuff it (disable=invalid-name)
@@ -1632,7 +1632,7 @@ class CourseEnrollment(models.Model):
         else:
             enrollments = cls.enrollments_for_user(user)
 
-        overviews = CourseOverview.get_from_ids_if_exists(
+        overviews = CourseOverview.get_from_ids(
             enrollment.course_id for enrollment in enrollments
         )
         for enrollment in enrollments:
@@ -26,3 +26,8 @@ class BaseBackend(six.with_metaclass(abc.ABCMeta, object)):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_batch(self, events):
+        """Send a list of events to tracker."""
+        for event in events:
+            self.send(event)
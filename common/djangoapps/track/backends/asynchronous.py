@@ -0,0 +1,160 @@
+"""
+Event tracker backend that sends events to another backend in batches, from
+a background thread.
+
+Sending an event only puts it in a bounded in-process queue, so it doesn't
+add the time taken by the wrapped backend to serialize and write the event to
+the request.  A background thread takes the events off the queue and sends
+them to the wrapped backend in batches, with its `send_batch` method.  When
+the queue is full, events are dropped rather than blocking requests.
+
+Example configuration::
+
+  TRACKING_BACKENDS = {
+      'logger': {
+          'ENGINE': 'track.backends.asynchronous.AsyncBackend',
+          'OPTIONS': {
+              'backend': {
+                  'ENGINE': 'track.backends.logger.LoggerBackend',
+                  'OPTIONS': {'name': 'tracking'},
+              },
+              'max_queue_size': 10000,
+              'max_batch_size': 100,
+          }
+      }
+  }
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from six.moves import queue
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# How long to wait at exit for the queued events to be sent, in seconds.
+EXIT_FLUSH_TIMEOUT = 5
+
+
+class AsyncBackend(BaseBackend):
+    """
+    Event tracker backend that sends events to another backend in batches,
+    from a background thread.
+    """
+
+    def __init__(self, backend, max_queue_size=10000, max_batch_size=100, **kwargs):
+        """
+        Wrap an event tracker backend.
+
+        :Parameters:
+
+          - `backend`: configuration of the wrapped backend, a dict with
+            the 'ENGINE' and 'OPTIONS' keys, as in TRACKING_BACKENDS
+          - `max_queue_size`: number of events which can wait to be sent,
+            after which events are dropped
+          - `max_batch_size`: maximum number of events sent at once to the
+            wrapped backend
+
+        """
+        super(AsyncBackend, self).__init__(**kwargs)
+
+        # Imported here, as the tracker instantiates the backends on import.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.sent = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+    def send(self, event):
+        """Queue the event, or drop it if the queue is full."""
+        self._start()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def send_batch(self, events):
+        for event in events:
+            self.send(event)
+
+    def flush(self, timeout=None):
+        """
+        Wait until the queued events have been sent, for at most `timeout`
+        seconds.  Return whether they all were.
+        """
+        if self._queue is None:
+            return True
+        deadline = None if timeout is None else time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_stats(self):
+        """
+        Return the numbers of events sent to the wrapped backend, dropped,
+        and waiting in the queue.
+        """
+        return {
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'backlog': self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def _start(self):
+        """
+        Start the background thread, if it isn't running in this process.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Either the first event, or the first event since this process
+            # was forked, without the thread of its parent.
+            self._queue = queue.Queue(self.max_queue_size)
+            self._thread = threading.Thread(target=self._run, name='track-async-backend')
+            self._thread.daemon = True
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self.flush, EXIT_FLUSH_TIMEOUT)
+
+    def _run(self):
+        """
+        Send the queued events to the wrapped backend, in batches.
+        """
+        event_queue = self._queue
+        while True:
+            events = [event_queue.get()]
+            while len(events) < self.max_batch_size:
+                try:
+                    events.append(event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.backend.send_batch(events)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Error sending %d events to the tracker backend', len(events))
+            else:
+                with self._lock:
+                    self.sent += len(events)
+            finally:
+                for _ in events:
+                    event_queue.task_done()
@@ -99,3 +99,13 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_batch(self, events):
+        """Insert the events in to the Mongo collection at once"""
+        try:
+            # Unlike insert_many, insert doesn't add an _id to the events,
+            # which may be shared with other backends.
+            self.collection.insert(events, manipulate=False, continue_on_error=True)
+        except (PyMongoError, BSONError):
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
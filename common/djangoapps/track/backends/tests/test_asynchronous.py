@@ -0,0 +1,70 @@
+"""Tests for the asynchronous event tracker backend."""
+
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+
+from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
+
+
+class InMemoryBackend(BaseBackend):
+    """A backend recording the batches of events it receives."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        super(InMemoryBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+        InMemoryBackend.instances.append(self)
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        self.unblocked.wait()
+        self.batches.append(list(events))
+
+
+class TestAsyncBackend(TestCase):
+    """Tests for AsyncBackend."""
+
+    def setUp(self):
+        super(TestAsyncBackend, self).setUp()
+        self.backend = AsyncBackend(
+            backend={'ENGINE': 'track.backends.tests.test_asynchronous.InMemoryBackend'},
+            max_queue_size=3,
+            max_batch_size=2,
+        )
+        self.wrapped = InMemoryBackend.instances[-1]
+        self.addCleanup(self.wrapped.unblocked.set)
+
+    def test_send(self):
+        events = [{'test': index} for index in range(3)]
+        for event in events:
+            self.backend.send(event)
+        self.assertTrue(self.backend.flush(timeout=5))
+
+        received = [event for batch in self.wrapped.batches for event in batch]
+        self.assertEqual(received, events)
+        self.assertTrue(all(len(batch) <= 2 for batch in self.wrapped.batches))
+        self.assertEqual(self.backend.get_stats(), {'sent': 3, 'dropped': 0, 'backlog': 0})
+
+    def test_drop_when_full(self):
+        self.wrapped.unblocked.clear()
+        self.backend.send({'test': 0})
+        # Wait for the background thread to take the first event off the queue.
+        while self.backend.get_stats()['backlog']:
+            pass
+        for index in range(1, 6):
+            self.backend.send({'test': index})
+        self.assertEqual(self.backend.get_stats(), {'sent': 0, 'dropped': 2, 'backlog': 3})
+        self.assertFalse(self.backend.flush(timeout=0.1))
+
+        self.wrapped.unblocked.set()
+        self.assertTrue(self.backend.flush(timeout=5))
+        self.assertEqual(self.backend.get_stats(), {'sent': 4, 'dropped': 2, 'backlog': 0})
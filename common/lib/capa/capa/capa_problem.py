@@ -29,6 +29,7 @@ from pytz import UTC
 
 import capa.customrender as customrender
 import capa.inputtypes as inputtypes
+import capa.parsed_problem_cache as parsed_problem_cache
 import capa.responsetypes as responsetypes
 import capa.xqueue_interface as xqueue_interface
 from capa.correctmap import CorrectMap
@@ -181,10 +182,9 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        # parse problem XML file into an element tree, or copy the tree of a
+        # previous problem with the same XML
+        self.tree = parsed_problem_cache.get_tree(problem_text, self._parse_problem_text)
 
         # handle any <include file="foo"> tags
         self._process_includes()
@@ -220,6 +220,15 @@ class LoncapaProblem(object):
             if extract_tree:
                 self.extracted_tree = self._extract_html(self.tree)
 
+    def _parse_problem_text(self, problem_text):
+        """
+        Parses the problem XML into an element tree, compatible with the
+        current formats of the tags.
+        """
+        tree = etree.XML(problem_text)
+        self.make_xml_compatible(tree)
+        return tree
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -840,11 +849,15 @@ class LoncapaProblem(object):
         variables for problem answer checking.
 
         Problem XML goes to Python execution context. Runs everything in script tags.
+
+        The scripts get the anonymous student id, unless they all opt out with a
+        student_specific="false" attribute, so that their results can be cached
+        for all learners.
         """
         context = {}
         context['seed'] = self.seed
-        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
         all_code = ''
+        student_specific = False
 
         python_path = []
 
@@ -865,6 +878,8 @@ class LoncapaProblem(object):
             XMLESC = {"&apos;": "'", "&quot;": '"'}
             code = unescape(script.text, XMLESC)
             all_code += code
+            if script.get('student_specific', 'true').lower() != 'false':
+                student_specific = True
 
         extra_files = []
         if all_code:
@@ -874,6 +889,9 @@ class LoncapaProblem(object):
                 extra_files.append(("python_lib.zip", zip_lib))
                 python_path.append("python_lib.zip")
 
+            if student_specific:
+                context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+
             try:
                 safe_exec(
                     all_code,
@@ -890,6 +908,8 @@ class LoncapaProblem(object):
                 msg = Text("Error while executing script code: %s" % str(err))
                 raise responsetypes.LoncapaProblemError(msg)
 
+        context['anonymous_student_id'] = self.capa_system.anonymous_student_id
+
         # Store code source in context, along with the Python path needed to run it correctly.
         context['script_code'] = all_code
         context['python_path'] = python_path
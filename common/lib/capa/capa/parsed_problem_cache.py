@@ -0,0 +1,114 @@
+"""
+A per-process cache of parsed problem XML.
+
+Constructing a LoncapaProblem starts with parsing its XML into an element
+tree, and making it compatible with the current tag formats.  None of this
+depends on the learner or the seed, and a process builds the same problems
+over and over (for each learner, and on each render or check), so the
+resulting trees are cached here, keyed by a hash of the XML.  Each problem
+gets its own copy of the cached tree, since the later stages of the
+construction modify it.
+
+The cache is bounded by the total length of the cached XML, a proxy for the
+memory taken by the trees.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+import six
+
+# Total length of the XML of the problems cached by each process, by default.
+DEFAULT_MAX_SIZE = 5 * 1024 * 1024
+
+
+class ParsedProblemCache(object):
+    """
+    A least recently used cache of parsed problem trees, holding problems
+    whose XML adds up to at most `max_size` characters.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.parse_time_saved = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_tree(self, problem_text, parse):
+        """
+        Returns a copy of the tree cached for `problem_text`, or the tree
+        returned by `parse(problem_text)`, caching it.
+        """
+        key = hashlib.sha1(six.ensure_binary(problem_text)).hexdigest()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+                self.hits += 1
+                self.parse_time_saved += entry[1]
+        if entry is not None:
+            return deepcopy(entry[0])
+
+        start = time.time()
+        tree = parse(problem_text)
+        parse_time = time.time() - start
+
+        with self._lock:
+            self.misses += 1
+            if len(problem_text) <= self.max_size and key not in self._entries:
+                self._entries[key] = (deepcopy(tree), parse_time, len(problem_text))
+                self.size += len(problem_text)
+                while self.size > self.max_size:
+                    _, (_, _, size) = self._entries.popitem(last=False)
+                    self.size -= size
+        return tree
+
+    def get_stats(self):
+        """
+        Returns the numbers of hits and misses, the number of cached problems,
+        their total size, and the parsing time saved by the hits in seconds.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'size': self.size,
+                'parse_time_saved': self.parse_time_saved,
+            }
+
+
+_cache = ParsedProblemCache(DEFAULT_MAX_SIZE)
+
+
+def get_tree(problem_text, parse):
+    """
+    Returns the tree of `problem_text`, parsed by `parse(problem_text)`
+    unless it is cached (see ParsedProblemCache.get_tree).
+    """
+    if _cache.max_size <= 0:
+        return parse(problem_text)
+    return _cache.get_tree(problem_text, parse)
+
+
+def configure_cache(max_size):
+    """
+    Replaces the cache of this process by one holding up to `max_size`
+    characters of XML.  0 disables the cache.
+    """
+    global _cache  # pylint: disable=global-statement
+    _cache = ParsedProblemCache(max_size)
+
+
+def get_cache_stats():
+    """
+    Returns the statistics of the cache of this process.
+    """
+    return _cache.get_stats()
@@ -1,3 +1,4 @@
 """Capa's specialized use of codejail.safe_exec."""
 
-from .safe_exec import safe_exec, update_hash
+from .result_cache import get_cache_stats, get_problem_cache_stats
+from .safe_exec import configure_local_cache, configure_sandbox_pool, safe_exec, update_hash
@@ -0,0 +1,233 @@
+"""
+Caching of safe_exec results.
+
+Results are cached in two levels: a bounded, per-process LRU cache (once
+enabled with configure_local_cache()) in front of the cache given to
+safe_exec, in practice the shared Django cache.  The most used results then
+don't even need a round trip to the shared cache.
+
+Keys are content-addressed.  They are made of the digest of the script (its
+code, and the names and contents of the files it can import), and of the
+digest of the inputs of an execution (the random seed and the globals), so all
+the executions of a script with the same inputs share a result, whichever
+problem and learner they are for.
+Failures are cached as well as successes, so that broken scripts aren't run
+over and over.
+
+Hits and misses are counted per problem (the `slug` given to safe_exec), see
+get_cache_stats().
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import six
+
+# Maximum number of problems for which statistics are kept by each process.
+STATS_MAX_SLUGS = 1000
+
+
+class LRUCache(object):
+    """
+    A thread-safe dict-like cache holding up to `max_entries` entries, which
+    evicts the least recently used entries first.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns the value cached for `key`, or None.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Caches `value` for `key`.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self):
+        """
+        Returns a list of the (key, value) entries, least recently used first.
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_local_results = None
+_stats = LRUCache(STATS_MAX_SLUGS)
+_stats_lock = threading.Lock()
+
+
+def update_hash(hasher, obj):
+    """
+    Update a `hashlib` hasher with a nested object.
+
+    To properly cache nested structures, we need to compute a hash from the
+    entire structure, canonicalizing at every level.
+
+    `hasher`'s `.update()` method is called a number of times, touching all of
+    `obj` in the process.  Only primitive JSON-safe types are supported.
+
+    """
+    hasher.update(str(type(obj)))
+    if isinstance(obj, (tuple, list)):
+        for e in obj:
+            update_hash(hasher, e)
+    elif isinstance(obj, dict):
+        for k in sorted(obj):
+            update_hash(hasher, k)
+            update_hash(hasher, obj[k])
+    else:
+        hasher.update(repr(obj))
+
+
+def script_digest(code, python_path, extra_files, unsafely):
+    """
+    Returns the digest of a script: its code, the files it can import, and
+    whether it runs in the sandbox.
+    """
+    md5er = hashlib.md5()
+    md5er.update(repr(code))
+    update_hash(md5er, [list(python_path or ()), bool(unsafely)])
+    for name, contents in extra_files or ():
+        md5er.update(repr(name))
+        md5er.update(hashlib.md5(six.ensure_binary(contents)).hexdigest())
+    return md5er.hexdigest()
+
+
+def cache_key(script_digest_value, random_seed, safe_globals):
+    """
+    Returns the key of the result of running the script with the given digest
+    with the given random seed and (JSON-safe) globals.
+    """
+    md5er = hashlib.md5()
+    update_hash(md5er, safe_globals)
+    return "safe_exec.%r.%s.%s" % (random_seed, script_digest_value, md5er.hexdigest())
+
+
+def get(cache, key, slug=None):
+    """
+    Returns the (emsg, cleaned_results) result cached for `key`, looking in
+    the local cache first, then in `cache`.  Returns None if it isn't cached.
+    """
+    local_result = _local_results.get(key) if _local_results is not None else None
+    if local_result is not None:
+        emsg, serialized_results = local_result
+        _record(slug, 'local_hits')
+        return emsg, json.loads(serialized_results)
+
+    result = cache.get(key)
+    if result is None:
+        _record(slug, 'misses')
+        return None
+
+    _record(slug, 'remote_hits')
+    _set_local(key, result)
+    return result
+
+
+def set(cache, key, result):  # pylint: disable=redefined-builtin
+    """
+    Caches the (emsg, cleaned_results) result for `key` in both levels.
+    """
+    _set_local(key, result)
+    cache.set(key, result)
+
+
+def _set_local(key, result):
+    """
+    Caches a result locally, serialized so that callers can't modify it.
+    """
+    if _local_results is None:
+        return
+    emsg, cleaned_results = result
+    _local_results.set(key, (emsg, json.dumps(cleaned_results)))
+
+
+def _record(slug, counter):
+    """
+    Counts a cache lookup for the problem `slug`.
+    """
+    if slug is None:
+        return
+    with _stats_lock:
+        slug_stats = _stats.get(slug)
+        if slug_stats is None:
+            slug_stats = {'local_hits': 0, 'remote_hits': 0, 'misses': 0}
+            _stats.set(slug, slug_stats)
+        slug_stats[counter] += 1
+
+
+def get_cache_stats():
+    """
+    Returns the cache statistics of this process, as a dict mapping problem
+    slugs to their numbers of local hits, remote hits and misses, and their
+    hit rate.
+    """
+    with _stats_lock:
+        return {slug: _with_hit_rate(slug_stats) for slug, slug_stats in _stats.items()}
+
+
+def get_problem_cache_stats(slug):
+    """
+    Returns the cache statistics of this process for the problem `slug`, as
+    in get_cache_stats(), or None if it has no cache lookups.
+    """
+    with _stats_lock:
+        slug_stats = _stats.get(slug)
+        return _with_hit_rate(slug_stats) if slug_stats is not None else None
+
+
+def _with_hit_rate(slug_stats):
+    """
+    Returns a copy of the given statistics of a problem, with its hit rate.
+    """
+    slug_stats = dict(slug_stats)
+    lookups = slug_stats['local_hits'] + slug_stats['remote_hits'] + slug_stats['misses']
+    slug_stats['hit_rate'] = float(lookups - slug_stats['misses']) / lookups if lookups else 0.0
+    return slug_stats
+
+
+def configure_local_cache(max_entries):
+    """
+    Keeps up to `max_entries` results in the local cache of this process,
+    replacing any previous local cache.  0 disables the local cache.
+    """
+    global _local_results  # pylint: disable=global-statement
+    _local_results = LRUCache(max_entries) if max_entries > 0 else None
+
+
+def clear():
+    """
+    Clears the local caches and statistics of this process.
+    """
+    if _local_results is not None:
+        _local_results.clear()
+    with _stats_lock:
+        _stats.clear()
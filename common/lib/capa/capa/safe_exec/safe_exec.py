@@ -2,14 +2,17 @@
 
 from __future__ import absolute_import
 
-import hashlib
+import logging
 
 from codejail.safe_exec import SafeExecException, json_safe
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from six import text_type
 
-from . import lazymod
+from . import lazymod, result_cache, sandbox_pool
+from .result_cache import update_hash  # pylint: disable=unused-import
+
+log = logging.getLogger(__name__)
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -53,27 +56,38 @@ for name, modname in ASSUMED_IMPORTS:
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
 
-def update_hash(hasher, obj):
+def configure_sandbox_pool(size, max_uses):
     """
-    Update a `hashlib` hasher with a nested object.
+    Run jailed code in a pool of warm sandbox processes, which import the
+    ASSUMED_IMPORTS modules once, rather than in a new sandbox each time.
 
-    To properly cache nested structures, we need to compute a hash from the
-    entire structure, canonicalizing at every level.
+    Up to `size` idle sandbox processes are kept, each of which is replaced
+    after `max_uses` executions.  A size of 0 disables the pool.
+    """
+    sandbox_pool.configure_pool(size, max_uses, [modname for _, modname in ASSUMED_IMPORTS])
 
-    `hasher`'s `.update()` method is called a number of times, touching all of
-    `obj` in the process.  Only primitive JSON-safe types are supported.
 
+def configure_local_cache(max_entries):
     """
-    hasher.update(str(type(obj)))
-    if isinstance(obj, (tuple, list)):
-        for e in obj:
-            update_hash(hasher, e)
-    elif isinstance(obj, dict):
-        for k in sorted(obj):
-            update_hash(hasher, k)
-            update_hash(hasher, obj[k])
-    else:
-        hasher.update(repr(obj))
+    Keep up to `max_entries` safe_exec results in a cache local to this
+    process, in front of the cache given to safe_exec.  0 disables it.
+    """
+    result_cache.configure_local_cache(max_entries)
+
+
+def jailed_exec(code, globals_dict, python_path=None, extra_files=None, slug=None):
+    """
+    Run code with codejail, in the sandbox pool if it is configured.
+
+    Takes the same arguments as codejail.safe_exec.safe_exec.
+    """
+    pool = sandbox_pool.get_pool()
+    if pool is not None:
+        try:
+            return pool.safe_exec(code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug)
+        except sandbox_pool.SandboxWorkerError:
+            log.exception(u"Sandbox pool failed to run %s, running it in a new sandbox", slug)
+    return codejail_safe_exec(code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug)
 
 
 def safe_exec(
@@ -103,8 +117,8 @@ def safe_exec(
     created in the sandbox.
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
-    to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    to cache the execution, taking into account the code, the files it can import, the
+    values of the globals, and the random seed (see result_cache.py).
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -115,11 +129,9 @@ def safe_exec(
     # Check the cache for a previous result.
     if cache:
         safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        script_digest = result_cache.script_digest(code, python_path, extra_files, unsafely)
+        key = result_cache.cache_key(script_digest, random_seed, safe_globals)
+        cached = result_cache.get(cache, key, slug)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -136,7 +148,7 @@ def safe_exec(
     if unsafely:
         exec_fn = codejail_not_safe_exec
     else:
-        exec_fn = codejail_safe_exec
+        exec_fn = jailed_exec
 
     # Run the code!  Results are side effects in globals_dict.
     try:
@@ -153,7 +165,7 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
-        cache.set(key, (emsg, cleaned_results))
+        result_cache.set(cache, key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
@@ -0,0 +1,302 @@
+"""
+A pool of warm sandbox processes to run jailed code.
+
+Starting the sandboxed Python interpreter and importing numpy and the other
+modules that problems use take much longer than running most problem code.
+Instead, each SandboxWorker is a long-lived process, started with the codejail
+command (so as the sandbox user, under its AppArmor profile), which imports
+those modules once, and then forks a child to run each piece of code under
+the codejail limits: see sandbox_template.py.  Workers are replaced after
+a number of executions.
+
+The pool is only used once configured with configure_pool().
+"""
+
+from __future__ import absolute_import
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import six
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+
+from . import sandbox_template
+
+log = logging.getLogger(__name__)
+
+# How long a worker has to report the result of an execution, on top of the
+# real time limit of the execution itself.
+WORKER_TIMEOUT_MARGIN = 5
+
+# How long a worker has to exit once asked to.
+WORKER_EXIT_TIMEOUT = 1
+
+# We'll need the code from sandbox_template.py to start the workers, so read it now.
+sandbox_template_py_file = sandbox_template.__file__
+if sandbox_template_py_file.endswith("c"):
+    sandbox_template_py_file = sandbox_template_py_file[:-1]
+
+with open(sandbox_template_py_file) as template_file:
+    sandbox_template_py = template_file.read()
+
+_pool = None
+
+
+class SandboxWorkerError(Exception):
+    """
+    A sandbox worker failed, regardless of the code it was running.
+    """
+
+
+class SandboxWorker(object):
+    """
+    A warm sandbox process, which runs jailed code in forked children.
+    """
+    def __init__(self, preload_modules):
+        """
+        Starts the worker process.
+
+        Raises SandboxWorkerError if codejail isn't configured, or if the
+        process can't be started.
+        """
+        command = jail_code.COMMANDS.get("python")
+        if command is None:
+            raise SandboxWorkerError(u"Codejail has no python command configured.")
+        self.limits = dict(jail_code.LIMITS)
+        self.uses = 0
+
+        self.workdir = tempfile.mkdtemp(prefix="codejail-")
+        cmd = []
+        if command["user"]:
+            cmd.extend(["sudo", "-u", command["user"]])
+        cmd.extend(command["cmdline_start"])
+        cmd.extend([
+            "sandbox_template.py",
+            json.dumps({"preload_modules": list(preload_modules), "limits": self.limits}),
+        ])
+        try:
+            os.chmod(self.workdir, 0o755)
+            with open(os.path.join(self.workdir, "sandbox_template.py"), "w") as template_file:
+                template_file.write(sandbox_template_py)
+            with open(os.devnull, "wb") as devnull:
+                self.process = subprocess.Popen(
+                    cmd, cwd=self.workdir, env={}, close_fds=True,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=devnull,
+                )
+        except EnvironmentError as exc:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            raise SandboxWorkerError(u"Couldn't start a sandbox worker: {!r}".format(exc))
+
+    def is_alive(self):
+        """
+        Returns whether the worker process is running.
+        """
+        return self.process.poll() is None
+
+    def execute(self, request, cwd):
+        """
+        Runs the code of `request`, a dict with the "code", "globals" and
+        "python_path" to use, in the directory `cwd` (see
+        sandbox_template.py), and returns a (status, stdout, stderr) tuple as
+        codejail would.
+
+        Raises SandboxWorkerError if the worker fails to respond in time.
+        """
+        self.uses += 1
+        realtime = self.limits.get("REALTIME")
+        deadline = time.time() + realtime + WORKER_TIMEOUT_MARGIN if realtime else None
+        nonce = uuid.uuid4().hex
+        try:
+            sandbox_template.write_message(self.process.stdin.fileno(), {"nonce": nonce, "cwd": cwd})
+            sandbox_template.write_message(self.process.stdin.fileno(), request)
+            result = None
+            while True:
+                message = sandbox_template.read_message(self.process.stdout.fileno(), deadline)
+                if not isinstance(message, dict) or message.get("nonce") != nonce:
+                    # Written by the jailed code of a previous execution.
+                    continue
+                if message.get("exited"):
+                    break
+                result = message
+
+            if "signal" in message:
+                # Killed for exceeding a limit: report it as codejail would.
+                return -message["signal"], b"", b""
+            if result is None:
+                return message["exit_status"] or 1, b"", b""
+            return result["status"], result["stdout"].encode("utf-8"), result["stderr"].encode("utf-8")
+        except (
+            EnvironmentError, EOFError, ValueError, KeyError, AttributeError, TypeError,
+            sandbox_template.MessageTimeout,
+        ) as exc:
+            raise SandboxWorkerError(
+                u"Sandbox worker {} failed: {!r}".format(self.process.pid, exc)
+            )
+
+    def close(self):
+        """
+        Stops the worker process, and removes its files.
+        """
+        try:
+            self.process.stdin.close()
+            deadline = time.time() + WORKER_EXIT_TIMEOUT
+            while self.is_alive() and time.time() < deadline:
+                time.sleep(0.01)
+            if self.is_alive():
+                self.process.terminate()
+            self.process.wait()
+            self.process.stdout.close()
+        except EnvironmentError:
+            log.exception(u"Couldn't stop sandbox worker %s", self.process.pid)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxPool(object):
+    """
+    Keeps up to `size` idle SandboxWorkers, each used for up to `max_uses`
+    executions.  Executions never wait for a worker: if none is idle, a new
+    one is started.
+    """
+    def __init__(self, size, max_uses, preload_modules=()):
+        self.size = size
+        self.max_uses = max_uses
+        self.preload_modules = list(preload_modules)
+        self.disabled = False
+        self._idle_workers = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Same as codejail.safe_exec.safe_exec, but runs the code in a worker.
+
+        Raises SandboxWorkerError if the worker fails, in which case the code
+        should be run by codejail instead.
+        """
+        if self.disabled:
+            raise SandboxWorkerError(u"The sandbox pool is disabled.")
+
+        with _jail_directory(python_path, extra_files) as (homedir, sys_path):
+            request = {
+                "code": code,
+                "globals": json_safe(globals_dict),
+                "python_path": sys_path,
+            }
+            worker = None
+            try:
+                worker = self._checkout()
+                status, stdout, stderr = worker.execute(request, homedir)
+            except SandboxWorkerError:
+                if worker is not None:
+                    worker.close()
+                if worker is None or worker.uses == 1:
+                    # The worker didn't even start: the pool can't work here.
+                    log.exception(u"Disabling the sandbox pool after a failure to start a worker")
+                    self.disabled = True
+                raise
+            self._checkin(worker)
+
+        if status != 0:
+            raise SafeExecException((
+                u"Couldn't execute jailed code: stdout: {stdout!r}, "
+                u"stderr: {stderr!r} with status code: {status}"
+            ).format(stdout=stdout, stderr=stderr, status=status))
+        globals_dict.update(json.loads(stdout))
+
+    def close(self):
+        """
+        Stops the idle workers.
+        """
+        with self._lock:
+            idle_workers, self._idle_workers = self._idle_workers, []
+        for worker in idle_workers:
+            worker.close()
+
+    def _checkout(self):
+        """
+        Returns an idle worker, or a new one.
+
+        Raises SandboxWorkerError if a new worker can't be started.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # The workers belong to the process we were forked from.
+                self._idle_workers = []
+                self._pid = os.getpid()
+            if self._idle_workers:
+                return self._idle_workers.pop()
+        return SandboxWorker(self.preload_modules)
+
+    def _checkin(self, worker):
+        """
+        Makes a worker available again, or stops it if it is worn out or
+        not needed.
+        """
+        if worker.uses < self.max_uses and worker.is_alive():
+            with self._lock:
+                if len(self._idle_workers) < self.size and self._pid == os.getpid():
+                    self._idle_workers.append(worker)
+                    return
+        worker.close()
+
+
+@contextmanager
+def _jail_directory(python_path, extra_files):
+    """
+    Creates a directory with the files for an execution, as codejail does.
+
+    Yields the directory, and the entries to add to sys.path.
+    """
+    homedir = tempfile.mkdtemp(prefix="codejail-")
+    try:
+        os.chmod(homedir, 0o755)
+        tmpdir = os.path.join(homedir, "tmp")
+        os.mkdir(tmpdir)
+        os.chmod(tmpdir, 0o777)
+
+        extra_files = extra_files or ()
+        extra_names = set(name for name, _ in extra_files)
+        sys_path = []
+        for pydir in python_path or ():
+            pybase = os.path.basename(pydir)
+            sys_path.append(pybase)
+            if pybase not in extra_names:
+                dest = os.path.join(homedir, pybase)
+                if os.path.isdir(pydir):
+                    shutil.copytree(pydir, dest)
+                else:
+                    shutil.copyfile(pydir, dest)
+        for name, contents in extra_files:
+            with open(os.path.join(homedir, name), "wb") as extra:
+                extra.write(six.ensure_binary(contents))
+
+        yield homedir, sys_path
+    finally:
+        shutil.rmtree(homedir, ignore_errors=True)
+
+
+def configure_pool(size, max_uses, preload_modules=()):
+    """
+    Sets up the pool of sandbox workers used by get_pool(), replacing any
+    previous one.  A size of 0 disables the pool.
+    """
+    global _pool  # pylint: disable=global-statement
+    if _pool is not None:
+        _pool.close()
+    _pool = SandboxPool(size, max_uses, preload_modules) if size > 0 else None
+
+
+def get_pool():
+    """
+    Returns the configured SandboxPool, or None.
+    """
+    return _pool
@@ -0,0 +1,258 @@
+"""
+The program run by each warm sandbox process of the pool in sandbox_pool.py.
+
+This file is copied into the sandbox and run with the sandboxed Python, so it
+must only use the standard library.  It is also imported by sandbox_pool.py,
+for the functions that read and write the messages exchanged with the pool.
+
+The template process imports the modules that jailed code is assumed to use,
+then serves executions until its stdin is closed.  For each execution, it
+reads a small header from its stdin (a nonce, and the directory of the
+execution), and forks a child.  The child reads the request itself from stdin,
+applies the codejail resource limits, runs the code as codejail.safe_exec would,
+and writes the resulting globals to stdout before exiting.  The template then
+reports how the child exited.
+
+The template never reads requests or results, so they never enter its memory,
+which every child inherits: the code, globals, seeds and student ids of an
+execution can't be found by the jailed code of the next ones.  Every message
+written for an execution carries its nonce, so that the pool can ignore what
+the jailed code of previous executions may have written to stdout.
+
+Messages are JSON documents, preceded by their length on a line of their own.
+"""
+
+import json
+import os
+import select
+import shutil
+import sys
+import time
+import traceback
+
+# Keys of the globals that aren't sent back, as in codejail.safe_exec.
+BAD_KEYS = ("__builtins__",)
+
+# The value of PR_SET_DUMPABLE for prctl(2).
+PR_SET_DUMPABLE = 4
+
+# Maximum size of the header of an execution, in bytes.
+HEADER_MAX_SIZE = 1024
+
+
+class MessageTimeout(Exception):
+    """
+    A message wasn't received in time.
+    """
+
+
+def wait_readable(fd, deadline):
+    """
+    Waits until `fd` can be read, raising MessageTimeout if `deadline` (a
+    time.time() value, or None for no deadline) is reached first.
+    """
+    while True:
+        timeout = None if deadline is None else deadline - time.time()
+        if timeout is not None and timeout <= 0:
+            raise MessageTimeout()
+        try:
+            readable, _, _ = select.select([fd], [], [], timeout)
+        except select.error as exc:
+            if exc.args[0] == 4:  # EINTR
+                continue
+            raise
+        if readable:
+            return
+
+
+def read_exactly(fd, size, deadline=None):
+    """
+    Reads `size` bytes from `fd`, raising EOFError if it is closed first.
+    """
+    chunks = []
+    while size:
+        wait_readable(fd, deadline)
+        chunk = os.read(fd, min(size, 65536))
+        if not chunk:
+            raise EOFError()
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_message(fd, deadline=None, max_size=None):
+    """
+    Reads and decodes a message from `fd`, raising ValueError if it is
+    larger than `max_size` bytes.
+    """
+    header = b""
+    while not header.endswith(b"\n"):
+        header += read_exactly(fd, 1, deadline)
+        if len(header) > 20:
+            raise ValueError("Invalid message header: {!r}".format(header))
+    size = int(header)
+    if max_size is not None and size > max_size:
+        raise ValueError("Message too large: {} bytes".format(size))
+    return json.loads(read_exactly(fd, size, deadline).decode("utf-8"))
+
+
+def write_message(fd, message):
+    """
+    Encodes and writes a message to `fd`.
+    """
+    data = json.dumps(message).encode("utf-8")
+    data = "{}\n".format(len(data)).encode("ascii") + data
+    while data:
+        data = data[os.write(fd, data):]
+
+
+class DevNull(object):
+    """
+    Discards what jailed code prints, as in codejail.safe_exec.
+    """
+    def write(self, *args, **kwargs):
+        pass
+
+    def flush(self, *args, **kwargs):
+        pass
+
+
+def jsonable(value):
+    """
+    Returns whether `value` can be sent back as JSON.
+    """
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def set_child_limits(limits):
+    """
+    Applies the codejail resource limits to the current process.
+    """
+    import resource
+
+    if limits.get("CPU"):
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"]))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+    if limits.get("FSIZE"):
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits["FSIZE"], limits["FSIZE"]))
+    # No subprocesses.
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+
+def run_child(header, limits):
+    """
+    Reads the request of the execution in the forked child, runs its code,
+    and writes the result to stdout.
+    """
+    request = read_message(0)
+
+    # Don't let jailed code read what the pool sends next.
+    os.close(0)
+    sys.stdin = None
+    sys.stdout = DevNull()
+
+    set_child_limits(limits)
+
+    tmpdir = os.path.join(header["cwd"], "tmp")
+    os.environ["TMPDIR"] = tmpdir
+    os.chdir(header["cwd"])
+    sys.path.extend(request["python_path"])
+
+    g_dict = request["globals"]
+    try:
+        exec(request["code"], g_dict)  # pylint: disable=exec-used
+    except BaseException:  # pylint: disable=broad-except
+        result = {"status": 1, "stdout": "", "stderr": traceback.format_exc()}
+    else:
+        g_dict = dict(
+            (key, value) for key, value in g_dict.items()
+            if jsonable(value) and key not in BAD_KEYS
+        )
+        result = {"status": 0, "stdout": json.dumps(g_dict), "stderr": ""}
+    result["nonce"] = header["nonce"]
+    write_message(1, result)
+
+
+def wait_child(pid, deadline):
+    """
+    Waits for the child `pid` to exit, killing it if `deadline` (a
+    time.time() value, or None for no deadline) is reached first.  Returns
+    its wait status.
+    """
+    delay = 0.0005
+    while True:
+        exited_pid, wait_status = os.waitpid(pid, os.WNOHANG)
+        if exited_pid:
+            return wait_status
+        if deadline is not None and time.time() >= deadline:
+            os.kill(pid, 9)
+            return os.waitpid(pid, 0)[1]
+        time.sleep(delay)
+        delay = min(delay * 2, 0.01)
+
+
+def execute(header, limits):
+    """
+    Runs the execution described by `header` in a forked child, and returns
+    the report of how the child exited.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_child(header, limits)
+        finally:
+            os._exit(0)  # pylint: disable=protected-access
+
+    deadline = time.time() + limits["REALTIME"] if limits.get("REALTIME") else None
+    wait_status = wait_child(pid, deadline)
+
+    # Remove the files written by the child, which the pool may not be
+    # allowed to remove.
+    shutil.rmtree(os.path.join(header["cwd"], "tmp"), ignore_errors=True)
+
+    report = {"nonce": header["nonce"], "exited": True}
+    if os.WIFSIGNALED(wait_status):
+        report["signal"] = os.WTERMSIG(wait_status)
+    else:
+        report["exit_status"] = os.WEXITSTATUS(wait_status)
+    return report
+
+
+def main():
+    """
+    Serves execution requests until stdin is closed.
+    """
+    config = json.loads(sys.argv[1])
+
+    # Make this process (and so the children) impossible to trace or inspect
+    # by other processes of the sandbox user, jailed code included.
+    import ctypes
+    if ctypes.CDLL(None).prctl(PR_SET_DUMPABLE, 0, 0, 0, 0) != 0:
+        sys.exit("Couldn't make the sandbox template undumpable.")
+
+    # See TNL-6456
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    for modname in config["preload_modules"]:
+        try:
+            __import__(modname)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    while True:
+        try:
+            header = read_message(0, max_size=HEADER_MAX_SIZE)
+        except (EOFError, ValueError):
+            # A request left unread by a child must not be read here: stop.
+            break
+        if not isinstance(header, dict) or sorted(header) != ["cwd", "nonce"]:
+            break
+        write_message(1, execute(header, config["limits"]))
+
+
+if __name__ == "__main__":
+    main()
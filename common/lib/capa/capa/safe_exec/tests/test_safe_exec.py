@@ -7,6 +7,7 @@ import os
 import os.path
 import random
 import textwrap
+import threading
 import unittest
 
 import pytest
@@ -16,7 +17,14 @@ from codejail.safe_exec import SafeExecException
 from six import text_type, unichr
 from six.moves import range
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import (
+    configure_local_cache,
+    get_cache_stats,
+    get_problem_cache_stats,
+    result_cache,
+    safe_exec,
+    update_hash
+)
 
 
 class TestSafeExec(unittest.TestCase):
@@ -182,6 +190,90 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecLocalCache(unittest.TestCase):
+    """Test the local cache and the statistics of the safe_exec cache."""
+
+    def setUp(self):
+        super(TestSafeExecLocalCache, self).setUp()
+        configure_local_cache(10)
+        self.addCleanup(configure_local_cache, 0)
+        self.addCleanup(result_cache.clear)
+        result_cache.clear()
+
+    def test_local_hit(self):
+        cache = {}
+        safe_exec("a = int(math.pi)", {}, cache=DictCache(cache), slug="pi")
+
+        # The local cache answers, even if the shared cache is gone.
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache({}), slug="pi")
+        self.assertEqual(g['a'], 3)
+
+        # Modifying the results doesn't modify the cached ones.
+        g['a'] = 17
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=DictCache({}), slug="pi")
+        self.assertEqual(g['a'], 3)
+
+        self.assertEqual(
+            get_cache_stats(),
+            {'pi': {'local_hits': 2, 'remote_hits': 0, 'misses': 1, 'hit_rate': 2.0 / 3}},
+        )
+
+    def test_local_eviction(self):
+        configure_local_cache(1)
+        cache = {}
+        safe_exec("a = 1", {}, cache=DictCache(cache), slug="one")
+        safe_exec("a = 2", {}, cache=DictCache(cache), slug="two")
+
+        g = {}
+        safe_exec("a = 1", g, cache=DictCache(cache), slug="one")
+        self.assertEqual(g['a'], 1)
+        self.assertEqual(get_cache_stats()['one']['remote_hits'], 1)
+
+    def test_shared_across_globals_and_seeds(self):
+        cache = {}
+        safe_exec("a = b", {'b': 1}, cache=DictCache(cache), random_seed=1)
+        safe_exec("a = b", {'b': 1}, cache=DictCache(cache), random_seed=1)
+        self.assertEqual(len(cache), 1)
+        safe_exec("a = b", {'b': 2}, cache=DictCache(cache), random_seed=1)
+        safe_exec("a = b", {'b': 1}, cache=DictCache(cache), random_seed=2)
+        self.assertEqual(len(cache), 3)
+
+    def test_key_includes_extra_files(self):
+        cache = {}
+        code = "a = open('data.txt').read()"
+        g = {}
+        safe_exec(code, g, cache=DictCache(cache), extra_files=[('data.txt', b'one')])
+        self.assertEqual(g['a'], 'one')
+
+        g = {}
+        safe_exec(code, g, cache=DictCache(cache), extra_files=[('data.txt', b'two')])
+        self.assertEqual(g['a'], 'two')
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_stats_from_threads(self):
+        def record_misses():
+            for _ in range(100):
+                result_cache._record("threads", 'misses')  # pylint: disable=protected-access
+
+        threads = [threading.Thread(target=record_misses) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(get_problem_cache_stats("threads")['misses'], 800)
+
+    def test_problem_cache_stats(self):
+        self.assertIsNone(get_problem_cache_stats("pi"))
+        safe_exec("a = int(math.pi)", {}, cache=DictCache({}), slug="pi")
+        safe_exec("a = int(math.pi)", {}, cache=DictCache({}), slug="pi")
+        self.assertEqual(
+            get_problem_cache_stats("pi"),
+            {'local_hits': 1, 'remote_hits': 0, 'misses': 1, 'hit_rate': 0.5},
+        )
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
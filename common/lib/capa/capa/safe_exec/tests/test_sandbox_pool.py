@@ -0,0 +1,129 @@
+"""Test sandbox_pool.py"""
+
+from __future__ import absolute_import
+
+import os.path
+import textwrap
+import unittest
+
+from codejail.safe_exec import SafeExecException
+from mock import patch
+from six import text_type
+
+from capa.safe_exec import configure_sandbox_pool, safe_exec
+from capa.safe_exec.sandbox_pool import SandboxPool, SandboxWorkerError, get_pool
+
+
+class TestSandboxPool(unittest.TestCase):
+    """
+    Test running code in the pool of sandbox processes.
+    """
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.pool = SandboxPool(size=1, max_uses=3, preload_modules=['math'])
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {'a': 17}
+        self.pool.safe_exec("b = a + 1", g)
+        self.assertEqual(g, {'a': 17, 'b': 18})
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+    def test_python_lib(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        g = {}
+        self.pool.safe_exec("import constant; a = constant.THE_CONST", g, python_path=[pylib])
+        self.assertEqual(g['a'], 23)
+
+    def test_extra_files(self):
+        g = {}
+        self.pool.safe_exec("a = open('data.txt').read()", g, extra_files=[('data.txt', b'hello')])
+        self.assertEqual(g['a'], 'hello')
+
+    def test_executions_are_isolated(self):
+        self.pool.safe_exec("import math; math.pi = 3", {})
+        g = {}
+        self.pool.safe_exec("import math; a = math.pi", g)
+        self.assertNotEqual(g['a'], 3)
+
+    def test_previous_requests_are_not_visible(self):
+        self.pool.safe_exec("a = 1", {'secret': 'SEC' + 'RET-5150'})
+
+        # Search the whole writable memory of the next child for the secret,
+        # without ever writing the secret itself.
+        g = {}
+        self.pool.safe_exec(textwrap.dedent("""\
+            import ctypes
+            found = False
+            for line in open('/proc/self/maps'):
+                fields = line.split()
+                if not fields[1].startswith('rw'):
+                    continue
+                start, end = [int(address, 16) for address in fields[0].split('-')]
+                memory = ctypes.string_at(start, end - start)
+                index = memory.find(b'RET-5150')
+                while index != -1:
+                    if memory[index - 3:index] == b'SEC':
+                        found = True
+                    index = memory.find(b'RET-5150', index + 1)
+            """), g)
+        self.assertFalse(g['found'])
+
+    def test_worker_reuse(self):
+        pids = []
+        for _ in range(4):
+            g = {}
+            self.pool.safe_exec("import os; ppid = os.getppid()", g)
+            pids.append(g['ppid'])
+
+        # The same worker runs max_uses executions, then is replaced.
+        self.assertEqual(len(set(pids[:3])), 1)
+        self.assertNotEqual(pids[3], pids[0])
+
+    def test_worker_failure(self):
+        with patch('capa.safe_exec.sandbox_pool.sandbox_template.read_message', side_effect=EOFError):
+            with self.assertRaises(SandboxWorkerError):
+                self.pool.safe_exec("a = 1", {})
+
+        # A worker that fails to start disables the pool.
+        self.assertTrue(self.pool.disabled)
+        with self.assertRaises(SandboxWorkerError):
+            self.pool.safe_exec("a = 1", {})
+
+    @patch.dict('capa.safe_exec.sandbox_pool.jail_code.COMMANDS', {}, clear=True)
+    def test_codejail_not_configured(self):
+        with self.assertRaises(SandboxWorkerError):
+            self.pool.safe_exec("a = 1", {})
+        self.assertTrue(self.pool.disabled)
+
+    def test_worker_start_failure(self):
+        with patch('capa.safe_exec.sandbox_pool.subprocess.Popen', side_effect=OSError):
+            with self.assertRaises(SandboxWorkerError):
+                self.pool.safe_exec("a = 1", {})
+        self.assertTrue(self.pool.disabled)
+
+
+class TestSafeExecWithPool(unittest.TestCase):
+    """
+    Test safe_exec when the sandbox pool is configured.
+    """
+    def setUp(self):
+        super(TestSafeExecWithPool, self).setUp()
+        configure_sandbox_pool(1, 10)
+        self.addCleanup(configure_sandbox_pool, 0, 0)
+
+    def test_assumed_imports(self):
+        g = {}
+        safe_exec("a = int(math.pi) + numpy.array([1]).sum()", g)
+        self.assertEqual(g['a'], 4)
+        self.assertEqual(len(get_pool()._idle_workers), 1)  # pylint: disable=protected-access
+
+    def test_fallback(self):
+        g = {}
+        with patch.object(SandboxPool, 'safe_exec', side_effect=SandboxWorkerError):
+            safe_exec("a = 1/2", g)
+        self.assertEqual(g['a'], 0.5)
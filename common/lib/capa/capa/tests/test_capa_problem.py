@@ -460,6 +460,34 @@ class CAPAProblemTest(unittest.TestCase):
         self.assert_question_tag(question1, question2, tag='label', label_attr=False)
         self.assert_question_tag(question1, question2, tag='p', label_attr=True)
 
+    @ddt.data(
+        ('<script type="loncapa/python">a = 1</script>', 'student'),
+        ('<script type="loncapa/python" student_specific="false">a = 1</script>', None),
+        (
+            '<script type="loncapa/python" student_specific="false">a = 1</script>'
+            '<script type="loncapa/python">b = 2</script>',
+            'student',
+        ),
+    )
+    @ddt.unpack
+    def test_anonymous_student_id_in_scripts(self, scripts, expected_value):
+        """
+        Verify that the scripts get the anonymous student id unless they all
+        opt out, and that it is in the context of the problem either way.
+        """
+        xml = textwrap.dedent("""
+            <problem>
+                {}
+            </problem>
+        """.format(scripts))
+        script_globals = {}
+        with patch('capa.capa_problem.safe_exec', side_effect=lambda code, globals_dict, **kwargs: (
+            script_globals.update(globals_dict)
+        )):
+            problem = new_loncapa_problem(xml)
+        self.assertEqual(script_globals.get('anonymous_student_id'), expected_value)
+        self.assertEqual(problem.context['anonymous_student_id'], 'student')
+
 
 @ddt.ddt
 class CAPAMultiInputProblemTest(unittest.TestCase):
@@ -0,0 +1,95 @@
+"""
+Tests for the cache of parsed problem XML
+"""
+
+from __future__ import absolute_import
+
+import textwrap
+import unittest
+
+from lxml import etree
+from mock import Mock
+
+from capa import parsed_problem_cache
+from capa.parsed_problem_cache import ParsedProblemCache
+from capa.tests.helpers import new_loncapa_problem
+
+
+class ParsedProblemCacheTest(unittest.TestCase):
+    """
+    Tests for ParsedProblemCache
+    """
+    def setUp(self):
+        super(ParsedProblemCacheTest, self).setUp()
+        self.cache = ParsedProblemCache(max_size=100)
+        self.parse = Mock(side_effect=etree.XML)
+
+    def test_hit(self):
+        tree = self.cache.get_tree('<problem><p>One</p></problem>', self.parse)
+        tree.append(etree.Element('p'))
+
+        # The cached tree isn't the one returned, which can be modified.
+        tree = self.cache.get_tree('<problem><p>One</p></problem>', self.parse)
+        self.assertEqual(etree.tostring(tree), b'<problem><p>One</p></problem>')
+        self.assertEqual(self.parse.call_count, 1)
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+        self.assertEqual(stats['size'], len('<problem><p>One</p></problem>'))
+
+    def test_eviction(self):
+        first = '<problem>{}</problem>'.format('a' * 50)
+        second = '<problem>{}</problem>'.format('b' * 50)
+        self.cache.get_tree(first, self.parse)
+        self.cache.get_tree(second, self.parse)
+        self.assertEqual(self.cache.get_stats()['entries'], 1)
+
+        self.cache.get_tree(second, self.parse)
+        self.cache.get_tree(first, self.parse)
+        self.assertEqual(self.parse.call_count, 3)
+
+    def test_too_large(self):
+        problem_text = '<problem>{}</problem>'.format('a' * 100)
+        self.cache.get_tree(problem_text, self.parse)
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_errors_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(etree.XMLSyntaxError):
+                self.cache.get_tree('<problem>', self.parse)
+        self.assertEqual(self.parse.call_count, 2)
+
+
+class LoncapaProblemParsingTest(unittest.TestCase):
+    """
+    Tests for the parsing of problems through the cache
+    """
+    def setUp(self):
+        super(LoncapaProblemParsingTest, self).setUp()
+        parsed_problem_cache.configure_cache(parsed_problem_cache.DEFAULT_MAX_SIZE)
+        self.addCleanup(parsed_problem_cache.configure_cache, parsed_problem_cache.DEFAULT_MAX_SIZE)
+
+    def test_problems_share_parsing(self):
+        xml = textwrap.dedent("""
+            <problem>
+                <optionresponse>
+                    <optioninput>
+                        <option correct="False">red</option>
+                        <option correct="True">blue</option>
+                    </optioninput>
+                </optionresponse>
+            </problem>
+        """)
+        first = new_loncapa_problem(xml)
+        second = new_loncapa_problem(xml, seed=1)
+
+        self.assertIsNot(first.tree, second.tree)
+        self.assertEqual(etree.tostring(first.tree), etree.tostring(second.tree))
+        self.assertEqual(second.tree.find('.//optioninput').get('correct'), 'blue')
+        stats = parsed_problem_cache.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_disabled(self):
+        parsed_problem_cache.configure_cache(0)
+        new_loncapa_problem('<problem><p>One</p></problem>')
+        self.assertEqual(parsed_problem_cache.get_cache_stats()['entries'], 0)
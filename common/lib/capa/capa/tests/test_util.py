@@ -5,10 +5,17 @@ from __future__ import absolute_import
 
 import unittest
 
+from calc import UndefinedVariable, evaluator
 from lxml import etree
 
 from capa.tests.helpers import test_capa_system
-from capa.util import compare_with_tolerance, get_inner_html_from_xpath, remove_markup, sanitize_html
+from capa.util import (
+    compare_with_tolerance,
+    evaluate_samples,
+    get_inner_html_from_xpath,
+    remove_markup,
+    sanitize_html
+)
 
 
 class UtilTest(unittest.TestCase):
@@ -109,6 +116,39 @@ class UtilTest(unittest.TestCase):
         result = compare_with_tolerance(111.0, complex(100.0, 0), '10%', True)
         self.assertTrue(result)
 
+    def test_evaluate_samples(self):
+        samples = [(-1.5, 1.2), (-0.3, 2.9), (0.4, 1.0), (0.7, 2.4), (1.9, 1.6)]
+        var_dict_list = [{'x': x, 'y': y} for x, y in samples]
+        # Raising negative numbers to fractional powers fails on Python 2.
+        nonnegative_var_dict_list = [var_dict for var_dict in var_dict_list if var_dict['x'] >= 0]
+        for math_expr, var_dicts in [
+            ('x^2 + 2*x*y - 3', var_dict_list),         # vectorized
+            ('sin(x)/cos(y) || sqrt(x)', var_dict_list),
+            ('X*pi + e^Y', var_dict_list),
+            ('12', var_dict_list),
+            ('fact(3)*x', var_dict_list),               # scalar function
+            ('x^(1/3)', nonnegative_var_dict_list),     # fractional power
+            ('x^2 * 0*1e999', var_dict_list),           # NaN
+        ]:
+            expected = [evaluator(var_dict, {}, math_expr) for var_dict in var_dicts]
+            results = evaluate_samples(var_dicts, math_expr)
+            self.assertEqual(len(results), len(expected))
+            for result, expected_result in zip(results, expected):
+                self.assertEqual(
+                    compare_with_tolerance(result, expected_result),
+                    compare_with_tolerance(expected_result, expected_result),
+                )
+
+    def test_evaluate_samples_errors(self):
+        var_dict_list = [{'x': 1.0}, {'x': 2.0}]
+        self.assertEqual(evaluate_samples([], 'x'), [])
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_samples(var_dict_list, '1/(x-x)')
+        with self.assertRaises(UndefinedVariable):
+            evaluate_samples(var_dict_list, 'x+y')
+        with self.assertRaises(UndefinedVariable):
+            evaluate_samples(var_dict_list, 'X', case_sensitive=True)
+
     def test_sanitize_html(self):
         """
         Test for html sanitization with bleach.
@@ -3,12 +3,17 @@ Utility functions for capa.
 """
 from __future__ import absolute_import
 
+import math
 import re
 from cmath import isinf, isnan
 from decimal import Decimal
+from functools import reduce
 
 import bleach
+import numpy
+import six
 from calc import evaluator
+from calc.calc import ParseAugmenter, add_defaults, check_parens, eval_number
 from lxml import etree
 
 from openedx.core.djangolib.markup import HTML
@@ -95,6 +100,147 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         return abs(student_complex - instructor_complex) <= tolerance
 
 
+# Functions that only work on scalars: formulas using them are evaluated sample by sample.
+SCALAR_FUNCTIONS = (math.factorial,)
+
+
+def evaluate_samples(var_dict_list, math_expr, case_sensitive=False):
+    """
+    Evaluate the formula `math_expr` once for each dictionary of variable values
+    in `var_dict_list`, and return the list of results.
+
+    The results and errors are those of calling `calc.evaluator` for each
+    dictionary, but when possible the formula is parsed once and evaluated for
+    all the samples at once, on numpy arrays.  Formulas using scalar functions,
+    or dividing by zero, overflowing or leaving the domain of a function for
+    any of the samples (where Python floats and numpy arrays behave
+    differently), are evaluated sample by sample instead.
+    """
+    if var_dict_list and math_expr.strip():
+        try:
+            return _evaluate_samples_vectorized(var_dict_list, math_expr, case_sensitive)
+        except Exception:  # pylint: disable=broad-except
+            # Errors, including those in the formula, are raised by the
+            # sample by sample evaluation.
+            pass
+    return [evaluator(var_dict, {}, math_expr, case_sensitive=case_sensitive) for var_dict in var_dict_list]
+
+
+def _evaluate_samples_vectorized(var_dict_list, math_expr, case_sensitive):
+    """
+    Evaluate `math_expr` for all the samples of `var_dict_list` at once.
+    """
+    check_parens(math_expr)
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    variables = {
+        name: numpy.array([var_dict[name] for var_dict in var_dict_list])
+        for name in var_dict_list[0]
+    }
+    all_variables, all_functions = add_defaults(variables, {}, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    if case_sensitive:
+        casify = lambda x: x
+    else:
+        casify = lambda x: x.lower()
+
+    def eval_function(parse_result):
+        """
+        Apply a function to its argument, unless it only works on scalars.
+        """
+        function = all_functions[casify(parse_result[0])]
+        if function in SCALAR_FUNCTIONS:
+            raise ValueError(u"{} only works on scalars".format(parse_result[0]))
+        return function(parse_result[1])
+
+    evaluate_actions = {
+        'number': eval_number,
+        'variable': lambda x: all_variables[casify(x[0])],
+        'function': eval_function,
+        'atom': _eval_vector_atom,
+        'power': _eval_vector_power,
+        'parallel': _eval_vector_parallel,
+        'product': _eval_vector_product,
+        'sum': _eval_vector_sum,
+    }
+    with numpy.errstate(divide='raise', over='raise', invalid='raise', under='ignore'):
+        result = math_interpreter.reduce_tree(evaluate_actions)
+
+    if numpy.ndim(result) == 0:
+        # The formula doesn't use the variables.
+        return [result] * len(var_dict_list)
+    return list(result)
+
+
+# The following evaluation actions are those of `calc.evaluator`, for operands
+# which are either numbers or numpy arrays of the values for each sample.
+
+def _operands(parse_result):
+    """
+    Return the operands in a list of operands and operators.
+    """
+    return [k for k in parse_result if not isinstance(k, six.string_types)]
+
+
+def _eval_vector_atom(parse_result):
+    """
+    Return the value wrapped by the atom, ignoring parentheses.
+    """
+    return _operands(parse_result)[0]
+
+
+def _eval_vector_power(parse_result):
+    """
+    Exponentiate the operands, right to left.
+    """
+    return reduce(lambda a, b: b ** a, reversed(_operands(parse_result)))
+
+
+def _eval_vector_parallel(parse_result):
+    """
+    Compute the operands according to the parallel resistors operator.  Zeros
+    make the division raise, as they make the scalar operator return NaN.
+    """
+    operands = _operands(parse_result)
+    if len(operands) == 1:
+        return operands[0]
+    return 1. / sum(1. / e for e in operands)
+
+
+def _eval_vector_sum(parse_result):
+    """
+    Add the operands, keeping in mind their sign.
+    """
+    total = 0.0
+    subtract = False
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            subtract = token == '-'
+        elif subtract:
+            total = total - token
+        else:
+            total = total + token
+    return total
+
+
+def _eval_vector_product(parse_result):
+    """
+    Multiply and divide the operands.
+    """
+    prod = 1.0
+    divide = False
+    for token in parse_result:
+        if isinstance(token, six.string_types):
+            divide = token == '/'
+        elif divide:
+            prod = prod / token
+        else:
+            prod = prod * token
+    return prod
+
+
 def contextualize_text(text, context):  # private
     """
     Takes a string with variables. E.g. $a+$b.
@@ -17,14 +17,17 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.encoding import smart_text
 from django.utils.functional import cached_property
+from edx_django_utils.monitoring import set_custom_metric
 from pytz import utc
 from six import text_type
 from xblock.fields import Boolean, Dict, Float, Integer, Scope, String, XMLString
 from xblock.scorable import ScorableXBlockMixin, Score
 
+from capa import parsed_problem_cache
 from capa.capa_problem import LoncapaProblem, LoncapaSystem
 from capa.inputtypes import Status
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
+from capa.safe_exec import get_problem_cache_stats
 from capa.util import convert_files_to_filenames, get_inner_html_from_xpath
 from openedx.core.djangolib.markup import HTML, Text
 from xmodule.exceptions import NotFoundError
@@ -342,7 +345,7 @@ class CapaMixin(ScorableXBlockMixin, CapaFields):
             matlab_api_key=self.matlab_api_key
         )
 
-        return LoncapaProblem(
+        lcp = LoncapaProblem(
             problem_text=text,
             id=self.location.html_id(),
             state=state,
@@ -350,6 +353,30 @@ class CapaMixin(ScorableXBlockMixin, CapaFields):
             capa_system=capa_system,
             capa_module=self,  # njp
         )
+        self._set_safe_exec_cache_metrics(lcp.problem_id)
+        self._set_parsed_problem_cache_metrics()
+        return lcp
+
+    def _set_safe_exec_cache_metrics(self, problem_id):
+        """
+        Reports the statistics of the cache of the script results of the
+        problem in this process as custom metrics, named after the problem
+        so that the problems rendered in the same request are told apart.
+        """
+        stats = get_problem_cache_stats(problem_id)
+        if stats is None:
+            return
+        for name, value in six.iteritems(stats):
+            set_custom_metric(u'safe_exec_cache.{}.{}'.format(problem_id, name), value)
+
+    def _set_parsed_problem_cache_metrics(self):
+        """
+        Reports the hits, misses and parsing time saved by the cache of parsed
+        problems of this process as custom metrics.
+        """
+        stats = parsed_problem_cache.get_cache_stats()
+        for name in ('hits', 'misses', 'parse_time_saved'):
+            set_custom_metric(u'parsed_problem_cache.{}'.format(name), stats[name])
 
     def get_state_for_lcp(self):
         """
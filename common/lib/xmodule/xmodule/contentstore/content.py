@@ -315,9 +315,18 @@ class StaticContentStream(StaticContent):
                                                   length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
+    @property
+    def chunk_size(self):
+        """
+        The size of the chunks the data is streamed in: the size of the chunks
+        GridFS files are stored in.
+        """
+        return getattr(self._stream, 'chunk_size', None) or STREAM_DATA_CHUNK_SIZE
+
     def stream_data(self):
+        chunk_size = self.chunk_size
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -326,15 +335,16 @@ class StaticContentStream(StaticContent):
         """
         Stream the data between first_byte and last_byte (included)
         """
+        chunk_size = self.chunk_size
         self._stream.seek(first_byte)
         position = first_byte
         while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
+            if last_byte < position + chunk_size - 1:
                 chunk = self._stream.read(last_byte - position + 1)
                 yield chunk
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            chunk = self._stream.read(chunk_size)
+            position += chunk_size
             yield chunk
 
     def close(self):
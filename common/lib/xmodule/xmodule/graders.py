@@ -12,6 +12,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy as np
 import six
 from contracts import contract
 from pytz import UTC
@@ -377,6 +378,34 @@ class AssignmentFormatGrader(CourseGrader):
 
         return aggregate_score, dropped_indices
 
+    def totals_with_drops(self, percents):
+        """
+        Same as total_with_drops, for many breakdowns at once.  percents
+        is a (breakdowns x scores) array with the percent of each score,
+        and the array of the totals of the breakdowns is returned.  The
+        same scores are dropped and the kept ones are added up in the
+        same order as in total_with_drops, so the totals are identical.
+        """
+        percents = np.asarray(percents, dtype=float)
+        num_breakdowns, num_scores = percents.shape
+
+        kept = np.ones(percents.shape, dtype=bool)
+        if self.drop_count > 0:
+            # Stable sort by descending percent, as in total_with_drops: the
+            # lowest scores are dropped, the last ones first among equals.
+            sorted_indices = np.argsort(-percents, axis=1, kind='mergesort')
+            dropped_indices = sorted_indices[:, max(num_scores - self.drop_count, 0):]
+            kept[np.arange(num_breakdowns)[:, np.newaxis], dropped_indices] = False
+
+        aggregate_scores = np.zeros(num_breakdowns)
+        for index in range(num_scores):
+            aggregate_scores += np.where(kept[:, index], percents[:, index], 0.0)
+
+        if num_scores - self.drop_count > 0:
+            aggregate_scores /= num_scores - self.drop_count
+
+        return aggregate_scores
+
     def grade(self, grade_sheet, generate_random_scores=False):
         scores = list(grade_sheet.get(self.type, {}).values())
         breakdown = []
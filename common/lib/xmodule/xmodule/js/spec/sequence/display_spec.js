@@ -121,5 +121,43 @@
                 });
             });
         });
+
+        describe('Lazy units', function() {
+            beforeEach(function() {
+                $('#seq_content').before(
+                    '<div id="seq_contents_0" class="seq_contents">&lt;p&gt;first&lt;/p&gt;</div>' +
+                    '<div id="seq_contents_1" class="seq_contents" data-content-url="/unit/view"></div>'
+                );
+                this.sequence = new Sequence($('.xblock-student_view-sequential'));
+                spyOn($, 'postWithPrefix');
+            });
+
+            it('fetches the content of a unit the first time it is shown', function() {
+                spyOn($, 'getJSON').and.returnValue(
+                    $.Deferred().resolve({html: '<p>second</p>', resources: []}).promise()
+                );
+                this.sequence.render(1);
+                this.sequence.render(2);
+                expect($.getJSON).toHaveBeenCalledWith('/unit/view');
+                expect(this.sequence.content_container.html()).toEqual('<p>second</p>');
+                expect(local.XBlock.initializeBlocks).toHaveBeenCalledWith(this.sequence.content_container, undefined);
+
+                this.sequence.render(1);
+                this.sequence.render(2);
+                expect($.getJSON.calls.count()).toEqual(1);
+            });
+
+            it('fetches the content again after a failure', function() {
+                spyOn($, 'getJSON').and.returnValue($.Deferred().reject().promise());
+                this.sequence.render(1);
+                this.sequence.render(2);
+                expect(this.sequence.position).toEqual(2);
+                expect(this.sequence.content_container.html()).toEqual('');
+
+                this.sequence.render(1);
+                this.sequence.render(2);
+                expect($.getJSON.calls.count()).toEqual(2);
+            });
+        });
     });
 }).call(this);
@@ -1,5 +1,5 @@
 /* eslint-disable no-underscore-dangle */
-/* globals Logger, interpolate */
+/* globals Logger, interpolate, $script */
 
 (function() {
     'use strict';
@@ -226,10 +226,20 @@
             this.updateButtonState(nextButtonClass, this.selectNext, isLastTab, this.nextUrl);
         };
 
-        Sequence.prototype.render = function(newPosition) {
+        Sequence.prototype.render = function(newPosition, contentRequested) {
             var bookmarked, currentTab, modxFullUrl, sequenceLinks,
                 self = this;
             if (this.position !== newPosition) {
+                currentTab = this.contents.eq(newPosition - 1);
+                // Units which weren't rendered with the sequence are fetched the first time they are shown.
+                // If that fails, the unit is shown empty, and fetched again the next time.
+                if (currentTab.data('content-url') && !currentTab.data('loaded') && !contentRequested) {
+                    this.loadContent(currentTab).always(function() {
+                        self.render(newPosition, true);
+                    });
+                    return;
+                }
+
                 if (this.position) {
                     this.mark_visited(this.position);
                     if (this.showCompletion) {
@@ -247,7 +257,6 @@
                 // Added for aborting video bufferization, see ../video/10_main.js
                 this.el.trigger('sequence:change');
                 this.mark_active(newPosition);
-                currentTab = this.contents.eq(newPosition - 1);
                 bookmarked = this.el.find('.active .bookmark-icon').hasClass('bookmarked');
 
                 // update the data-attributes with latest contents only for updated problems.
@@ -270,7 +279,12 @@
                             .data('attempts-used', latestResponse.attempts_used);
                     });
                 }
-                XBlock.initializeBlocks(this.content_container, this.requestToken);
+                // Fetched units are rendered with another request, so they have a different request-token.
+                // Don't pass a token to initializeBlocks for them, as the conditional module does.
+                XBlock.initializeBlocks(
+                    this.content_container,
+                    currentTab.data('content-url') ? undefined : this.requestToken
+                );
 
                 // For embedded circuit simulator exercises in 6.002x
                 if (window.hasOwnProperty('update_schematics')) {
@@ -287,6 +301,81 @@
             }
         };
 
+        /**
+         * Fetches the content of a unit which wasn't rendered with the sequence, with the
+         * resources it depends upon, and stores it in its tab.  Returns a promise resolved
+         * when the tab can be shown, even if the unit couldn't be fetched.
+         */
+        Sequence.prototype.loadContent = function(tab) {
+            var self = this,
+                loading = tab.data('loading');
+            if (!loading) {
+                loading = $.getJSON(tab.data('content-url')).then(function(response) {
+                    return self.addResources(response.resources || []).then(function() {
+                        tab.text(response.html).data('loaded', true);
+                    });
+                });
+                tab.data('loading', loading);
+                loading.always(function() {
+                    tab.removeData('loading');
+                });
+            }
+            return loading;
+        };
+
+        /**
+         * Loads the resources of a fetched unit which aren't in the page yet, in order.
+         */
+        Sequence.prototype.addResources = function(resources) {
+            var self = this;
+            window.loadedXBlockResources = window.loadedXBlockResources || [];
+            return _.reduce(resources, function(promise, value) {
+                return promise.then(function() {
+                    var hash = value[0];
+                    if (_.indexOf(window.loadedXBlockResources, hash) >= 0) {
+                        return null;
+                    }
+                    window.loadedXBlockResources.push(hash);
+                    return self.loadResource(value[1]);
+                });
+            }, $.Deferred().resolve().promise());
+        };
+
+        /**
+         * Loads a resource into the page, unless it is a script or stylesheet the page already has.
+         */
+        Sequence.prototype.loadResource = function(resource) {
+            // We give XBlock fragments free-reign to add javascript and CSS to
+            // to the page, so XSS escaping doesn't matter much in this context
+            var $head = $('head'),
+                data = resource.data,
+                loaded;
+            if (resource.mimetype === 'text/css') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<style type='text/css'>" + data + '</style>');
+                } else if (resource.kind === 'url' && !$('link[href="' + data + '"]').length) {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append("<link rel='stylesheet' href='" + data + "' type='text/css'>");
+                }
+            } else if (resource.mimetype === 'application/javascript') {
+                if (resource.kind === 'text') {
+                    // xss-lint: disable=javascript-jquery-append,javascript-concat-html
+                    $head.append('<script>' + data + '</script>');
+                } else if (resource.kind === 'url' && !$('script[src="' + data + '"]').length) {
+                    loaded = $.Deferred();
+                    $script(data, data, function() {
+                        loaded.resolve();
+                    });
+                    return loaded.promise();
+                }
+            } else if (resource.mimetype === 'text/html' && resource.placement === 'head') {
+                // xss-lint: disable=javascript-jquery-append
+                $head.append(data);
+            }
+            return $.Deferred().resolve().promise();
+        };
+
         Sequence.prototype.goto = function(event) {
             var alertTemplate, alertText, isBottomNav, newPosition, widgetPlacement;
             event.preventDefault();
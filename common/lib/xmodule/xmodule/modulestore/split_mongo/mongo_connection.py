@@ -7,7 +7,9 @@ import datetime
 import logging
 import math
 import re
+import threading
 import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -26,6 +28,7 @@ from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -204,16 +207,112 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class StructureLRUCache(object):
+    """
+    A bounded, per-process, least-recently-used cache of pickled course
+    structures, keyed by structure id.
+
+    The cache is bounded by the total size of the cached pickles, rather than
+    by their number.  The structures are kept pickled, rather than decoded, so
+    that each caller decodes its own copy: the split modulestore modifies the
+    structures it reads in place (e.g. when loading definitions eagerly), and
+    a decoded structure shared by all callers and threads would be corrupted.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the pickled structure cached for ``key``, or None.
+        """
+        with self._lock:
+            try:
+                pickled_data = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = pickled_data
+            self.hits += 1
+            return pickled_data
+
+    def set(self, key, pickled_data):
+        """
+        Cache the pickled structure ``pickled_data`` for ``key``, evicting the
+        least recently used structures as needed.
+
+        Returns:
+            The number of evicted structures.
+        """
+        size = len(pickled_data)
+        if size > self.max_bytes:
+            return 0
+
+        with self._lock:
+            previous_data = self._entries.pop(key, None)
+            if previous_data is not None:
+                self.current_bytes -= len(previous_data)
+            self._entries[key] = pickled_data
+            self.current_bytes += size
+
+            num_evicted = 0
+            while self.current_bytes > self.max_bytes:
+                _, evicted_data = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted_data)
+                num_evicted += 1
+            self.evictions += num_evicted
+            return num_evicted
+
+    def clear(self):
+        """
+        Remove all cached structures.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+_LOCAL_STRUCTURE_CACHE = None
+
+
+def get_local_structure_cache():
+    """
+    Return the process-wide :class:`StructureLRUCache`, or None if it is
+    disabled (COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES is 0 or unset).
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if _LOCAL_STRUCTURE_CACHE is None:
+        max_bytes = getattr(settings, 'COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES', 0) if DJANGO_AVAILABLE else 0
+        if not max_bytes:
+            return None
+        _LOCAL_STRUCTURE_CACHE = StructureLRUCache(max_bytes)
+    return _LOCAL_STRUCTURE_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    The pickled structures are also kept uncompressed in a bounded,
+    per-process :class:`StructureLRUCache`, which is checked before the
+    django cache.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
     def __init__(self):
         self.cache = None
+        self.local_cache = get_local_structure_cache()
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
@@ -222,12 +321,19 @@ class CourseStructureCache(object):
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        if self.local_cache is not None:
+            pickled_data = self.local_cache.get(key)
+            if pickled_data is not None:
+                with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+                    tagger.tag(from_cache='true', from_local_cache='true')
+                    return pickle.loads(pickled_data)
+
         if self.cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             compressed_pickled_data = self.cache.get(key)
-            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+            tagger.tag(from_cache=str(compressed_pickled_data is not None).lower(), from_local_cache='false')
 
             if compressed_pickled_data is None:
                 # Always log cache misses, because they are unexpected
@@ -239,16 +345,21 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            self._set_local(key, pickled_data, tagger)
             return pickle.loads(pickled_data)
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_local(key, pickled_data, tagger)
+
+            if self.cache is None:
+                return None
 
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
@@ -257,6 +368,68 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+    def get_many(self, keys, course_context=None):
+        """
+        Return a dict of the structures cached for any of ``keys``, keyed by
+        their key, fetching those that aren't in the local cache with a single
+        request to the django cache.
+        """
+        structures = {}
+        if self.local_cache is not None:
+            for key in keys:
+                pickled_data = self.local_cache.get(key)
+                if pickled_data is not None:
+                    structures[key] = pickle.loads(pickled_data)
+
+        missing_keys = [key for key in keys if key not in structures]
+        if self.cache is None or not missing_keys:
+            return structures
+
+        with TIMER.timer("CourseStructureCache.get_many", course_context) as tagger:
+            tagger.measure('requested', len(missing_keys))
+            compressed_pickled_data = self.cache.get_many(missing_keys)
+            tagger.measure('found', len(compressed_pickled_data))
+
+            if len(compressed_pickled_data) < len(missing_keys):
+                # Always log cache misses, because they are unexpected
+                tagger.sample_rate = 1
+
+            for key, data in six.iteritems(compressed_pickled_data):
+                pickled_data = zlib.decompress(data)
+                self._set_local(key, pickled_data, tagger)
+                structures[key] = pickle.loads(pickled_data)
+            return structures
+
+    def set_many(self, structures, course_context=None):
+        """
+        Given a dict of structures keyed by their key, will pickle, compress,
+        and write them to cache with a single request.
+        """
+        if not structures or (self.cache is None and self.local_cache is None):
+            return None
+
+        with TIMER.timer("CourseStructureCache.set_many", course_context) as tagger:
+            tagger.measure('structures', len(structures))
+            compressed_pickled_data = {}
+            for key, structure in six.iteritems(structures):
+                pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+                self._set_local(key, pickled_data, tagger)
+                if self.cache is not None:
+                    compressed_pickled_data[key] = zlib.compress(pickled_data, 1)
+
+            if self.cache is None:
+                return None
+
+            # Stuctures are immutable, so we set a timeout of "never"
+            self.cache.set_many(compressed_pickled_data, None)
+
+    def _set_local(self, key, pickled_data, tagger):
+        """Add the pickled structure to the local cache, recording any evictions."""
+        if self.local_cache is not None:
+            num_evicted = self.local_cache.set(key, pickled_data)
+            tagger.measure('local_cache_evictions', num_evicted)
+            tagger.measure('local_cache_size', self.local_cache.current_bytes)
+
 
 class MongoConnection(object):
     """
@@ -323,6 +496,34 @@ class MongoConnection(object):
 
             return structure
 
+    def get_structures(self, ids, course_context=None):
+        """
+        Get the structures whose ids are given, in that order, omitting those
+        that don't exist.
+
+        Cached versions of the structures are used when available, and the
+        others are fetched with a single query and then cached.
+        """
+        with TIMER.timer("get_structures", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            cache = CourseStructureCache()
+
+            structures = cache.get_many(ids, course_context)
+            missing_ids = [structure_id for structure_id in ids if structure_id not in structures]
+            tagger.measure("cache_misses", len(missing_ids))
+            if missing_ids:
+                # Always log cache misses, because they are unexpected
+                tagger.sample_rate = 1
+
+                found_structures = {
+                    structure['_id']: structure
+                    for structure in self.find_structures_by_id(missing_ids, course_context)
+                }
+                cache.set_many(found_structures, course_context)
+                structures.update(found_structures)
+
+            return [structures[structure_id] for structure_id in ids if structure_id in structures]
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
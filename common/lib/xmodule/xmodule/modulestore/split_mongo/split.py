@@ -60,6 +60,7 @@ import datetime
 import hashlib
 import logging
 from collections import defaultdict
+from contextlib import contextmanager
 from importlib import import_module
 
 import six
@@ -144,6 +145,9 @@ class SplitBulkWriteRecord(BulkOpsRecord):
         super(SplitBulkWriteRecord, self).__init__()
         self.initial_index = None
         self.index = None
+        # Course index already read by the caller, which the next outermost
+        # bulk operation starts from instead of reading it again.
+        self.prefetched_index = None
         self.structures = {}
         self.structures_in_db = set()
         # dict(version_guid, dict(BlockKey, module))
@@ -249,7 +253,11 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         """
         Begin a bulk write operation on course_key.
         """
-        bulk_write_record.initial_index = self.db_connection.get_course_index(course_key, ignore_case=ignore_case)
+        if bulk_write_record.prefetched_index is not None:
+            bulk_write_record.initial_index = bulk_write_record.prefetched_index
+            bulk_write_record.prefetched_index = None
+        else:
+            bulk_write_record.initial_index = self.db_connection.get_course_index(course_key, ignore_case=ignore_case)
         # Ensure that any edits to the index don't pollute the initial_index
         bulk_write_record.index = copy.deepcopy(bulk_write_record.initial_index)
         bulk_write_record.course_key = course_key
@@ -607,15 +615,23 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         ids = set(ids)
         return self.db_connection.find_courselike_blocks_by_id(list(ids), block_type)
 
-    def find_structures_by_id(self, ids):
+    @contextmanager
+    def _bulk_operations_for_index(self, course_key, course_index):
         """
-        Return all structures that specified in ``ids``.
-
-        If a structure with the same id is in both the cache and the database,
-        the cached version will be preferred.
+        Like bulk_operations(course_key, emit_signals=False), but if no bulk
+        operation is active on the course, start it from ``course_index``
+        (as read from the database by the caller) rather than fetching it.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if not bulk_write_record.active:
+            bulk_write_record.prefetched_index = course_index
+        with self.bulk_operations(course_key, emit_signals=False):
+            yield
 
-        Arguments:
-            ids (list): A list of structure ids
+    def _find_active_structures(self, ids):
+        """
+        Return a tuple of the structures of active bulk operations whose ids
+        are in ``ids``, and the set of the remaining ids.
         """
         structures = []
         ids = set(ids)
@@ -627,9 +643,35 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                     ids.remove(structure_id)
                     structures.append(structure)
 
+        return structures, ids
+
+    def find_structures_by_id(self, ids):
+        """
+        Return all structures that specified in ``ids``.
+
+        If a structure with the same id is in both the cache and the database,
+        the cached version will be preferred.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        structures, ids = self._find_active_structures(ids)
         structures.extend(self.db_connection.find_structures_by_id(list(ids)))
         return structures
 
+    def get_structures(self, ids):
+        """
+        Return all structures that specified in ``ids``, like find_structures_by_id,
+        but reading them through the structure cache: cached structures are fetched
+        with a single cache request, and the others with a single query.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        structures, ids = self._find_active_structures(ids)
+        structures.extend(self.db_connection.get_structures(list(ids)))
+        return structures
+
     def find_structures_derived_from(self, ids):
         """
         Return all structures that were immediately derived from a structure listed in ``ids``.
@@ -955,7 +997,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if not version_guids:
             return
 
-        for entry in self.find_structures_by_id(version_guids):
+        for entry in self.get_structures(version_guids):
             for course_index in id_version_map[entry['_id']]:
                 yield entry, course_index
 
@@ -993,7 +1035,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             locator = locator_factory(structure_info, branch)
             envelope = CourseEnvelope(locator, entry)
             root = entry['root']
-            structures_list = self._load_items(envelope, [root], depth=0, **kwargs)
+            # The index is already known: don't let _load_items read it again for each course
+            with self._bulk_operations_for_index(locator, structure_info):
+                structures_list = self._load_items(envelope, [root], depth=0, **kwargs)
             if not isinstance(structures_list[0], ErrorDescriptor):
                 result.append(structures_list[0])
         return result
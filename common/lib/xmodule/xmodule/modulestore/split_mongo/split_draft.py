@@ -346,8 +346,14 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         draft_course = get_course(ModuleStoreEnum.BranchName.draft)
         published_course = get_course(ModuleStoreEnum.BranchName.published)
+        changes = self._get_changes_cache(xblock.location.course_key, draft_course, published_course)
 
         def has_changes_subtree(block_key):
+            if block_key not in changes:
+                changes[block_key] = block_has_changes(block_key)
+            return changes[block_key]
+
+        def block_has_changes(block_key):
             draft_block = get_block(draft_course, block_key)
             if draft_block is None:  # temporary fix for bad pointers TNL-1141
                 return True
@@ -369,6 +375,26 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def _get_changes_cache(self, course_key, draft_structure, published_structure):
+        """
+        Returns the dict caching whether the subtree of each block has changes between the given draft and
+        published structures.  Checking the blocks of a course outline in turn thus walks each subtree once.
+
+        The dict is kept in the request cache for the versions of the structures, unless one of them is a new
+        version still being edited in place by a bulk operation.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        unsaved_structures = set(bulk_write_record.structures) - bulk_write_record.structures_in_db
+        if (
+                self.request_cache is None or
+                draft_structure['_id'] in unsaved_structures or
+                published_structure['_id'] in unsaved_structures
+        ):
+            return {}
+        return self.request_cache.data.setdefault('has_changes', {}).setdefault(
+            (draft_structure['_id'], published_structure['_id']), {}
+        )
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
@@ -1052,9 +1052,9 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
     #   3) wildcard split if it has any (1) but it doesn't
     # Split:
     #   1) wildcard split search,
-    #   2-4) active_versions, structure, definition (s/b lazy; so, unnecessary)
-    #   5) wildcard draft mongo which has none
-    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 6, 0))
+    #   2-3) structures, definition (s/b lazy; so, unnecessary)
+    #   4) wildcard draft mongo which has none
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 5, 0))
     @ddt.unpack
     def test_get_courses(self, default_ms, max_find, max_send):
         self.initdb(default_ms)
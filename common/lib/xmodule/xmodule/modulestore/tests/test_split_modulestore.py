@@ -12,6 +12,7 @@ from importlib import import_module
 
 import ddt
 import six
+from bson.objectid import ObjectId
 from ccx_keys.locator import CCXBlockUsageLocator
 from contracts import contract
 from django.core.cache import InvalidCacheBackendError, caches
@@ -36,6 +37,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import StructureLRUCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
@@ -1004,6 +1006,89 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_local_structure_cache')
+    def test_local_structure_cache(self, mock_get_local_structure_cache):
+        local_cache = StructureLRUCache(max_bytes=10 * 1024 * 1024)
+        mock_get_local_structure_cache.return_value = local_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the dummy django cache doesn't cache anything, but the local cache does
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        # each caller gets its own copy of the structure
+        self.assertEqual(cached_structure, not_cached_structure)
+        self.assertIsNot(cached_structure, not_cached_structure)
+        self.assertEqual(local_cache.hits, 1)
+        self.assertEqual(len(local_cache), 1)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_local_structure_cache')
+    def test_local_structure_cache_non_lazy_load(self, mock_get_local_structure_cache):
+        local_cache = StructureLRUCache(max_bytes=10 * 1024 * 1024)
+        mock_get_local_structure_cache.return_value = local_cache
+        store = modulestore()
+        store.create_child(self.user, self.new_course.location, 'html', fields={'data': '<p>Content</p>'})
+        course = store.get_course(self.new_course.id)
+        structure = self._get_structure(course)
+
+        # loading the definitions eagerly adds their fields to the blocks of the structure it reads
+        store._clear_cache()  # pylint: disable=protected-access
+        store.get_course(course.id, depth=None, lazy=False)
+
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(course)
+        self.assertEqual(cached_structure, structure)
+        for block in six.itervalues(cached_structure['blocks']):
+            self.assertNotIn('data', block.fields)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_local_structure_cache')
+    def test_local_structure_cache_too_small(self, mock_get_local_structure_cache):
+        mock_get_local_structure_cache.return_value = StructureLRUCache(max_bytes=1)
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        with check_mongo_calls(1):
+            cached_structure = self._get_structure(self.new_course)
+
+        self.assertEqual(cached_structure, not_cached_structure)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_get_structures(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        other_course = modulestore().create_course(
+            'org', 'other_course', 'test_run', self.user, BRANCH_NAME_DRAFT,
+        )
+        structure_ids = [
+            course.location.as_object_id(course.location.version_guid)
+            for course in (self.new_course, other_course)
+        ]
+
+        # one query for all of the structures
+        with check_mongo_calls(1):
+            not_cached_structures = modulestore().db_connection.get_structures(structure_ids)
+
+        # then a single cache request
+        with check_mongo_calls(0):
+            with patch.object(self.cache, 'get_many', wraps=self.cache.get_many) as mock_get_many:
+                cached_structures = modulestore().db_connection.get_structures(structure_ids)
+        self.assertEqual(mock_get_many.call_count, 1)
+
+        self.assertEqual([structure['_id'] for structure in cached_structures], structure_ids)
+        self.assertEqual(cached_structures, not_cached_structures)
+
+        # structures cached by get_structures are used by get_structure, and vice versa
+        with check_mongo_calls(0):
+            self.assertEqual(self._get_structure(self.new_course), cached_structures[0])
+
+    def test_get_structures_missing(self):
+        structure_id = self.new_course.location.as_object_id(self.new_course.location.version_guid)
+        with check_mongo_calls(1):
+            structures = modulestore().db_connection.get_structures([ObjectId(), structure_id])
+        self.assertEqual([structure['_id'] for structure in structures], [structure_id])
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1013,6 +1098,42 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestStructureLRUCache(unittest.TestCase):
+    """Tests for the StructureLRUCache"""
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = StructureLRUCache(max_bytes=100)
+        cache.set('a', b'a' * 40)
+        cache.set('b', b'b' * 40)
+        self.assertEqual(cache.get('a'), b'a' * 40)
+
+        # 'b' is now the least recently used structure
+        self.assertEqual(cache.set('c', b'c' * 40), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'a' * 40)
+        self.assertEqual(cache.get('c'), b'c' * 40)
+        self.assertEqual(cache.current_bytes, 80)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (3, 1, 1))
+
+    def test_replace_and_clear(self):
+        cache = StructureLRUCache(max_bytes=100)
+        cache.set('a', b'a' * 40)
+        cache.set('a', b'A' * 60)
+        self.assertEqual(cache.get('a'), b'A' * 60)
+        self.assertEqual(cache.current_bytes, 60)
+
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual((len(cache), cache.current_bytes), (0, 0))
+
+    def test_structure_larger_than_cache(self):
+        cache = StructureLRUCache(max_bytes=100)
+        cache.set('a', b'a' * 40)
+        self.assertEqual(cache.set('b', b'b' * 101), 0)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'a' * 40)
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -409,6 +409,31 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         self.assertEqual(result, self.conn.find_structures_by_id.return_value)
         self.assertCacheNotCleared()
 
+    def test_no_bulk_get_structures(self):
+        ids = [Mock(name='id')]
+        self.conn.get_structures.return_value = [MagicMock(name='result')]
+        result = self.bulk.get_structures(ids)
+        self.assertConnCalls(call.get_structures(ids))
+        self.assertEqual(result, self.conn.get_structures.return_value)
+        self.assertCacheNotCleared()
+
+    @ddt.data(
+        ([1, 2, 3], [1, 2]),
+        ([1, 2, 3], [3]),
+    )
+    @ddt.unpack
+    def test_get_structures(self, search_ids, active_ids):
+        active_structure = lambda _id: {'active': 'structure', '_id': _id}
+        for n, _id in enumerate(active_ids):
+            course_key = CourseLocator('org', 'course', 'run{}'.format(n))
+            self.bulk._begin_bulk_operation(course_key)
+            self.bulk.update_structure(course_key, active_structure(_id))
+
+        self.conn.get_structures.return_value = []
+        results = self.bulk.get_structures(search_ids)
+        self.conn.get_structures.assert_called_once_with(list(set(search_ids) - set(active_ids)))
+        six.assertCountEqual(self, results, [active_structure(_id) for _id in active_ids])
+
     @ddt.data(
         ([], [], []),
         ([1, 2, 3], [1, 2], [1, 2]),
@@ -359,6 +359,7 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             'items': items,
             'element_id': self.location.html_id(),
             'item_id': text_type(self.location),
+            'course_id': text_type(self.course_id),
             'position': self.position,
             'tag': self.location.block_type,
             'ajax_url': self.system.ajax_url,
@@ -371,11 +372,31 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         }
         fragment.add_content(self.system.render_template("seq_module.html", params))
 
-        self._capture_full_seq_item_metrics(display_items)
+        self._capture_full_seq_item_metrics(display_items, count_items=not self._renders_items_lazily(context, view))
         self._capture_current_unit_metrics(display_items)
 
         return fragment
 
+    def get_active_display_item(self, context):
+        """
+        Returns the display item shown when the sequence is rendered with the
+        given context, or None if there is no display item.
+        """
+        display_items = self.get_display_items()
+        self._update_position(context, len(display_items))
+        return display_items[self.position - 1] if display_items else None
+
+    def _renders_items_lazily(self, context, view):
+        """
+        Returns whether only the active display item is rendered, the others
+        being fetched by the browser when the learner navigates to them.
+        """
+        return (
+            view == STUDENT_VIEW and
+            context.get('lazy_unit_rendering', False) and
+            self.is_user_authenticated(context)
+        )
+
     def _get_gated_content_info(self, prereq_met, prereq_meta_info):
         """
         Returns a dict of information about gated_content context
@@ -463,8 +484,13 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         Updates the given fragment with rendered student views of the given
         display_items.  Returns a list of dict objects with information about
         the given display_items.
+
+        If the items are rendered lazily, only the active item is rendered, and
+        the others get the information needed by the sequence navigation alone,
+        without their children being instantiated.
         """
         is_user_authenticated = self.is_user_authenticated(context)
+        render_lazily = self._renders_items_lazily(context, view)
         bookmarks_service = self.runtime.service(self, 'bookmarks')
         completion_service = self.runtime.service(self, 'completion')
         context['username'] = self.runtime.service(self, 'user').get_current_user().opt_attrs.get(
@@ -474,9 +500,10 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             self.display_name_with_default
         ]
         contents = []
-        for item in display_items:
+        for index, item in enumerate(display_items):
+            is_rendered = not render_lazily or index == self.position - 1
             # NOTE (CCB): This seems like a hack, but I don't see a better method of determining the type/category.
-            item_type = item.get_icon_class()
+            item_type = item.get_icon_class() if is_rendered else self._get_unrendered_icon_class(item)
             usage_id = item.scope_ids.usage_id
 
             if item_type == 'problem' and not is_user_authenticated:
@@ -496,28 +523,69 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             context['show_bookmark_button'] = show_bookmark_button
             context['bookmarked'] = is_bookmarked
 
-            rendered_item = item.render(view, context)
-            fragment.add_fragment_resources(rendered_item)
+            if is_rendered:
+                rendered_item = item.render(view, context)
+                fragment.add_fragment_resources(rendered_item)
+                content = rendered_item.content
+            else:
+                content = u''
 
             iteminfo = {
-                'content': rendered_item.content,
+                'content': content,
                 'page_title': getattr(item, 'tooltip_title', ''),
                 'type': item_type,
                 'id': text_type(usage_id),
                 'bookmarked': is_bookmarked,
                 'path': " > ".join(display_names + [item.display_name_with_default]),
-                'graded': item.graded
+                'graded': item.graded,
+                'lazy': not is_rendered,
             }
 
             if is_user_authenticated:
                 if item.location.block_type == 'vertical':
                     if completion_service:
-                        iteminfo['complete'] = completion_service.vertical_is_complete(item)
+                        if is_rendered:
+                            iteminfo['complete'] = completion_service.vertical_is_complete(item)
+                        else:
+                            iteminfo['complete'] = self._unrendered_vertical_is_complete(completion_service, item)
 
             contents.append(iteminfo)
 
         return contents
 
+    def _get_unrendered_icon_class(self, item):
+        """
+        Returns the icon class of a display item from the classes of its
+        children, without instantiating them.  Unlike get_icon_class, the
+        children of nested containers aren't considered.
+        """
+        child_classes = set(
+            getattr(self.runtime.load_block_type(child_key.block_type), 'icon_class', 'other')
+            for child_key in item.children
+        )
+        new_class = 'other'
+        for c in class_priority:
+            if c in child_classes:
+                new_class = c
+        return new_class
+
+    def _unrendered_vertical_is_complete(self, completion_service, item):
+        """
+        Returns whether a vertical is complete, as the completion service's
+        vertical_is_complete does, without instantiating its children.  The
+        children which aren't accessible to the user are counted.
+        """
+        if not completion_service.completion_tracking_enabled():
+            return None
+        child_keys = [
+            child_key for child_key in item.children
+            if XBlockCompletionMode.get_mode(
+                self.runtime.load_block_type(child_key.block_type)
+            ) == XBlockCompletionMode.COMPLETABLE
+        ]
+        completions = completion_service.get_completions(child_keys)
+        return all(completions[child_key] >= 1.0 for child_key in child_keys)
+
     def _locations_in_subtree(self, node):
         """
         The usage keys for all descendants of an XBlock/XModule as a flat list.
@@ -546,17 +614,22 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         newrelic.agent.add_custom_parameter('seq.position', self.position)
         newrelic.agent.add_custom_parameter('seq.is_time_limited', self.is_time_limited)
 
-    def _capture_full_seq_item_metrics(self, display_items):
+    def _capture_full_seq_item_metrics(self, display_items, count_items=True):
         """
         Capture information about the number and types of XBlock content in
         the sequence as a whole. We send this information to New Relic so that
         we can do better performance analysis of courseware.
+
+        Counting the items instantiates all of them, so it is skipped unless
+        count_items is True.
         """
         if not newrelic:
             return
         # Basic count of the number of Units (a.k.a. VerticalBlocks) we have in
         # this learning sequence
         newrelic.agent.add_custom_parameter('seq.num_units', len(display_items))
+        if not count_items:
+            return
 
         # Count of all modules (leaf nodes) in this sequence (e.g. videos,
         # problems, etc.) The units (verticals) themselves are not counted.
@@ -198,11 +198,32 @@ class ProblemBlockTest(unittest.TestCase):
         module = CapaFactory.create()
         self.assertEqual(module.get_score().raw_earned, 0)
 
+    @patch('xmodule.capa_base.set_custom_metric')
+    @patch('xmodule.capa_base.get_problem_cache_stats')
+    def test_safe_exec_cache_metrics(self, mock_get_problem_cache_stats, mock_set_custom_metric):
+        mock_get_problem_cache_stats.return_value = {'local_hits': 1, 'remote_hits': 0, 'misses': 1, 'hit_rate': 0.5}
+        module = CapaFactory.create()
+        problem_id = module.location.html_id()
+        mock_get_problem_cache_stats.assert_called_with(problem_id)
+        mock_set_custom_metric.assert_any_call(u'safe_exec_cache.{}.local_hits'.format(problem_id), 1)
+        mock_set_custom_metric.assert_any_call(u'safe_exec_cache.{}.hit_rate'.format(problem_id), 0.5)
+
         other_module = CapaFactory.create()
         self.assertEqual(module.get_score().raw_earned, 0)
         self.assertNotEqual(module.url_name, other_module.url_name,
                             "Factory should be creating unique names for each problem")
 
+    @patch('xmodule.capa_base.set_custom_metric')
+    @patch('xmodule.capa_base.parsed_problem_cache.get_cache_stats')
+    def test_parsed_problem_cache_metrics(self, mock_get_cache_stats, mock_set_custom_metric):
+        mock_get_cache_stats.return_value = {
+            'hits': 3, 'misses': 1, 'entries': 1, 'size': 100, 'parse_time_saved': 0.25,
+        }
+        CapaFactory.create()
+        mock_set_custom_metric.assert_any_call(u'parsed_problem_cache.hits', 3)
+        mock_set_custom_metric.assert_any_call(u'parsed_problem_cache.misses', 1)
+        mock_set_custom_metric.assert_any_call(u'parsed_problem_cache.parse_time_saved', 0.25)
+
     def test_correct(self):
         """
         Check that the factory creates correct and incorrect problems properly.
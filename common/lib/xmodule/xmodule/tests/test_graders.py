@@ -167,6 +167,20 @@ class GraderTest(unittest.TestCase):
         self.assertAlmostEqual(graded['percent'], 0.92249999999999999)
         self.assertEqual(len(graded['section_breakdown']), 7 + 1)
 
+    @ddt.data(0, 1, 2, 5)
+    def test_totals_with_drops(self, drop_count):
+        grader = graders.AssignmentFormatGrader("Homework", 3, drop_count)
+        percents = [
+            [0.1, 0.7, 0.33, 1.0],
+            [0.5, 0.5, 0.5, 0.5],
+            [0.0, 0.2, 0.0, 0.2],
+            [0.9, 0.03, 0.17, 0.03],
+        ]
+        self.assertEqual(
+            grader.totals_with_drops(percents).tolist(),
+            [grader.total_with_drops([{'percent': percent} for percent in row])[0] for row in percents],
+        )
+
     def test_assignment_format_grader_on_single_section_entry(self):
         midterm_grader = graders.AssignmentFormatGrader("Midterm", 1, 0)
         # Test the grading on a section with one item:
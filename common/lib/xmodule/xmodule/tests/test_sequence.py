@@ -13,6 +13,7 @@ from django.utils.timezone import now
 from freezegun import freeze_time
 from mock import Mock, patch
 from six.moves import range
+from web_fragments.fragment import Fragment
 
 from xmodule.seq_module import SequenceModule
 from xmodule.tests import get_test_system
@@ -168,6 +169,48 @@ class SequenceBlockTestCase(XModuleXmlImportTest):
         html = self._get_rendered_view(self.sequence_3_1, requested_child='last', view=view)
         self._assert_view_at_position(html, expected_position=3)
 
+    @ddt.unpack
+    @ddt.data(
+        {'view': STUDENT_VIEW, 'lazy_units': 2},
+        {'view': PUBLIC_VIEW, 'lazy_units': 0},
+    )
+    def test_lazy_unit_rendering(self, view, lazy_units):
+        with patch('xmodule.vertical_block.VerticalBlock.render') as mock_render:
+            mock_render.return_value = Fragment(u'rendered unit')
+            html = self._get_rendered_view(
+                self.sequence_3_1,
+                requested_child='last',
+                extra_context=dict(lazy_unit_rendering=True),
+                view=view,
+            )
+        self._assert_view_at_position(html, expected_position=3)
+        self.assertEqual(mock_render.call_count, 3 - lazy_units)
+        self.assertEqual(html.count("'lazy': True"), lazy_units)
+
+    def test_active_display_item(self):
+        context = {'requested_child': 'last'}
+        self.assertEqual(
+            self.sequence_3_1.get_active_display_item(context).location,
+            self.sequence_3_1.get_children()[-1].location,
+        )
+        self.assertIsNone(self.sequence_1_1.get_active_display_item(context))
+
+    def test_unrendered_vertical_is_complete(self):
+        course_key = self.course.id
+        completable_key = course_key.make_usage_key('html', 'completable')
+        aggregator_key = course_key.make_usage_key('vertical', 'aggregator')
+        completion_service = Mock(
+            completion_tracking_enabled=Mock(return_value=True),
+            get_completions=Mock(side_effect=lambda keys: {key: 1.0 for key in keys}),
+        )
+        item = Mock(children=[completable_key, aggregator_key])
+
+        self.assertTrue(self.sequence_3_1._unrendered_vertical_is_complete(  # pylint: disable=protected-access
+            completion_service, item,
+        ))
+        # Only the completable children are checked.
+        completion_service.get_completions.assert_called_once_with([completable_key])
+
     def test_tooltip(self):
         html = self._get_rendered_view(self.sequence_3_1, requested_child=None)
         for child in self.sequence_3_1.children:
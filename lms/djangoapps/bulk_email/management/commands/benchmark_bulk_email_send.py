@@ -0,0 +1,137 @@
+"""
+Django command to measure how many bulk emails per second a worker sends,
+depending on the number of connections it sends over.
+
+The emails are sent to a local SMTP stub, which waits for the given latency
+before accepting each email, as a remote SMTP server would.
+
+Example usage:
+    $ ./manage.py lms benchmark_bulk_email_send --emails 500 --latency 50 --concurrency 1 4 8
+"""
+from __future__ import absolute_import, division
+
+import threading
+import time
+
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand
+from six.moves import range, socketserver
+
+from bulk_email.tasks import EmailConnectionPool
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """
+    Accepts all the emails sent over a connection, after a delay.
+    """
+    def handle(self):
+        self.reply(b'220 localhost SMTP stub')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b'DATA':
+                self.reply(b'354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                time.sleep(self.server.latency)
+                self.reply(b'250 OK')
+            elif command == b'QUIT':
+                self.reply(b'221 Bye')
+                return
+            else:
+                self.reply(b'250 OK')
+
+    def reply(self, response):
+        """
+        Sends a response line.
+        """
+        self.wfile.write(response + b'\r\n')
+        self.wfile.flush()
+
+
+class SMTPStubServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    A local SMTP server handling each connection in its own thread.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        socketserver.TCPServer.__init__(self, ('127.0.0.1', 0), SMTPStubHandler)
+        self.latency = latency
+
+
+class Command(BaseCommand):
+    """
+    benchmark_bulk_email_send command
+    """
+    help = "Measure the bulk email throughput of a worker for each number of connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--emails',
+            type=int,
+            default=500,
+            help='Number of emails to send for each number of connections.',
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=50,
+            help='Time the SMTP stub takes to accept each email, in milliseconds.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[1, 2, 4, 8],
+            help='Numbers of connections to send over.',
+        )
+
+    def handle(self, *args, **options):
+        server = SMTPStubServer(options['latency'] / 1000)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        try:
+            for concurrency in options['concurrency']:
+                rate = self._send(server.server_address, concurrency, options['emails'])
+                self.stdout.write(u'{} connections: {:.1f} emails/second'.format(concurrency, rate))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _send(self, address, concurrency, num_emails):
+        """
+        Returns the number of emails per second sent over `concurrency`
+        connections, in batches as by the bulk email tasks.
+        """
+        start = time.time()
+        connections = EmailConnectionPool(
+            concurrency,
+            backend='django.core.mail.backends.smtp.EmailBackend',
+            host=address[0],
+            port=address[1],
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+        )
+        try:
+            for first in range(0, num_emails, concurrency):
+                messages = []
+                for index in range(first, min(first + concurrency, num_emails)):
+                    message = EmailMultiAlternatives(
+                        u'Benchmark email', u'Plain text body ' * 100, 'sender@example.com',
+                        [u'learner{}@example.com'.format(index)],
+                    )
+                    message.attach_alternative(u'<p>HTML body</p>' * 100, 'text/html')
+                    messages.append(message)
+                for error in connections.send_messages(messages):
+                    if error is not None:
+                        raise error
+        finally:
+            connections.close()
+        return num_emails / (time.time() - start)
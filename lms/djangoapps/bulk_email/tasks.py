@@ -12,6 +12,7 @@ import re
 import time
 from collections import Counter
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 from smtplib import SMTPConnectError, SMTPDataError, SMTPException, SMTPServerDisconnected
 from time import sleep
 
@@ -39,6 +40,7 @@ from django.utils.translation import override as override_language
 from django.utils.translation import ugettext as _
 from markupsafe import escape
 from six import text_type
+from six.moves import queue, range
 
 from bulk_email.models import CourseEmail, Optout
 from courseware.courses import get_course
@@ -98,6 +100,65 @@ BULK_EMAIL_FAILURE_ERRORS = (
 )
 
 
+class EmailConnectionPool(object):
+    """
+    A pool of `size` open email connections, which sends batches of messages
+    concurrently, one message per connection.
+
+    The connections stay open for the lifetime of the pool, so that sending
+    to all the recipients of a subtask costs a single connection setup per
+    connection.  Batches are sent one after the other, which bounds the
+    number of messages in flight to the number of connections.
+    """
+    def __init__(self, size, **connection_kwargs):
+        self.size = max(size, 1)
+        self._idle_connections = queue.Queue()
+        self._connections = []
+        self._threads = ThreadPool(self.size) if self.size > 1 else None
+        try:
+            for _ in range(self.size):
+                connection = get_connection(**connection_kwargs)
+                self._connections.append(connection)
+                connection.open()
+                self._idle_connections.put(connection)
+        except Exception:
+            self.close()
+            raise
+
+    def send_messages(self, messages):
+        """
+        Sends each of `messages` over its own connection, and returns the
+        exception raised when sending each message, or None if it was sent.
+        """
+        if self._threads is None:
+            return [self._send_message(message) for message in messages]
+        return self._threads.map(self._send_message, messages)
+
+    def _send_message(self, message):
+        """
+        Sends `message` over an idle connection, returning the exception
+        raised, if any.
+        """
+        connection = self._idle_connections.get()
+        try:
+            connection.send_messages([message])
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+        finally:
+            self._idle_connections.put(connection)
+        return None
+
+    def close(self):
+        """
+        Closes the connections.
+        """
+        if self._threads is not None:
+            self._threads.close()
+            self._threads.join()
+        for connection in self._connections:
+            connection.close()
+
+
 def _get_course_email_context(course):
     """
     Returns context arguments to apply to all emails, independent of recipient.
@@ -506,9 +567,9 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connections = None
     try:
-        connection = get_connection()
-        connection.open()
+        connections = EmailConnectionPool(settings.BULK_EMAIL_SEND_CONCURRENCY)
 
         # Define context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
@@ -516,138 +577,167 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
         start_time = time.time()
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Send to a batch of recipients from the end of the list at once, one per connection.
+            # The recipients are removed from the to_list only once they have been processed.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            if _has_non_ascii_characters(email):
-                to_list.pop()
-                total_recipients_failed += 1
-                log.info(
-                    u"BulkEmail ==> Email address %s contains non-ascii characters. Skipping sending "
-                    u"email to %s, EmailId: %s ",
-                    email,
-                    current_recipient['profile__name'],
-                    email_id
-                )
-                subtask_status.increment(failed=1)
-                continue
-
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
-                sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
-
+            # Once the task has been rate limited, send one email at a time.
+            batch_size = 1 if subtask_status.retried_nomax > 0 else connections.size
+            batch = []
+            processed_indexes = []
             try:
-                log.info(
-                    u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                    Recipient name: %s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    current_recipient['profile__name'],
-                    email
-                )
-                connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    u"BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
-                    # This will fall through and not retry the message.
-                    log.warning(
-                        u'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                index = len(to_list) - 1
+                while index >= 0 and len(batch) < batch_size:
+                    recipient_num += 1
+                    current_recipient = to_list[index]
+                    email = current_recipient['email']
+                    if _has_non_ascii_characters(email):
+                        processed_indexes.append(index)
+                        total_recipients_failed += 1
+                        log.info(
+                            u"BulkEmail ==> Email address %s contains non-ascii characters. Skipping sending "
+                            u"email to %s, EmailId: %s ",
+                            email,
+                            current_recipient['profile__name'],
+                            email_id
+                        )
+                        subtask_status.increment(failed=1)
+                    else:
+                        email_context['email'] = email
+                        email_context['name'] = current_recipient['profile__name']
+                        email_context['user_id'] = current_recipient['pk']
+                        email_context['course_id'] = course_email.course_id
+
+                        # Construct message content using templates and context:
+                        plaintext_msg = course_email_template.render_plaintext(
+                            course_email.text_message, email_context
+                        )
+                        html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
+
+                        # Create email:
+                        email_msg = EmailMultiAlternatives(
+                            course_email.subject,
+                            plaintext_msg,
+                            from_addr,
+                            [email],
+                        )
+                        email_msg.attach_alternative(html_msg, 'text/html')
+                        batch.append((index, recipient_num, current_recipient, email_msg))
+                    index -= 1
+
+                if not batch:
+                    continue
+
+                # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+                # but if a task has been retried for rate-limiting reasons, then we sleep
+                # for a period of time between all emails within this task.  Choice of
+                # the value depends on the number of workers that might be sending email in
+                # parallel, and what the SES throttle rate is.
+                if subtask_status.retried_nomax > 0:
+                    sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
+
+                for _index, current_recipient_num, current_recipient, _email_msg in batch:
+                    log.info(
+                        u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                        Recipient name: %s, Email address: %s",
                         parent_task_id,
                         task_id,
                         email_id,
-                        recipient_num,
+                        current_recipient_num,
                         total_recipients,
-                        email,
-                        exc.smtp_error
+                        current_recipient['profile__name'],
+                        current_recipient['email']
                     )
-                    subtask_status.increment(failed=1)
-
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    u"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    u"BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info(u'Email with id %s sent to %s', email_id, email)
-                else:
-                    log.debug(u'Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
-
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+                send_errors = connections.send_messages([email_msg for _, _, _, email_msg in batch])
+
+                # Errors that require a retry or stop the task are raised once the results
+                # of the whole batch have been recorded.
+                task_error = None
+                for (index, current_recipient_num, current_recipient, _email_msg), exc in zip(batch, send_errors):
+                    email = current_recipient['email']
+                    if isinstance(exc, SMTPDataError):
+                        # According to SMTP spec, we'll retry error codes in the 4xx range.
+                        # 5xx range indicates hard failure.
+                        total_recipients_failed += 1
+                        log.error(
+                            u"BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                            Recipient num: %s/%s, Email address: %s",
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            current_recipient_num,
+                            total_recipients,
+                            email
+                        )
+                        if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                            # This will cause the outer handler to catch the exception and retry the entire task.
+                            task_error = task_error or exc
+                            continue
+                        else:
+                            # This will fall through and not retry the message.
+                            log.warning(
+                                u'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                                Email not delivered to %s due to error %s',
+                                parent_task_id,
+                                task_id,
+                                email_id,
+                                current_recipient_num,
+                                total_recipients,
+                                email,
+                                exc.smtp_error
+                            )
+                            subtask_status.increment(failed=1)
+
+                    elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
+                        # This will fall through and not retry the message.
+                        total_recipients_failed += 1
+                        log.error(
+                            u"BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                            EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            current_recipient_num,
+                            total_recipients,
+                            email,
+                            exc
+                        )
+                        subtask_status.increment(failed=1)
+
+                    elif exc is not None:
+                        # This will be handled by the outer handlers, which keep the recipient on the list.
+                        task_error = task_error or exc
+                        continue
+
+                    else:
+                        total_recipients_successful += 1
+                        log.info(
+                            u"BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                            Recipient num: %s/%s, Email address: %s,",
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            current_recipient_num,
+                            total_recipients,
+                            email
+                        )
+                        if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                            log.info(u'Email with id %s sent to %s', email_id, email)
+                        else:
+                            log.debug(u'Email with id %s sent to %s', email_id, email)
+                        subtask_status.increment(succeeded=1)
+
+                    recipients_info[email] += 1
+                    processed_indexes.append(index)
+
+                if task_error is not None:
+                    raise task_error
+            finally:
+                # Remove the recipients that have been processed from the list.  (That way, if
+                # there were a failure that needed to be retried, the others are still on the list.)
+                for index in sorted(processed_indexes, reverse=True):
+                    del to_list[index]
 
         log.info(
             u"BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -725,7 +815,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if connections is not None:
+            connections.close()
 
 
 def _get_current_task():
@@ -28,12 +28,14 @@ from boto.ses.exceptions import (
 from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
 from mock import Mock, patch
 from opaque_keys.edx.locator import CourseLocator
 from six.moves import range
 
 from bulk_email.models import SEND_TO_LEARNERS, SEND_TO_MYSELF, SEND_TO_STAFF, CourseEmail, Optout
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import EmailConnectionPool, _get_course_email_context
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, update_subtask_status
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
@@ -308,6 +310,47 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
                 failed=expected_fails
             )
 
+    @override_settings(BULK_EMAIL_SEND_CONCURRENCY=4)
+    def test_successful_concurrent_sends(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            # have every fourth email fail due to some address failure:
+            get_conn.return_value.send_messages.side_effect = cycle(
+                [SMTPDataError(554, "Email address is blacklisted"), None, None, None]
+            )
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails * 3 // 4, failed=num_emails // 4
+            )
+        # All the emails are sent over the same 4 connections.
+        self.assertEqual(get_conn.call_count, 4)
+        self.assertEqual(len(get_conn.return_value.send_messages.call_args_list), num_emails)
+
+    @override_settings(BULK_EMAIL_SEND_CONCURRENCY=4)
+    def test_retry_concurrent_sends(self):
+        num_emails = 5
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        attempted = set()
+
+        def send_messages(messages):
+            """
+            Fail to send to each address the first time.
+            """
+            address = messages[0].to[0]
+            if address not in attempted:
+                attempted.add(address)
+                raise SMTPServerDisconnected(425, "Disconnecting")
+
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = send_messages
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails, retried_withmax=2
+            )
+        # Each email is sent once after its failure.
+        self.assertEqual(len(get_conn.return_value.send_messages.call_args_list), num_emails * 2)
+
     def _test_retry_after_limited_retry_error(self, exception):
         """Test that celery handles connection failures by retrying."""
         # If we want the batch to succeed, we need to send fewer emails
@@ -473,3 +516,38 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         self.assertIn('account_settings_url', result)
         self.assertIn('email_settings_url', result)
         self.assertIn('platform_name', result)
+
+
+class TestEmailConnectionPool(TestCase):
+    """
+    Tests for EmailConnectionPool.
+    """
+    @patch('bulk_email.tasks.get_connection')
+    def test_send_messages(self, get_conn):
+        connection = get_conn.return_value
+        connection.send_messages.side_effect = [None, SMTPDataError(554, "Email address is blacklisted"), None]
+        pool = EmailConnectionPool(1)
+        self.assertEqual(connection.open.call_count, 1)
+
+        errors = pool.send_messages(['first', 'second', 'third'])
+        self.assertEqual([type(error) for error in errors], [type(None), SMTPDataError, type(None)])
+
+        pool.close()
+        self.assertEqual(connection.close.call_count, 1)
+
+    @patch('bulk_email.tasks.get_connection')
+    def test_concurrent_send_messages(self, get_conn):
+        get_conn.side_effect = lambda: Mock()
+        pool = EmailConnectionPool(3)
+        self.addCleanup(pool.close)
+        self.assertEqual(get_conn.call_count, 3)
+        self.assertEqual(pool.send_messages(['first', 'second', 'third', 'fourth']), [None] * 4)
+
+    @patch('bulk_email.tasks.get_connection')
+    def test_open_failure(self, get_conn):
+        connection = get_conn.return_value
+        connection.open.side_effect = [None, SMTPConnectError(424, "Bad Connection")]
+        with self.assertRaises(SMTPConnectError):
+            EmailConnectionPool(3)
+        # The connections opened so far are closed.
+        self.assertEqual(connection.close.call_count, 2)
@@ -6,10 +6,16 @@ from __future__ import absolute_import
 
 from django.conf import settings
 from edx_when import field_data
+from edx_when.api import get_overrides_for_user
 
+from courseware.models import StudentFieldOverride
+from lms.djangoapps.courseware.masquerade import get_course_masquerade
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
+from openedx.features.content_type_gating.models import ContentTypeGatingConfig
+from student.roles import CourseBetaTesterRole
+from xmodule.partitions.partitions_service import get_user_partition_groups
 
 from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
 from .usage_info import CourseUsageInfo
@@ -97,3 +103,138 @@ def get_course_blocks(
         starting_block_usage_key,
         collected_block_structure,
     )
+
+
+def get_course_blocks_for_users(users, starting_block_usage_key, collected_block_structure=None):
+    """
+    Yields a (user, block structure) pair for each of the given users,
+    the block structure being the one get_course_blocks returns for the
+    user with the default transformers.
+
+    The users are grouped by their access signature, so that the block
+    structure is transformed once for all the users of a group.  See
+    SharedCourseBlocks.
+
+    Arguments:
+        users (iterable of django.contrib.auth.models.User) - User objects
+            for which the block structure is to be transformed.
+
+        starting_block_usage_key (UsageKey) - Specifies the starting block
+            of the block structures that are to be transformed.
+
+        collected_block_structure (BlockStructureBlockData) - A
+            block structure retrieved from a prior call to
+            BlockStructureManager.get_collected.  Can be optionally
+            provided if already available, for optimization.
+    """
+    shared_course_blocks = SharedCourseBlocks(starting_block_usage_key, collected_block_structure)
+    for user in users:
+        yield user, shared_course_blocks.get(user)
+
+
+class SharedCourseBlocks(object):
+    """
+    Returns the block structures that get_course_blocks returns for users
+    with the default transformers, transforming the block structure once
+    for all the users with the same access signature.
+
+    The access signature of a user is made of everything the default
+    transformers depend on for that user: staff access, beta testing,
+    content type gating, and the group of the user in each partition of
+    the course, which covers cohorts, enrollment tracks and content
+    groups.  Users whose block structure can't be shared have no
+    signature: those with individual due date or field overrides, those
+    masquerading, and all users of courses with library content, whose
+    selected children are specific to each user.
+
+    The block structures returned for users with the same signature are
+    the same object, so they must not be modified.
+    """
+    def __init__(self, starting_block_usage_key, collected_block_structure=None):
+        self.starting_block_usage_key = starting_block_usage_key
+        self.course_key = starting_block_usage_key.course_key
+        self._collected_block_structure = collected_block_structure
+        self._block_structures = {}
+        self._library_content = None
+
+    @property
+    def collected_block_structure(self):
+        """
+        Returns the collected block structure of the course.
+        """
+        if self._collected_block_structure is None:
+            self._collected_block_structure = get_block_structure_manager(self.course_key).get_collected()
+        return self._collected_block_structure
+
+    def get(self, user):
+        """
+        Returns the block structure for the given user, which is shared
+        with the users who have the same access signature.
+        """
+        usage_info = CourseUsageInfo(self.course_key, user)
+        signature = self.get_access_signature(usage_info)
+        if signature is None:
+            return self._transform(user)
+        if signature not in self._block_structures:
+            self._block_structures[signature] = self._transform(user)
+        return self._block_structures[signature]
+
+    def get_access_signature(self, usage_info):
+        """
+        Returns a hashable value that is the same for the users whose block
+        structures are the same, or None if the block structure of the user
+        can't be shared.
+        """
+        user = usage_info.user
+        if (
+                not user.is_authenticated or
+                self._has_library_content or
+                get_course_masquerade(user, self.course_key) or
+                self._has_individual_overrides(user)
+        ):
+            return None
+
+        partitions = self.collected_block_structure.get_transformer_data(
+            user_partitions.UserPartitionTransformer, 'user_partitions'
+        ) or []
+        partition_groups = get_user_partition_groups(self.course_key, partitions, user, 'id')
+        return (
+            bool(usage_info.has_staff_access),
+            CourseBetaTesterRole(self.course_key).has_user(user),
+            ContentTypeGatingConfig.enabled_for_enrollment(user=user, course_key=self.course_key),
+            tuple(sorted(
+                (partition_id, group.id if group else None) for partition_id, group in partition_groups.items()
+            )),
+        )
+
+    @property
+    def _has_library_content(self):
+        """
+        Returns whether the course has library content blocks.
+        """
+        if self._library_content is None:
+            self._library_content = any(
+                block_key.block_type == 'library_content' for block_key in self.collected_block_structure
+            )
+        return self._library_content
+
+    def _has_individual_overrides(self, user):
+        """
+        Returns whether the given user has individual due dates or field
+        overrides in the course.
+        """
+        if any(True for _ in get_overrides_for_user(self.course_key, user)):
+            return True
+        return has_individual_student_override_provider() and StudentFieldOverride.objects.filter(
+            course_id=self.course_key, student=user,
+        ).exists()
+
+    def _transform(self, user):
+        """
+        Returns the block structure transformed for the given user.
+        """
+        return get_course_blocks(
+            user,
+            self.starting_block_usage_key,
+            collected_block_structure=self.collected_block_structure,
+        )
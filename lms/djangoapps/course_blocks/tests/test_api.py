@@ -0,0 +1,70 @@
+"""
+Tests for the get_course_blocks_for_users function of the course_blocks app.
+"""
+from __future__ import absolute_import
+
+from datetime import datetime
+
+from mock import patch
+from pytz import UTC
+
+from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from ..api import get_course_blocks, get_course_blocks_for_users
+from ..transformers.tests.test_user_partitions import UserPartitionTestMixin
+
+
+class GetCourseBlocksForUsersTestCase(UserPartitionTestMixin, ModuleStoreTestCase):
+    """
+    Tests that the block structures returned for many users, shared by the
+    users with the same access, are those returned for each user.
+    """
+    def setUp(self):
+        super(GetCourseBlocksForUsersTestCase, self).setUp()
+        self.setup_groups_partitions(num_groups=2)
+        user_partition = self.user_partitions[0]
+
+        self.course = CourseFactory.create(user_partitions=self.user_partitions)
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        ItemFactory.create(parent=chapter, category='sequential')
+        ItemFactory.create(parent=chapter, category='sequential', group_access={user_partition.id: [1]})
+        ItemFactory.create(parent=chapter, category='sequential', group_access={user_partition.id: [2]})
+        ItemFactory.create(parent=chapter, category='sequential', start=datetime(2100, 1, 1, tzinfo=UTC))
+        ItemFactory.create(parent=chapter, category='sequential', visible_to_staff_only=True)
+        self.setup_cohorts(self.course)
+
+        self.group_1_users = [UserFactory.create(), UserFactory.create()]
+        self.group_2_user = UserFactory.create()
+        self.staff = UserFactory.create(is_staff=True)
+        self.users = self.group_1_users + [self.group_2_user, self.staff]
+        for user in self.users:
+            CourseEnrollmentFactory.create(user=user, course_id=self.course.id)
+        for user in self.group_1_users:
+            add_user_to_cohort(self.partition_cohorts[0][0], user.username)
+        add_user_to_cohort(self.partition_cohorts[0][1], self.group_2_user.username)
+
+    def test_same_as_get_course_blocks(self):
+        for user, block_structure in get_course_blocks_for_users(self.users, self.course.location):
+            expected = get_course_blocks(user, self.course.location)
+            self.assertEqual(set(block_structure), set(expected))
+            for block_key in expected:
+                self.assertEqual(
+                    set(block_structure.get_children(block_key)),
+                    set(expected.get_children(block_key)),
+                )
+
+    def test_shared_by_users_with_same_access(self):
+        block_structures = dict(get_course_blocks_for_users(self.users, self.course.location))
+        self.assertIs(block_structures[self.group_1_users[0]], block_structures[self.group_1_users[1]])
+        self.assertIsNot(block_structures[self.group_1_users[0]], block_structures[self.group_2_user])
+        self.assertIsNot(block_structures[self.group_1_users[0]], block_structures[self.staff])
+
+    @patch('lms.djangoapps.course_blocks.api.get_overrides_for_user')
+    def test_not_shared_with_individual_overrides(self, mock_get_overrides_for_user):
+        mock_get_overrides_for_user.return_value = [{'location': self.course.location}]
+        block_structures = dict(get_course_blocks_for_users(self.group_1_users, self.course.location))
+        self.assertIsNot(block_structures[self.group_1_users[0]], block_structures[self.group_1_users[1]])
+        self.assertEqual(set(block_structures[self.group_1_users[0]]), set(block_structures[self.group_1_users[1]]))
@@ -30,6 +30,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -135,7 +136,13 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 return False
             return True
 
-        return [block_structure.create_removal_filter(check_child_removal)]
+        def child_removal_mask(block_index):
+            """
+            Return the bitset of the blocks removed by check_child_removal.
+            """
+            return block_index.mask(all_library_children) & ~block_index.mask(all_selected_children)
+
+        return [block_structure.create_removal_filter(check_child_removal, removal_mask=child_removal_mask)]
 
     def _publish_events(self, block_structure, location, previous_count, max_count, block_keys, user_id):
         """
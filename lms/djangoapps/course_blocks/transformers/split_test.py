@@ -28,6 +28,7 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -87,5 +88,8 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             block_structure.create_removal_filter(
                 lambda block_key: block_key.block_type == 'split_test',
                 keep_descendants=True,
+                removal_mask=lambda block_index: block_index.mask(
+                    block_key for block_key in block_index.block_keys if block_key.block_type == 'split_test'
+                ),
             )
         ]
@@ -3,6 +3,11 @@ Start Date Transformer implementation.
 """
 from __future__ import absolute_import
 
+from bisect import bisect_left
+from datetime import datetime
+
+from pytz import UTC
+
 from lms.djangoapps.courseware.access_utils import check_start_date
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
@@ -29,9 +34,11 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
 
     Staff users are exempted from visibility rules.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
+    BLOCKS_BY_START_DATE = 'blocks_by_start_date'
 
     @classmethod
     def name(cls):
@@ -69,6 +76,25 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             func_merge_ancestors=max,
         )
 
+    @classmethod
+    def summarize(cls, block_structure):
+        """
+        Stores the blocks and their merged start dates, sorted by start
+        date, so that only the blocks that haven't started yet need to
+        be checked.
+        """
+        blocks_by_start_date = sorted(
+            (
+                (cls._get_merged_start_date(block_structure, block_key), block_key)
+                for block_key in block_structure.topological_traversal()
+            ),
+            key=lambda start_and_block_key: start_and_block_key[0],
+        )
+        block_structure.set_transformer_data(cls, cls.BLOCKS_BY_START_DATE, (
+            [start for start, _ in blocks_by_start_date],
+            [block_key for _, block_key in blocks_by_start_date],
+        ))
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Start Date check.
         if usage_info.has_staff_access:
@@ -80,4 +106,21 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             self._get_merged_start_date(block_structure, block_key),
             usage_info.course_key,
         )
-        return [block_structure.create_removal_filter(removal_condition)]
+
+        # Not summarized when collected by a previous version.
+        blocks_by_start_date = block_structure.get_transformer_data(self, self.BLOCKS_BY_START_DATE)
+        if blocks_by_start_date is None:
+            return [block_structure.create_removal_filter(removal_condition)]
+
+        def removal_mask(block_index):
+            """
+            Returns the bitset of the blocks that haven't started for the
+            user.  Blocks that started before now are started for all
+            users (beta testers only see blocks earlier), so only the
+            other blocks are checked.
+            """
+            starts, block_keys = blocks_by_start_date
+            not_started = block_keys[bisect_left(starts, datetime.now(UTC)):]
+            return block_index.mask(block_key for block_key in not_started if removal_condition(block_key))
+
+        return [block_structure.create_removal_filter(removal_condition, removal_mask=removal_mask)]
@@ -6,6 +6,8 @@ from __future__ import absolute_import
 import ddt
 
 import openedx.core.djangoapps.user_api.course_tag.api as course_tag_api
+from openedx.core.djangoapps.content.block_structure.api import update_course_in_cache
+from openedx.core.djangoapps.content.block_structure.config import INCREMENTAL_COLLECT, waffle
 from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
 from student.tests.factories import CourseEnrollmentFactory
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -14,7 +16,7 @@ from xmodule.partitions.partitions_service import get_user_partition_groups
 
 from ...api import get_course_blocks
 from ..user_partitions import UserPartitionTransformer
-from .helpers import CourseStructureTestCase, create_location
+from .helpers import CourseStructureTestCase, create_location, publish_course, update_block
 
 
 @ddt.ddt
@@ -225,3 +227,26 @@ class SplitTestTransformerTestCase(CourseStructureTestCase):
             set(block_structure1.get_block_keys()),
             set(block_structure2.get_block_keys()),
         )
+
+    def test_incremental_collect(self):
+        course_tag_api.set_course_tag(
+            self.user,
+            self.course.id,
+            RandomUserPartitionScheme.key_for_partition(self.split_test_user_partition),
+            1,
+        )
+        with waffle().override(INCREMENTAL_COLLECT, active=True):
+            update_course_in_cache(self.course.id)
+
+            # only E changes among the children of BSplit
+            block_e = self.blocks['E']
+            block_e.display_name = u'Edited E'
+            update_block(block_e)
+            publish_course(self.course)
+            update_course_in_cache(self.course.id)
+
+        block_structure = get_course_blocks(self.user, self.course.location, self.transformers)
+        self.assertEqual(
+            set(block_structure.get_block_keys()),
+            set(self.get_block_key_set(self.blocks, 'course', 'A', 'D', 'F', 'J', 'M', 'I')),
+        )
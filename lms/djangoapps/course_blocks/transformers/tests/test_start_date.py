@@ -11,6 +11,7 @@ from django.utils.timezone import now
 from mock import patch
 
 from courseware.tests.factories import BetaTesterFactory
+from lms.djangoapps.courseware.access_utils import check_start_date
 
 from ..start_date import DEFAULT_START_DATE, StartDateTransformer
 from .helpers import BlockParentsMapTestCase, update_block
@@ -121,3 +122,16 @@ class StartDateTransformerTestCase(BlockParentsMapTestCase):
             blocks_with_differing_student_access,
             self.transformers,
         )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_only_unreleased_blocks_checked(self):
+        for idx, start_date_type in ((0, self.StartDateType.released), (4, self.StartDateType.future)):
+            block = self.get_block(idx)
+            block.start = self.StartDateType.start(start_date_type)
+            update_block(block)
+
+        with patch(
+            'lms.djangoapps.course_blocks.transformers.start_date.check_start_date', wraps=check_start_date,
+        ) as mock_check_start_date:
+            self.assert_transform_results(self.student, {0, 1, 2, 3, 5, 6}, {6}, self.transformers)
+        self.assertEqual(mock_check_start_date.call_count, 1)
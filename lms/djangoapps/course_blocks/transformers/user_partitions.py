@@ -29,8 +29,9 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
     Staff users are *not* exempted from user partition pathways.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -78,6 +79,19 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
             merged_group_access = _MergedGroupAccess(user_partitions, xblock, merged_parent_access_list)
             block_structure.set_transformer_block_field(block_key, cls, 'merged_group_access', merged_group_access)
 
+    @classmethod
+    def summarize(cls, block_structure):
+        """
+        Stores the blocks with group access restrictions, in course
+        order, so that the other blocks needn't be checked.
+        """
+        if not block_structure.get_transformer_data(cls, 'user_partitions'):
+            return
+        block_structure.set_transformer_data(cls, 'restricted_blocks', [
+            block_key for block_key in block_structure.topological_traversal()
+            if block_structure.get_transformer_block_field(block_key, cls, 'merged_group_access').get_allowed_groups()
+        ])
+
     def transform_block_filters(self, usage_info, block_structure):
         user = usage_info.user
         result_list = SplitTestTransformer().transform_block_filters(usage_info, block_structure)
@@ -88,16 +102,42 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
         user_groups = get_user_partition_groups(usage_info.course_key, user_partitions, user, 'id')
 
-        for block_key in block_structure.topological_traversal():
+        # Staff access to a block is staff access to its course, so it is
+        # only checked once for each course.
+        staff_access = {}
+
+        def has_staff_access(block_key):
+            """
+            Returns whether the user has staff access to the given block.
+            """
+            if block_key.course_key not in staff_access:
+                staff_access[block_key.course_key] = bool(has_access(user, 'staff', block_key))
+            return staff_access[block_key.course_key]
+
+        # Blocks to which the user doesn't have group access, which are
+        # removed unless an access denial message is shown in their place.
+        denied_blocks = set()
+
+        # Not summarized when collected by a previous version.
+        restricted_blocks = block_structure.get_transformer_data(self, 'restricted_blocks')
+        if restricted_blocks is None:
+            restricted_blocks = block_structure.topological_traversal()
+        else:
+            restricted_blocks = [block_key for block_key in restricted_blocks if block_key in block_structure]
+
+        for block_key in restricted_blocks:
             transformer_block_field = block_structure.get_transformer_block_field(
                 block_key, self, 'merged_group_access'
             )
             access_denying_partition_id = transformer_block_field.get_access_denying_partition(
                 user_groups
             )
-            access_denying_partition = get_partition_from_id(user_partitions, access_denying_partition_id)
+            if access_denying_partition_id is None or has_staff_access(block_key):
+                continue
+            denied_blocks.add(block_key)
 
-            if not has_access(user, 'staff', block_key) and access_denying_partition:
+            access_denying_partition = get_partition_from_id(user_partitions, access_denying_partition_id)
+            if access_denying_partition:
                 user_group = user_groups.get(access_denying_partition.id)
                 allowed_groups = transformer_block_field.get_allowed_groups()[access_denying_partition.id]
                 access_denied_message = access_denying_partition.access_denied_message(
@@ -110,14 +150,20 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
                     block_key, 'authorization_denial_message', access_denied_message
                 )
 
-        group_access_filter = block_structure.create_removal_filter(
-            lambda block_key: (
-                not has_access(user, 'staff', block_key) and
-                block_structure.get_transformer_block_field(
-                    block_key, self, 'merged_group_access'
-                ).get_access_denying_partition(user_groups) is not None and
+        def is_removed(block_key):
+            """
+            Returns whether the given block is removed for lack of group access.
+            """
+            return (
+                block_key in denied_blocks and
                 block_structure.get_xblock_field(block_key, 'authorization_denial_message') is None
             )
+
+        group_access_filter = block_structure.create_removal_filter(
+            is_removed,
+            removal_mask=lambda block_index: block_index.mask(
+                block_key for block_key in denied_blocks if is_removed(block_key)
+            ),
         )
         result_list.append(group_access_filter)
         return result_list
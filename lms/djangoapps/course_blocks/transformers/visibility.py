@@ -24,10 +24,12 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
 
     Staff users are exempted from visibility rules.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     MERGED_VISIBLE_TO_STAFF_ONLY = 'merged_visible_to_staff_only'
+    STAFF_ONLY_BLOCKS = 'staff_only_blocks'
 
     @classmethod
     def name(cls):
@@ -61,13 +63,30 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
             merged_field_name=cls.MERGED_VISIBLE_TO_STAFF_ONLY,
         )
 
+    @classmethod
+    def summarize(cls, block_structure):
+        """
+        Stores the blocks that are visible to staff only, so that they
+        can be removed without looking at every block.
+        """
+        block_structure.set_transformer_data(cls, cls.STAFF_ONLY_BLOCKS, [
+            block_key for block_key in block_structure.topological_traversal()
+            if cls._get_visible_to_staff_only(block_structure, block_key)
+        ])
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Visibility check.
         if usage_info.has_staff_access:
             return [block_structure.create_universal_filter()]
 
+        # Not summarized when collected by a previous version.
+        staff_only_blocks = block_structure.get_transformer_data(self, self.STAFF_ONLY_BLOCKS)
         return [
             block_structure.create_removal_filter(
                 lambda block_key: self._get_visible_to_staff_only(block_structure, block_key),
+                removal_mask=(
+                    (lambda block_index: block_index.mask(staff_only_blocks))
+                    if staff_only_blocks is not None else None
+                ),
             )
         ]
@@ -0,0 +1,110 @@
+"""
+Django command to pre-warm the cache of the results of the problem scripts of
+a course, by running the scripts of each problem with each seed learners can
+get.
+
+This is worth doing after importing or publishing a course, before learners
+load its problems: the results of the scripts that opt out of the anonymous
+student id (with student_specific="false") don't depend on the learner, so each
+seed of those problems is then run once instead of by the first learners to
+get it.
+
+Example usage:
+    $ ./manage.py lms prewarm_safe_exec_cache course-v1:edX+DemoX+Demo_Course
+"""
+from __future__ import absolute_import
+
+import logging
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from six import text_type
+from six.moves import range
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from capa.safe_exec import get_cache_stats
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS, RANDOMIZATION
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    prewarm_safe_exec_cache command
+    """
+    help = "Run the scripts of the problems of a course with each seed, to cache their results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help='ID of the course to pre-warm.')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course ID: {}'.format(options['course_id']))
+
+        store = modulestore()
+        if store.get_course(course_key) is None:
+            raise CommandError(u'Course not found: {}'.format(options['course_id']))
+
+        problems = store.get_items(course_key, qualifiers={'category': 'problem'})
+        for problem in problems:
+            for seed in self._seeds(problem):
+                self._run_scripts(course_key, problem, seed)
+
+        stats = get_cache_stats()
+        runs = sum(problem_stats['misses'] for problem_stats in stats.values())
+        hits = sum(
+            problem_stats['local_hits'] + problem_stats['remote_hits'] for problem_stats in stats.values()
+        )
+        self.stdout.write(u'{} problems: {} scripts run, {} already cached.'.format(len(problems), runs, hits))
+
+    def _seeds(self, problem):
+        """
+        Returns the seeds learners can get for `problem`.  Problems
+        randomized on each attempt can get too many seeds to be pre-warmed.
+        """
+        if problem.rerandomize == RANDOMIZATION.NEVER:
+            return [1]
+        elif problem.rerandomize == RANDOMIZATION.PER_STUDENT:
+            return range(NUM_RANDOMIZATION_BINS)
+        return []
+
+    def _run_scripts(self, course_key, problem, seed):
+        """
+        Runs the scripts of `problem` with `seed`, caching their results.
+        """
+        capa_system = LoncapaSystem(
+            ajax_url=None,
+            # Scripts that get the anonymous student id have per-learner results.
+            anonymous_student_id=None,
+            cache=cache,
+            can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_key)),
+            get_python_lib_zip=(lambda: get_python_lib_zip(contentstore(), course_key)),
+            DEBUG=None,
+            filestore=problem.runtime.resources_fs,
+            i18n=problem.runtime.service(problem, "i18n"),
+            node_path=None,
+            render_template=None,
+            seed=seed,
+            STATIC_URL=None,
+            xqueue=None,
+            matlab_api_key=None,
+        )
+        try:
+            LoncapaProblem(
+                problem_text=problem.data,
+                id=problem.location.html_id(),
+                capa_system=capa_system,
+                capa_module=None,
+                seed=seed,
+                extract_tree=False,
+            )
+        except Exception:  # pylint: disable=broad-except
+            # Broken problems fail for learners too: their errors are cached as well.
+            log.warning(u'Error loading problem %s with seed %s', text_type(problem.location), seed, exc_info=True)
@@ -19,6 +19,10 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+:class:`MultiUserFieldDataCache`: Prefetches the data of the caches above for
+    a batch of users at once, and provides a :class:`FieldDataCache` for each
+    of them.
 """
 
 from __future__ import absolute_import
@@ -27,6 +31,8 @@ import json
 import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+from itertools import groupby
+from operator import attrgetter
 
 import six
 from contracts import contract, new_contract
@@ -42,7 +48,13 @@ from xblock.runtime import KeyValueStore
 from courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.django import modulestore
 
-from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
+from .models import (
+    StudentModule,
+    XModuleStudentInfoField,
+    XModuleStudentPrefsField,
+    XModuleUserStateSummaryField,
+    chunks
+)
 
 log = logging.getLogger(__name__)
 
@@ -174,7 +186,16 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        self.cache_field_objects(self._read_objects(fields, xblocks, aside_types))
+
+    def cache_field_objects(self, field_objects):
+        """
+        Add the supplied, already loaded, ``field_objects`` to this cache.
+
+        Arguments:
+            field_objects (list): Django model instances that store the data for fields in this cache
+        """
+        for field_object in field_objects:
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
@@ -367,8 +388,18 @@ class UserStateCache(object):
             self.user.username,
             _all_usage_keys(xblocks, aside_types),
         )
-        for user_state in block_field_state:
-            self._cache[user_state.block_key] = user_state.state
+        self.cache_user_states((user_state.block_key, user_state.state) for user_state in block_field_state)
+
+    def cache_user_states(self, user_states):
+        """
+        Add the supplied, already loaded, ``user_states`` to this cache.
+
+        Arguments:
+            user_states: (block_key, field_state) pairs, where field_state is a dict
+                mapping field names to values.
+        """
+        for block_key, field_state in user_states:
+            self._cache[block_key] = field_state
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
@@ -679,6 +710,49 @@ class UserInfoCache(DjangoOrmFieldCache):
         return key.field_name
 
 
+def _get_descriptor_descendents(descriptor, depth, descriptor_filter):
+    """
+    Return a list of `descriptor` and its descendants down to the specified
+    depth that match the descriptor filter.
+
+    descriptor: The parent to search inside
+    depth: The number of levels to descend, or None for infinite depth
+    descriptor_filter(descriptor): A function that returns True
+        if descriptor should be included in the results
+    """
+    def get_child_descriptors(descriptor, depth, descriptor_filter):
+        """
+        Return a list of all child descriptors down to the specified depth
+        that match the descriptor filter. Includes `descriptor`
+        """
+        if descriptor_filter(descriptor):
+            descriptors = [descriptor]
+        else:
+            descriptors = []
+
+        if depth is None or depth > 0:
+            new_depth = depth - 1 if depth is not None else depth
+
+            for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
+                descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
+
+        return descriptors
+
+    with modulestore().bulk_operations(descriptor.location.course_key):
+        return get_child_descriptors(descriptor, depth, descriptor_filter)
+
+
+def _fields_to_cache(descriptors):
+    """
+    Returns a map of scopes to fields in that scope that should be cached
+    """
+    scope_map = defaultdict(set)
+    for descriptor in descriptors:
+        for field in descriptor.fields.values():
+            scope_map[field.scope].add(field)
+    return scope_map
+
+
 class FieldDataCache(object):
     """
     A cache of django model objects needed to supply the data
@@ -749,34 +823,7 @@ class FieldDataCache(object):
             descriptor_filter is a function that accepts a descriptor and return whether the field data
                 should be cached
         """
-
-        def get_child_descriptors(descriptor, depth, descriptor_filter):
-            """
-            Return a list of all child descriptors down to the specified depth
-            that match the descriptor filter. Includes `descriptor`
-
-            descriptor: The parent to search inside
-            depth: The number of levels to descend, or None for infinite depth
-            descriptor_filter(descriptor): A function that returns True
-                if descriptor should be included in the results
-            """
-            if descriptor_filter(descriptor):
-                descriptors = [descriptor]
-            else:
-                descriptors = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
-
-                for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
-                    descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
-
-            return descriptors
-
-        with modulestore().bulk_operations(descriptor.location.course_key):
-            descriptors = get_child_descriptors(descriptor, depth, descriptor_filter)
-
-        self.add_descriptors_to_cache(descriptors)
+        self.add_descriptors_to_cache(_get_descriptor_descendents(descriptor, depth, descriptor_filter))
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
@@ -799,11 +846,7 @@ class FieldDataCache(object):
         """
         Returns a map of scopes to fields in that scope that should be cached
         """
-        scope_map = defaultdict(set)
-        for descriptor in descriptors:
-            for field in descriptor.fields.values():
-                scope_map[field.scope].add(field)
-        return scope_map
+        return _fields_to_cache(descriptors)
 
     @contract(key=DjangoKeyValueStore.Key)
     def get(self, key):
@@ -932,6 +975,143 @@ class FieldDataCache(object):
         return sum(len(cache) for cache in self.cache.values())
 
 
+class MultiUserFieldDataCache(object):
+    """
+    Prefetches the data needed by the fields of a set of descriptors for a
+    batch of users, with a constant number of queries per chunk of users, and
+    provides a :class:`FieldDataCache` for each user that doesn't need any
+    further queries to read these fields.
+
+    This avoids loading the data of each user separately when the same blocks
+    are processed for many users, e.g. when rescoring a problem for all the
+    learners of a course.
+    """
+    def __init__(self, descriptors, course_id, users, asides=None, read_only=False, chunk_size=500):
+        """
+        Arguments
+        descriptors: A list of XModuleDescriptors.
+        course_id: The id of the current course
+        users: The users for which to cache data
+        asides: The list of aside types to load, or None to prefetch no asides.
+        read_only: The returned FieldDataCaches should not perform writes (they become a no-op).
+        chunk_size: The number of users to load data for in each query.
+        """
+        assert isinstance(course_id, CourseKey)
+        self.course_id = course_id
+        self.asides = [] if asides is None else asides
+        self.read_only = read_only
+
+        self._descriptors = list(descriptors)
+        self._users_by_id = {user.id: user for user in users if user.is_authenticated}
+        self._user_states = defaultdict(list)
+        self._preferences = defaultdict(list)
+        self._user_info = defaultdict(list)
+        self._user_state_summary = UserStateSummaryCache(self.course_id)
+        self.scorable_locations = set(desc.location for desc in self._descriptors if desc.has_score)
+
+        fields_to_cache = _fields_to_cache(self._descriptors)
+        if Scope.user_state_summary in fields_to_cache:
+            self._user_state_summary.cache_fields(
+                fields_to_cache[Scope.user_state_summary], self._descriptors, self.asides,
+            )
+        for user_ids in chunks(self._users_by_id, chunk_size):
+            if Scope.user_state in fields_to_cache:
+                self._read_user_states(user_ids)
+            if Scope.preferences in fields_to_cache:
+                self._read_preferences(user_ids, fields_to_cache[Scope.preferences])
+            if Scope.user_info in fields_to_cache:
+                self._read_user_info(user_ids, fields_to_cache[Scope.user_info])
+
+    @classmethod
+    def cache_for_descriptor_descendents(cls, course_id, users, descriptor, depth=None,
+                                         descriptor_filter=lambda descriptor: True,
+                                         asides=None, read_only=False):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        users: the django users for whom to load modules.
+        descriptor: An XModuleDescriptor
+        depth is the number of levels of descendant modules to load StudentModules for, in addition to
+            the supplied descriptor. If depth is None, load all descendant StudentModules
+        descriptor_filter is a function that accepts a descriptor and return whether the field data
+            should be cached
+        """
+        descriptors = _get_descriptor_descendents(descriptor, depth, descriptor_filter)
+        return cls(descriptors, course_id, users, asides=asides, read_only=read_only)
+
+    def for_user(self, user):
+        """
+        Returns a FieldDataCache for the given user, one of the users this
+        cache was created for, holding the prefetched data of that user.
+        """
+        assert user.id in self._users_by_id
+        field_data_cache = FieldDataCache([], self.course_id, user, asides=self.asides, read_only=self.read_only)
+        field_data_cache.scorable_locations.update(self.scorable_locations)
+
+        field_data_cache.cache[Scope.user_state].cache_user_states(
+            (block_key, dict(field_state)) for block_key, field_state in self._user_states[user.id]
+        )
+        field_data_cache.cache[Scope.preferences].cache_field_objects(self._preferences[user.id])
+        field_data_cache.cache[Scope.user_info].cache_field_objects(self._user_info[user.id])
+        # The user state summary is shared by all users.
+        field_data_cache.cache[Scope.user_state_summary] = self._user_state_summary
+        return field_data_cache
+
+    def _read_user_states(self, user_ids):
+        """
+        Loads the user state of the given users, the same way as
+        DjangoXBlockUserStateClient.get_many does for a single user.
+        """
+        course_key_func = attrgetter('course_key')
+        by_course = groupby(
+            sorted(_all_usage_keys(self._descriptors, self.asides), key=course_key_func),
+            course_key_func,
+        )
+        for course_key, usage_keys in by_course:
+            student_modules = StudentModule.objects.chunked_filter(
+                'module_state_key__in',
+                usage_keys,
+                student_id__in=user_ids,
+                course_id=course_key,
+            )
+            for student_module in student_modules:
+                if student_module.state is None:
+                    continue
+
+                # If the state is the empty dict, then it has been deleted.
+                state = json.loads(student_module.state)
+                if state == {}:
+                    continue
+
+                usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                self._user_states[student_module.student_id].append((usage_key, state))
+
+    def _read_preferences(self, user_ids, fields):
+        """
+        Loads the preferences of the given users, as PreferencesCache does for
+        a single user.
+        """
+        field_objects = XModuleStudentPrefsField.objects.chunked_filter(
+            'module_type__in',
+            _all_block_types(self._descriptors, self.asides),
+            student_id__in=user_ids,
+            field_name__in=set(field.name for field in fields),
+        )
+        for field_object in field_objects:
+            self._preferences[field_object.student_id].append(field_object)
+
+    def _read_user_info(self, user_ids, fields):
+        """
+        Loads the user info of the given users, as UserInfoCache does for a
+        single user.
+        """
+        field_objects = XModuleStudentInfoField.objects.filter(
+            student_id__in=user_ids,
+            field_name__in=set(field.name for field in fields),
+        )
+        for field_object in field_objects:
+            self._user_info[field_object.student_id].append(field_object)
+
+
 class ScoresClient(object):
     """
     Basic client interface for retrieving Score information.
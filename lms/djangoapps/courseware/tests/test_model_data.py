@@ -13,7 +13,7 @@ from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError, MultiUserFieldDataCache
 from courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -424,3 +424,58 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestMultiUserFieldDataCache(TestCase):
+    """Tests for MultiUserFieldDataCache"""
+    def setUp(self):
+        super(TestMultiUserFieldDataCache, self).setUp()
+        self.users = [UserFactory.create() for _ in range(3)]
+        for index, user in enumerate(self.users[:2]):
+            StudentModuleFactory(student=user, state=json.dumps({'existing_field': index}))
+        StudentPrefsFactory(student=self.users[1])
+        StudentInfoFactory(student=self.users[2])
+        UserStateSummaryFactory()
+
+        self.scopes = [Scope.user_state, Scope.preferences, Scope.user_info, Scope.user_state_summary]
+        self.mock_descriptor = mock_descriptor([mock_field(scope, 'existing_field') for scope in self.scopes])
+
+    def _keys(self, user):
+        """
+        Returns the keys of the descriptor's fields for the given user.
+        """
+        return [
+            DjangoKeyValueStore.Key(Scope.user_state, user.id, location('usage_id'), 'existing_field'),
+            DjangoKeyValueStore.Key(Scope.preferences, user.id, 'mock_problem', 'existing_field'),
+            DjangoKeyValueStore.Key(Scope.user_info, user.id, None, 'existing_field'),
+            DjangoKeyValueStore.Key(Scope.user_state_summary, None, location('usage_id'), 'existing_field'),
+        ]
+
+    def test_num_queries(self):
+        # One query for each scope, for all users
+        with self.assertNumQueries(4):
+            multi_user_cache = MultiUserFieldDataCache([self.mock_descriptor], course_id, self.users)
+
+        with self.assertNumQueries(0):
+            for user in self.users:
+                field_data_cache = multi_user_cache.for_user(user)
+                for key in self._keys(user):
+                    field_data_cache.has(key)
+
+    def test_same_as_field_data_cache(self):
+        multi_user_cache = MultiUserFieldDataCache([self.mock_descriptor], course_id, self.users)
+        for user in self.users:
+            expected_cache = FieldDataCache([self.mock_descriptor], course_id, user)
+            field_data_cache = multi_user_cache.for_user(user)
+            self.assertEqual(field_data_cache.scorable_locations, expected_cache.scorable_locations)
+            for key in self._keys(user):
+                self.assertEqual(field_data_cache.has(key), expected_cache.has(key))
+                if expected_cache.has(key):
+                    self.assertEqual(field_data_cache.get(key), expected_cache.get(key))
+
+    def test_set(self):
+        multi_user_cache = MultiUserFieldDataCache([self.mock_descriptor], course_id, self.users)
+        user = self.users[0]
+        key = self._keys(user)[0]
+        DjangoKeyValueStore(multi_user_cache.for_user(user)).set(key, 'new_value')
+        self.assertEqual(FieldDataCache([self.mock_descriptor], course_id, user).get(key), 'new_value')
@@ -5,12 +5,22 @@ defined in edx_user_state_client.
 
 from __future__ import absolute_import
 
+import unittest
 from collections import defaultdict
 
+import ddt
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from edx_user_state_client.tests import UserStateClientTestBase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 
+from courseware.models import StudentModule
 from courseware.tests.factories import UserFactory
-from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_client import DjangoXBlockUserStateClient, _upsert_student_modules
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 
@@ -35,3 +45,138 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
         super(TestDjangoUserStateClient, self).setUp()
         self.client = DjangoXBlockUserStateClient()
         self.users = defaultdict(UserFactory.create)
+
+
+@patch.dict(settings.FEATURES, {'ENABLE_BULK_USER_STATE_UPSERT': True})
+class TestDjangoUserStateClientBulkUpsert(TestDjangoUserStateClient):
+    """
+    Reruns all tests of the DjangoUserStateClient backend with bulk upserts enabled.
+    """
+    __test__ = True
+
+
+@ddt.ddt
+class TestDjangoUserStateClientSetManyQueries(TestCase):
+    """
+    Compares the number of queries made by set_many, with and without bulk upserts,
+    as the number of blocks grows.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientSetManyQueries, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        self.course_key = CourseLocator('org', 'course', 'run')
+
+    def _block_keys_to_state(self, num_blocks, block_type='problem', prefix='block', value=1):
+        """
+        Returns a set_many argument mapping num_blocks usage keys to a small state dict.
+        """
+        return {
+            self.course_key.make_usage_key(block_type, '{}_{}'.format(prefix, index)): {'position': value}
+            for index in range(num_blocks)
+        }
+
+    def _count_set_many_queries(self, block_keys_to_state, bulk_upsert):
+        """
+        Returns the number of queries made by set_many for the given state.
+        """
+        with patch.dict(settings.FEATURES, {'ENABLE_BULK_USER_STATE_UPSERT': bulk_upsert}):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.set_many(self.user.username, block_keys_to_state)
+        return len(queries)
+
+    @ddt.data(5, 20, 100)
+    def test_query_count_vs_num_blocks(self, num_blocks):
+        baseline_created = self._count_set_many_queries(self._block_keys_to_state(2, prefix='a', value=1), True)
+        baseline_updated = self._count_set_many_queries(self._block_keys_to_state(2, prefix='a', value=2), True)
+
+        created = self._count_set_many_queries(self._block_keys_to_state(num_blocks, prefix='b', value=1), True)
+        updated = self._count_set_many_queries(self._block_keys_to_state(num_blocks, prefix='b', value=2), True)
+
+        unbatched_created = self._count_set_many_queries(self._block_keys_to_state(num_blocks, prefix='c'), False)
+
+        # With bulk upserts, the state is written with a constant number of
+        # queries, and only the history of problems takes a query per block.
+        self.assertEqual(created, baseline_created + num_blocks - 2)
+        self.assertEqual(updated, baseline_updated + num_blocks - 2)
+        self.assertGreaterEqual(unbatched_created, 3 * num_blocks)
+
+    def test_mysql_upsert(self):
+        """
+        On MySQL, new rows are written with a single upsert, which updates the
+        state of a row created by another process since it was read, and
+        existing rows are updated by primary key without touching their grade.
+        """
+        if connection.vendor != 'mysql':
+            raise unittest.SkipTest('Only works on MySQL.')
+
+        concurrent_key = self.course_key.make_usage_key('problem', 'concurrent')
+        existing_key = self.course_key.make_usage_key('problem', 'existing')
+        for usage_key in (concurrent_key, existing_key):
+            StudentModule.objects.create(
+                student=self.user,
+                course_id=self.course_key,
+                module_state_key=usage_key,
+                module_type='problem',
+                state='{"position": 1}',
+                grade=1,
+                max_grade=2,
+            )
+
+        now = timezone.now()
+        created_module = StudentModule(
+            student=self.user,
+            course_id=self.course_key,
+            module_state_key=concurrent_key,
+            module_type='problem',
+            state='{"position": 2}',
+            created=now,
+            modified=now,
+        )
+        updated_module = StudentModule.objects.get(student=self.user, module_state_key=existing_key)
+        updated_module.state = '{"position": 3}'
+        updated_module.modified = now
+
+        with CaptureQueriesContext(connection) as queries:
+            _upsert_student_modules([created_module], [updated_module])
+
+        self.assertEqual(
+            [query['sql'].split()[0] for query in queries],
+            ['INSERT', 'UPDATE'],
+        )
+        self.assertIn('ON DUPLICATE KEY UPDATE', queries[0]['sql'])
+        stored_modules = {
+            student_module.module_state_key: student_module
+            for student_module in StudentModule.objects.filter(student=self.user)
+        }
+        self.assertEqual(stored_modules[concurrent_key].state, '{"position": 2}')
+        self.assertEqual(stored_modules[existing_key].state, '{"position": 3}')
+        self.assertEqual(
+            [(student_module.grade, student_module.max_grade) for student_module in stored_modules.values()],
+            [(1, 2), (1, 2)],
+        )
+
+    def test_bulk_upsert_state_and_history(self):
+        first_state = self._block_keys_to_state(3, block_type='problem', value=1)
+        second_state = self._block_keys_to_state(3, block_type='problem', value=2)
+        with patch.dict(settings.FEATURES, {'ENABLE_BULK_USER_STATE_UPSERT': True}):
+            self.client.set_many(self.user.username, first_state)
+            self.client.set_many(self.user.username, {
+                usage_key: dict(state, attempts=1) for usage_key, state in second_state.items()
+            })
+
+        stored_states = {
+            block_state.block_key: block_state.state
+            for block_state in self.client.get_many(self.user.username, list(second_state))
+        }
+        self.assertEqual(stored_states, {usage_key: {'position': 2, 'attempts': 1} for usage_key in second_state})
+
+        for usage_key in second_state:
+            history = list(self.client.get_history(self.user.username, usage_key))
+            self.assertEqual(
+                [entry.state for entry in history],
+                [{'position': 2, 'attempts': 1}, {'position': 1}],
+            )
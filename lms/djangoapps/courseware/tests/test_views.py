@@ -77,6 +77,7 @@ from openedx.features.course_duration_limits.models import CourseDurationLimitCo
 from openedx.features.course_experience import (
     COURSE_ENABLE_UNENROLLED_ACCESS_FLAG,
     COURSE_OUTLINE_PAGE_FLAG,
+    LAZY_UNIT_RENDERING_FLAG,
     UNIFIED_COURSE_TAB_FLAG
 )
 from openedx.features.course_experience.tests.views.helpers import add_course_mode
@@ -2750,6 +2751,18 @@ class TestIndexViewWithVerticalPositions(ModuleStoreTestCase):
         resp = self._get_course_vertical_by_position(input_position)
         self._assert_correct_position(resp, expected_position)
 
+    @ddt.data(True, False)
+    @patch.dict(settings.FEATURES, {'ENABLE_XBLOCK_VIEW_ENDPOINT': True})
+    def test_lazy_unit_rendering(self, lazy_unit_rendering):
+        """
+        Tests that only the active vertical is rendered with the page when
+        units are rendered lazily, the others linking to their content.
+        """
+        with override_waffle_flag(LAZY_UNIT_RENDERING_FLAG, active=lazy_unit_rendering):
+            resp = self._get_course_vertical_by_position('2')
+        self._assert_correct_position(resp, 2)
+        self.assertEqual(resp.content.count('data-content-url='), 2 if lazy_unit_rendering else 0)
+
 
 class TestIndexViewWithGating(ModuleStoreTestCase, MilestonesTestCaseMixin):
     """
@@ -14,13 +14,16 @@ import six
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db import transaction
+from django.db import connections, router, transaction
+from django.db.models import Case, Value, When
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from edx_django_utils import monitoring as monitoring_utils
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
-from courseware.models import BaseStudentModuleHistory, StudentModule
+from courseware.models import BaseStudentModuleHistory, StudentModule, chunks
 
 try:
     import simplejson as json
@@ -244,73 +247,153 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            try:
-                student_module, created = StudentModule.objects.get_or_create(
-                    student=user,
-                    course_id=usage_key.course_key,
-                    module_state_key=usage_key,
-                    defaults={
-                        'state': json.dumps(state),
-                        'module_type': usage_key.block_type,
-                    },
-                )
-            except IntegrityError:
-                # PLAT-1109 - Until we switch to read committed, we cannot rely
-                # on get_or_create to be able to see rows created in another
-                # process. This seems to happen frequently, and ignoring it is the
-                # best course of action for now
-                log.warning(u"set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                    user, repr(six.text_type(usage_key.course_key)), usage_key
-                ))
-                return
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
+        if settings.FEATURES.get('ENABLE_BULK_USER_STATE_UPSERT') and len(block_keys_to_state) > 1:
+            self._bulk_set_many(user, block_keys_to_state)
+        else:
+            for usage_key, state in block_keys_to_state.items():
                 try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
+                    student_module, created = StudentModule.objects.get_or_create(
+                        student=user,
+                        course_id=usage_key.course_key,
+                        module_state_key=usage_key,
+                        defaults={
+                            'state': json.dumps(state),
+                            'module_type': usage_key.block_type,
+                        },
+                    )
                 except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
+                    # PLAT-1109 - Until we switch to read committed, we cannot rely
+                    # on get_or_create to be able to see rows created in another
+                    # process. This seems to happen frequently, and ignoring it is the
+                    # best course of action for now
                     log.warning(u"set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
                         user, repr(six.text_type(usage_key.course_key)), usage_key
                     ))
-                    log.warning(u"set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), list(block_keys_to_state.keys())
-                    ))
+                    return
+
+                num_fields_before = num_fields_after = num_new_fields_set = len(state)
+                num_fields_updated = 0
+                if not created:
+                    if student_module.state is None:
+                        current_state = {}
+                    else:
+                        current_state = json.loads(student_module.state)
+                    num_fields_before = len(current_state)
+                    current_state.update(state)
+                    num_fields_after = len(current_state)
+                    student_module.state = json.dumps(current_state)
+                    try:
+                        with transaction.atomic():
+                            # Updating the object - force_update guarantees no INSERT will occur.
+                            student_module.save(force_update=True)
+                    except IntegrityError:
+                        # The UPDATE above failed. Log information - but ignore the error.
+                        # See https://openedx.atlassian.net/browse/TNL-5365
+                        log.warning(u"set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+                            user, repr(six.text_type(usage_key.course_key)), usage_key
+                        ))
+                        log.warning(u"set_many: All {} block keys: {}".format(
+                            len(block_keys_to_state), list(block_keys_to_state.keys())
+                        ))
+
+                # DataDog and New Relic reporting
+
+                # record the size of state modifications
+                self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+
+                # Record whether a state row has been created or updated.
+                if created:
+                    self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
+                else:
+                    self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
 
-            # DataDog and New Relic reporting
+                # Event to record number of new fields set in set/set_many.
+                num_new_fields_set = num_fields_after - num_fields_before
 
-            # record the size of state modifications
-            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+                # Event to record number of existing fields updated in set/set_many.
+                num_fields_updated = max(0, len(state) - num_new_fields_set)
 
-            # Record whether a state row has been created or updated.
-            if created:
+        # Events for the entire set_many call.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+        self._nr_stat_accumulate('set_many', 'duration', duration)
+
+    def _bulk_set_many(self, user, block_keys_to_state):
+        """
+        Set fields for many XBlocks with a constant number of queries: the
+        existing rows are read in a single query (per course), the stored state
+        is merged with the new state in Python, and all rows are written with a
+        single multi-row upsert.
+
+        The post_save signal is still sent for each written row, so that state
+        history is recorded exactly as it is by :meth:`set_many`.
+
+        Arguments:
+            user (:class:`~User`): The (non-anonymous) user whose state should be set.
+            block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
+        """
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, list(block_keys_to_state))
+        }
+
+        now = timezone.now()
+        created_modules = []
+        updated_modules = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                    created=now,
+                    modified=now,
+                )
+                created_modules.append(student_module)
                 self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
             else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = now
+                updated_modules.append(student_module)
                 self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
 
-            # Event to record number of new fields set in set/set_many.
-            num_new_fields_set = num_fields_after - num_fields_before
+            # record the size of state modifications
+            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
 
-            # Event to record number of existing fields updated in set/set_many.
-            num_fields_updated = max(0, len(state) - num_new_fields_set)
+        try:
+            with transaction.atomic():
+                _upsert_student_modules(created_modules, updated_modules)
+        except IntegrityError:
+            # PLAT-1109 - A row may have been created by another process since
+            # it was read above.  Log information - but ignore the error, as
+            # set_many does for each block.
+            log.warning(u"set_many: IntegrityError for student {} - {} block keys: {}".format(
+                user, len(block_keys_to_state), list(block_keys_to_state.keys())
+            ))
+            return
 
-        # Events for the entire set_many call.
-        finish_time = time()
-        duration = (finish_time - evt_time) * 1000  # milliseconds
-        self._nr_stat_accumulate('set_many', 'duration', duration)
+        if created_modules:
+            # Re-read the newly created rows, since multi-row inserts don't
+            # report their primary keys.
+            created_modules = [
+                student_module
+                for student_module, _ in self._get_student_modules(
+                    user.username, [student_module.module_state_key for student_module in created_modules],
+                )
+            ]
+
+        using = router.db_for_write(StudentModule)
+        for student_module in created_modules:
+            post_save.send(sender=StudentModule, instance=student_module, created=True, update_fields=None,
+                           raw=False, using=using)
+        for student_module in updated_modules:
+            post_save.send(sender=StudentModule, instance=student_module, created=False, update_fields=None,
+                           raw=False, using=using)
 
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
@@ -462,3 +545,56 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                     continue
 
                 yield XBlockUserState(sm.student.username, sm.module_state_key, state, sm.modified, scope)
+
+
+def _upsert_student_modules(created_modules, updated_modules, chunk_size=500):
+    """
+    Writes the given unsaved and already existing :class:`~StudentModule`s with
+    a constant number of queries per chunk of ``chunk_size`` rows.
+
+    New rows are written with a single ``INSERT ... ON DUPLICATE KEY UPDATE``
+    statement on MySQL, which also updates the state of rows that were created by
+    another process since they were read, and with ``bulk_create`` on other
+    databases (e.g. SQLite in tests).  Existing rows are written with a single
+    ``UPDATE`` using a ``CASE`` on the primary key.
+
+    Only the ``state`` and ``modified`` fields of existing rows are updated, so that
+    grades written by other code are not overwritten.
+    """
+    connection = connections[router.db_for_write(StudentModule)]
+    for modules in chunks(created_modules, chunk_size):
+        if connection.vendor == 'mysql':
+            _mysql_upsert_student_modules(connection, modules)
+        else:
+            StudentModule.objects.bulk_create(modules)
+    for modules in chunks(updated_modules, chunk_size):
+        StudentModule.objects.filter(id__in=[module.id for module in modules]).update(
+            state=Case(*[When(id=module.id, then=Value(module.state)) for module in modules]),
+            modified=modules[0].modified,
+        )
+
+
+def _mysql_upsert_student_modules(connection, student_modules):
+    """
+    Writes the given :class:`~StudentModule`s with a single multi-row
+    ``INSERT ... ON DUPLICATE KEY UPDATE`` statement.
+    """
+    fields = [field for field in StudentModule._meta.concrete_fields if not field.primary_key]
+    quote_name = connection.ops.quote_name
+    row_placeholder = u'({})'.format(u', '.join([u'%s'] * len(fields)))
+    sql = u'INSERT INTO {table} ({columns}) VALUES {rows} ON DUPLICATE KEY UPDATE {updates}'.format(
+        table=quote_name(StudentModule._meta.db_table),
+        columns=u', '.join(quote_name(field.column) for field in fields),
+        rows=u', '.join([row_placeholder] * len(student_modules)),
+        updates=u', '.join(
+            u'{column} = VALUES({column})'.format(column=quote_name(StudentModule._meta.get_field(name).column))
+            for name in ('state', 'modified')
+        ),
+    )
+    params = [
+        field.get_db_prep_save(getattr(student_module, field.attname), connection=connection)
+        for student_module in student_modules
+        for field in fields
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
@@ -44,6 +44,7 @@ from openedx.core.djangolib.markup import HTML, Text
 from openedx.features.course_experience import (
     COURSE_ENABLE_UNENROLLED_ACCESS_FLAG,
     COURSE_OUTLINE_PAGE_FLAG,
+    LAZY_UNIT_RENDERING_FLAG,
     default_course_url_name
 )
 from openedx.features.course_experience.views.course_sock import CourseSockFragmentView
@@ -86,6 +87,19 @@ class CoursewareIndex(View):
     def enable_unenrolled_access(self):
         return COURSE_ENABLE_UNENROLLED_ACCESS_FLAG.is_enabled(self.course_key)
 
+    @cached_property
+    def render_units_lazily(self):
+        """
+        Returns whether only the active unit of the section is rendered, the
+        others being fetched from the xblock view endpoint when shown.
+        """
+        return (
+            settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False) and
+            self.request.user.is_authenticated and
+            self.view == STUDENT_VIEW and
+            LAZY_UNIT_RENDERING_FLAG.is_enabled(self.course_key)
+        )
+
     @method_decorator(ensure_csrf_cookie)
     @method_decorator(cache_control(no_cache=True, no_store=True, must_revalidate=True))
     @method_decorator(ensure_valid_course_key)
@@ -379,9 +393,10 @@ class CoursewareIndex(View):
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        # Pre-fetch all descendant data
+        # Pre-fetch all descendant data, or only the data of the units if they are rendered lazily,
+        # the data of the active unit being pre-fetched when rendering the section.
         self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
-        self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
+        self.field_data_cache.add_descriptor_descendents(self.section, depth=1 if self.render_units_lazily else None)
 
         # Bind section to user
         self.section = get_module_for_descriptor(
@@ -477,6 +492,10 @@ class CoursewareIndex(View):
                 table_of_contents['next_of_active_section'],
             )
 
+            if self.render_units_lazily:
+                section_context['lazy_unit_rendering'] = True
+                self._prefetch_active_unit(section_context)
+
             courseware_context['fragment'] = self.section.render(self.view, section_context)
 
             if self.section.position and self.section.has_children:
@@ -484,6 +503,17 @@ class CoursewareIndex(View):
 
         return courseware_context
 
+    def _prefetch_active_unit(self, section_context):
+        """
+        Prefetches all descendant data for the unit of the section shown with
+        the given context, the only one rendered with the section.
+        """
+        active_unit = self.section.get_active_display_item(section_context)
+        if active_unit is not None:
+            # Use an unbound descriptor, so that the descendants aren't bound before their data is fetched.
+            active_unit = modulestore().get_item(active_unit.location, depth=None, lazy=False)
+            self.field_data_cache.add_descriptor_descendents(active_unit, depth=None)
+
     def _add_sequence_title_to_context(self, courseware_context):
         """
         Adds sequence title to the given context.
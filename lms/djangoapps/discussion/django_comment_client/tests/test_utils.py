@@ -5,10 +5,11 @@ from __future__ import absolute_import
 import datetime
 import json
 
+import crum
 import ddt
 import mock
 import six
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
@@ -28,6 +29,7 @@ from lms.djangoapps.teams.tests.factories import CourseTeamFactory
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
+from openedx.core.djangoapps.django_comment_common.comment_client import utils as cc_utils
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
     perform_request
@@ -1834,6 +1836,65 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class ClientTransportTestCase(TestCase):
+    """Test cases for the connections pool and the coalescing of requests to the comment service."""
+
+    def setUp(self):
+        super(ClientTransportTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        self.response = Mock(status_code=200)
+        self.response.json = lambda: {'collection': [{'id': 'thread'}]}
+
+    @override_settings(COMMENTS_SERVICE_POOL_SIZE=5)
+    @patch('requests.request')
+    def test_pool(self, mock_request):
+        """Ensures that the requests share a session, with a pool of the configured size."""
+        with patch('requests.Session.request', return_value=self.response) as mock_session_request:
+            for _ in range(2):
+                self.assertEqual(perform_request('get', 'http://localhost:4567/threads'), self.response.json())
+
+        self.assertEqual(mock_session_request.call_count, 2)
+        self.assertFalse(mock_request.called)
+        session = cc_utils._get_session()
+        self.assertIs(session, cc_utils._get_session())
+        self.assertEqual(session.get_adapter('http://localhost:4567')._pool_maxsize, 5)
+
+    @override_settings(COMMENTS_SERVICE_COALESCE_REQUESTS=True)
+    @patch('requests.request')
+    def test_coalesce_requests(self, mock_request):
+        """Ensures that identical GET requests are only sent once while handling a request."""
+        mock_request.return_value = self.response
+        RequestCache.clear_all_namespaces()
+        self.addCleanup(RequestCache.clear_all_namespaces)
+        crum.set_current_request(RequestFactory().get('/'))
+        self.addCleanup(crum.set_current_request, None)
+
+        result = perform_request('get', 'http://localhost:4567/threads', {'page': 1})
+        result['collection'].append({'id': 'other'})
+        self.assertEqual(perform_request('get', 'http://localhost:4567/threads', {'page': 1}), self.response.json())
+        self.assertEqual(mock_request.call_count, 1)
+
+        perform_request('get', 'http://localhost:4567/threads', {'page': 2})
+        self.assertEqual(mock_request.call_count, 2)
+
+        # The responses of other requests may change the previous ones.
+        perform_request('post', 'http://localhost:4567/threads', {'title': 'title'})
+        perform_request('get', 'http://localhost:4567/threads', {'page': 1})
+        self.assertEqual(mock_request.call_count, 4)
+
+    @override_settings(COMMENTS_SERVICE_COALESCE_REQUESTS=True)
+    @patch('requests.request')
+    def test_coalesce_requests_outside_request(self, mock_request):
+        """Ensures that requests aren't coalesced outside of the handling of a request."""
+        mock_request.return_value = self.response
+        for _ in range(2):
+            perform_request('get', 'http://localhost:4567/threads')
+        self.assertEqual(mock_request.call_count, 2)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
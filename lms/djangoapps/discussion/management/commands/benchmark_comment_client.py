@@ -0,0 +1,97 @@
+"""
+Django command to measure the time taken by the requests a discussion page
+sends to the comments service, against a local stub of the service.
+
+Each page fetches the user info (with the subscriptions), the thread list, and
+the user info again, as the discussion views do.  The pages are loaded with a
+new connection for each request, as before COMMENTS_SERVICE_POOL_SIZE, and
+with a pool of connections and COMMENTS_SERVICE_COALESCE_REQUESTS.
+
+Example usage:
+    $ ./manage.py lms benchmark_comment_client --pages 200 --threads 20
+"""
+from __future__ import absolute_import, division
+
+import json
+import time
+
+import crum
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from edx_django_utils.cache import RequestCache
+from six.moves import range
+
+from openedx.core.djangoapps.django_comment_common.comment_client.utils import perform_request
+from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
+from terrain.stubs.comments import StubCommentsService, StubCommentsServiceHandler
+
+
+class KeepAliveCommentsServiceHandler(StubCommentsServiceHandler):
+    """
+    Stub comments service handler keeping the connections open between
+    requests, as the comments service does.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def send_json_response(self, content):
+        body = json.dumps(content)
+        self.send_response(200, body, {'Content-Type': 'application/json', 'Content-Length': str(len(body))})
+
+    def log_message(self, format_str, *args):
+        pass
+
+
+class KeepAliveCommentsService(StubCommentsService):
+    HANDLER_CLASS = KeepAliveCommentsServiceHandler
+
+
+class Command(BaseCommand):
+    """
+    benchmark_comment_client command
+    """
+    help = "Measure the time taken by the requests of a discussion page to a stub comments service."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=100, help='Number of discussion pages loaded.')
+        parser.add_argument('--threads', type=int, default=20, help='Number of threads of each page.')
+
+    def handle(self, *args, **options):
+        config = ForumsConfig.current()
+        if not config.enabled:
+            config.enabled = True
+            config.save()
+
+        service = KeepAliveCommentsService()
+        try:
+            service.config['threads'] = {
+                u'thread{}'.format(index): {'id': u'thread{}'.format(index), 'title': u'Thread', 'body': u'Body' * 50}
+                for index in range(options['threads'])
+            }
+            url = u'http://127.0.0.1:{}/api/v1'.format(service.port)
+            for name, pool_size, coalesce in (('New connections', 0, False), ('Pooled and coalesced', 10, True)):
+                transport_settings = override_settings(
+                    COMMENTS_SERVICE_POOL_SIZE=pool_size, COMMENTS_SERVICE_COALESCE_REQUESTS=coalesce,
+                )
+                with transport_settings:
+                    self._load_page(url)
+                    start = time.time()
+                    for _ in range(options['pages']):
+                        self._load_page(url)
+                    elapsed = (time.time() - start) / options['pages']
+                self.stdout.write(u'{}: {:.2f} ms per page'.format(name, elapsed * 1000))
+        finally:
+            service.shutdown()
+
+    def _load_page(self, url):
+        """
+        Sends the requests of a discussion page, as part of a new Django request.
+        """
+        RequestCache.clear_all_namespaces()
+        crum.set_current_request(RequestFactory().get('/'))
+        try:
+            user_params = {'complete': True, 'course_id': u'course-v1:edX+DemoX+Demo_Course'}
+            perform_request('get', url + '/users/1', user_params)
+            perform_request('get', url + '/threads', {'page': 1, 'per_page': 20, 'sort_key': 'activity'})
+            perform_request('get', url + '/users/1', user_params)
+        finally:
+            crum.set_current_request(None)
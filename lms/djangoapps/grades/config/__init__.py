@@ -6,7 +6,7 @@ from __future__ import absolute_import
 from django.conf import settings
 
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
-from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT
+from lms.djangoapps.grades.config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, SHARE_COURSE_STRUCTURES
 from lms.djangoapps.grades.config.waffle import waffle as waffle_func
 
 
@@ -27,3 +27,11 @@ def should_persist_grades(course_key):
     Returns whether grades should be persisted.
     """
     return PersistentGradesEnabledFlag.feature_enabled(course_key)
+
+
+def should_share_course_structures():
+    """
+    Returns whether the learners graded together share the course structures
+    transformed for learners with the same access to the course.
+    """
+    return waffle_func().is_enabled(SHARE_COURSE_STRUCTURES)
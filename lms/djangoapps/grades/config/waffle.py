@@ -12,6 +12,8 @@ WAFFLE_NAMESPACE = u'grades'
 # Switches
 ASSUME_ZERO_GRADE_IF_ABSENT = u'assume_zero_grade_if_absent'
 DISABLE_REGRADE_ON_POLICY_CHANGE = u'disable_regrade_on_policy_change'
+DEBOUNCE_SUBSECTION_GRADE_RECALCULATION = u'debounce_subsection_grade_recalculation'
+SHARE_COURSE_STRUCTURES = u'share_course_structures'
 
 # Course Flags
 REJECTED_EXAM_OVERRIDES_GRADE = u'rejected_exam_overrides_grade'
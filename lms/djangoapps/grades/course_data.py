@@ -8,6 +8,8 @@ from lms.djangoapps.course_blocks.api import get_course_blocks
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from xmodule.modulestore.django import modulestore
 
+from .config import should_share_course_structures
+from .grading_plan import get_grading_plan
 from .transformer import GradesTransformer
 
 
@@ -20,7 +22,15 @@ class CourseData(object):
     This is an in-memory object that maintains its own internal
     cache during its lifecycle.
     """
-    def __init__(self, user, course=None, collected_block_structure=None, structure=None, course_key=None):
+    def __init__(
+            self,
+            user,
+            course=None,
+            collected_block_structure=None,
+            structure=None,
+            course_key=None,
+            shared_course_blocks=None,
+    ):
         if not any([course, collected_block_structure, structure, course_key]):
             raise ValueError(
                 "You must specify one of course, collected_block_structure, structure, or course_key to this method."
@@ -28,9 +38,11 @@ class CourseData(object):
         self.user = user
         self._collected_block_structure = collected_block_structure
         self._structure = structure
+        self._shared_course_blocks = shared_course_blocks
         self._course = course
         self._course_key = course_key
         self._location = None
+        self._grading_plan = None
 
     @property
     def course_key(self):
@@ -56,6 +68,8 @@ class CourseData(object):
 
     @property
     def structure(self):
+        if self._structure is None and self._shared_course_blocks is not None and should_share_course_structures():
+            self._structure = self._shared_course_blocks.get(self.user)
         if self._structure is None:
             self._structure = get_course_blocks(
                 self.user,
@@ -76,6 +90,16 @@ class CourseData(object):
             self._course = modulestore().get_course(self.course_key)
         return self._course
 
+    @property
+    def grading_plan(self):
+        """
+        Returns the GradingPlan shared by all learners in this version of
+        the course, or None for CCX courses.
+        """
+        if self._grading_plan is None:
+            self._grading_plan = get_grading_plan(self.course, self.version, self.edited_on)
+        return self._grading_plan
+
     @property
     def grading_policy_hash(self):
         structure = self.effective_structure
@@ -150,8 +150,12 @@ class CourseGradeBase(object):
         """
         Returns the result from the course grader.
         """
-        course = self._prep_course_for_grading(self.course_data.course)
-        return course.grader.grade(
+        grading_plan = self.course_data.grading_plan
+        if grading_plan is not None:
+            grader = grading_plan.grader
+        else:
+            grader = self._prep_course_for_grading(self.course_data.course).grader
+        return grader.grade(
             self.graded_subsections_by_format,
             generate_random_scores=settings.GENERATE_PROFILE_SCORES,
         )
@@ -260,10 +264,15 @@ class CourseGrade(CourseGradeBase):
         # side-effects. Once functional, force_update_subsections
         # can be passed through and not confusingly stored and used
         # at a later time.
-        grade_cutoffs = self.course_data.course.grade_cutoffs
         self.percent = self._compute_percent(self.grader_result)
-        self.letter_grade = self._compute_letter_grade(grade_cutoffs, self.percent)
-        self.passed = self._compute_passed(grade_cutoffs, self.percent)
+        grading_plan = self.course_data.grading_plan
+        if grading_plan is not None:
+            self.letter_grade = grading_plan.letter_grade(self.percent)
+            self.passed = grading_plan.passed(self.percent)
+        else:
+            grade_cutoffs = self.course_data.course.grade_cutoffs
+            self.letter_grade = self._compute_letter_grade(grade_cutoffs, self.percent)
+            self.passed = self._compute_passed(grade_cutoffs, self.percent)
         return self
 
     @lazy
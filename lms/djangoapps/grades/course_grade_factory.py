@@ -9,6 +9,7 @@ from logging import getLogger
 import six
 from six import text_type
 
+from lms.djangoapps.course_blocks.api import SharedCourseBlocks
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
@@ -38,6 +39,7 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             create_if_needed=True,
+            shared_course_blocks=None,
     ):
         """
         Returns the CourseGrade for the given user in the course.
@@ -47,9 +49,13 @@ class CourseGradeFactory(object):
         Else, returns None.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        or course_key should be provided.  The course structure of the user
+        is taken from shared_course_blocks, a SharedCourseBlocks, if given
+        and the share_course_structures switch is enabled.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        course_data = CourseData(
+            user, course, collected_block_structure, course_structure, course_key, shared_course_blocks,
+        )
         try:
             return self._read(user, course_data)
         except PersistentCourseGrade.DoesNotExist:
@@ -68,15 +74,20 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             force_update_subsections=False,
+            shared_course_blocks=None,
     ):
         """
         Computes, updates, and returns the CourseGrade for the given
         user in the course.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        or course_key should be provided.  The course structure of the user
+        is taken from shared_course_blocks, a SharedCourseBlocks, if given
+        and the share_course_structures switch is enabled.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        course_data = CourseData(
+            user, course, collected_block_structure, course_structure, course_key, shared_course_blocks,
+        )
         return self._update(
             user,
             course_data,
@@ -100,7 +111,7 @@ class CourseGradeFactory(object):
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
         """
-        # Pre-fetch the collected course_structure (in _iter_grade_result) so:
+        # Pre-fetch the collected course_structure so:
         # 1. Correctness: the same version of the course is used to
         #    compute the grade for all students.
         # 2. Optimization: the collected course_structure is not
@@ -108,17 +119,21 @@ class CourseGradeFactory(object):
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
+        # Learners with the same access to the course can share the course
+        # structure transformed for the first of them.
+        shared_course_blocks = SharedCourseBlocks(course_data.location, course_data.collected_structure)
         stats_tags = [u'action:{}'.format(course_data.course_key)]
         for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+            yield self._iter_grade_result(user, course_data, force_update, shared_course_blocks)
 
-    def _iter_grade_result(self, user, course_data, force_update):
+    def _iter_grade_result(self, user, course_data, force_update, shared_course_blocks):
         try:
             kwargs = {
                 'user': user,
                 'course': course_data.course,
                 'collected_block_structure': course_data.collected_structure,
                 'course_key': course_data.course_key,
+                'shared_course_blocks': shared_course_blocks,
             }
             if force_update:
                 kwargs['force_update_subsections'] = True
@@ -0,0 +1,81 @@
+"""
+Coalesces the subsection grade recalculations requested for the same learner
+and problem within a short window.
+
+Each request registers a new token in the cache before its task is enqueued
+(with a delay of RECALCULATION_DEBOUNCE_SECONDS).  When a task runs, it is
+skipped if another request registered a newer token for the same key in the
+meantime: the task of that later request, which reads the scores from the
+database when it runs, will take all of the changes into account.  The task
+of the last request always runs, even if its token was evicted from the
+cache.
+"""
+from __future__ import absolute_import
+
+from hashlib import md5
+from logging import getLogger
+from uuid import uuid4
+
+import six
+from django.core.cache import cache
+from edx_django_utils import monitoring as monitoring_utils
+
+log = getLogger(__name__)
+
+# How long the recalculation of a subsection grade is delayed, so that the
+# requests that follow within that time are coalesced with it.
+RECALCULATION_DEBOUNCE_SECONDS = 10
+
+# How long tokens are kept, which needs to be well above the debounce delay
+# to account for queueing.
+RECALCULATION_TOKEN_TIMEOUT_SECONDS = 10 * 60
+
+# Task arguments whose values must be equal for requests to be coalesced.
+_COALESCED_TASK_ARGS = ('user_id', 'usage_id', 'only_if_higher', 'score_deleted', 'score_db_table',
+                        'force_update_subsections')
+
+
+def register_recalculation(task_kwargs):
+    """
+    Records a request to recalculate the subsection grades for the given
+    recalculate_subsection_grade_v3 task kwargs, superseding any pending
+    request for the same learner and problem.
+
+    Returns the token to pass to the task as its debounce_token kwarg.
+    """
+    token = uuid4().hex
+    cache_key = _cache_key(task_kwargs)
+    if cache.get(cache_key) is not None:
+        monitoring_utils.increment('grades.recalculate_subsection_grade.superseded')
+    cache.set(cache_key, token, RECALCULATION_TOKEN_TIMEOUT_SECONDS)
+    return token
+
+
+def is_recalculation_superseded(task_kwargs):
+    """
+    Returns whether the recalculation task with the given kwargs can be
+    skipped because the same recalculation was requested again since.
+    """
+    token = task_kwargs.get('debounce_token')
+    if token is None:
+        return False
+
+    latest_token = cache.get(_cache_key(task_kwargs))
+    if latest_token is None or latest_token == token:
+        return False
+
+    log.info(
+        u'Grades: skipping subsection grade recalculation superseded by a later request for user %s and block %s.',
+        task_kwargs['user_id'],
+        task_kwargs['usage_id'],
+    )
+    monitoring_utils.increment('grades.recalculate_subsection_grade.collapsed')
+    return True
+
+
+def _cache_key(task_kwargs):
+    """
+    Returns the cache key of the latest token for the given task kwargs.
+    """
+    key_values = u'.'.join(six.text_type(task_kwargs.get(arg)) for arg in _COALESCED_TASK_ARGS)
+    return u'grades.recalculate_subsection_grade.{}'.format(md5(key_values.encode('utf-8')).hexdigest())
@@ -0,0 +1,119 @@
+"""
+Grading plans: the parts of grading a course that are the same for all
+learners in a given version of the course.
+"""
+from __future__ import absolute_import
+
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+
+from ccx_keys.locator import CCXLocator
+from lazy import lazy
+
+from xmodule.graders import grader_from_conf
+
+# Maximum number of grading plans (one per course version) kept in memory by
+# each process.
+GRADING_PLAN_CACHE_SIZE = 100
+
+_grading_plan_cache = OrderedDict()
+_grading_plan_cache_lock = Lock()
+
+
+class GradingPlan(object):
+    """
+    Immutable description of how a version of a course is graded: the
+    course's grader_config and grade_cutoffs, with the grader built from
+    them and the cutoffs sorted once, and shared by all learners.
+    """
+    def __init__(self, course_key, grader_config, grade_cutoffs):
+        self.course_key = course_key
+        self.grader_config = grader_config
+        self.grade_cutoffs = grade_cutoffs
+
+        # Possible grades, sorted in descending order of score
+        self._descending_grades = sorted(grade_cutoffs, key=lambda x: grade_cutoffs[x], reverse=True)
+        nonzero_cutoffs = [cutoff for cutoff in grade_cutoffs.values() if cutoff > 0]
+        self._success_cutoff = min(nonzero_cutoffs) if nonzero_cutoffs else None
+
+    @classmethod
+    def create(cls, course):
+        """
+        Returns the GradingPlan for the given course.
+        """
+        return cls(course.id, deepcopy(course.raw_grader), dict(course.grade_cutoffs))
+
+    @lazy
+    def grader(self):
+        """
+        Returns the course grader, as configured by the grading policy.
+        """
+        return grader_from_conf(self.grader_config)
+
+    def has_grading_policy(self, course):
+        """
+        Returns whether this plan was created for the grading policy
+        currently set on the given course.
+        """
+        return self.grader_config == course.raw_grader and self.grade_cutoffs == course.grade_cutoffs
+
+    def letter_grade(self, percent):
+        """
+        Returns the course letter grade for the given percent, as
+        defined in the grading policy (e.g. 'A' 'B' 'C'), or None if
+        not passed.
+        """
+        for possible_grade in self._descending_grades:
+            if percent >= self.grade_cutoffs[possible_grade]:
+                return possible_grade
+        return None
+
+    def passed(self, percent):
+        """
+        Returns whether the given percent value is a passing grade.
+        """
+        return self._success_cutoff and percent >= self._success_cutoff
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def get_grading_plan(course, course_version, edited_on):
+    """
+    Returns the GradingPlan for the given version of the course, creating
+    it if it is not cached yet.
+
+    Returns None for CCX courses, whose grading policy can be overridden
+    independently of the course version.
+    """
+    if isinstance(course.id, CCXLocator):
+        return None
+
+    # Without a version, there is no telling whether a cached plan is stale.
+    cache_key = (course.id, course_version, edited_on) if course_version or edited_on else None
+
+    grading_plan = _grading_plan_cache.get(cache_key) if cache_key else None
+    if grading_plan is not None and grading_plan.has_grading_policy(course):
+        return grading_plan
+
+    grading_plan = GradingPlan.create(course)
+    if cache_key:
+        with _grading_plan_cache_lock:
+            _grading_plan_cache.pop(cache_key, None)
+            _grading_plan_cache[cache_key] = grading_plan
+            while len(_grading_plan_cache) > GRADING_PLAN_CACHE_SIZE:
+                _grading_plan_cache.popitem(last=False)
+    return grading_plan
+
+
+def clear_grading_plan_cache():
+    """
+    Clears the grading plans cached by this process.
+    """
+    with _grading_plan_cache_lock:
+        _grading_plan_cache.clear()
+
@@ -20,8 +20,10 @@ from track.event_transaction_utils import get_event_transaction_id, get_event_tr
 from util.date_utils import to_timestamp
 
 from .. import events
+from ..config.waffle import DEBOUNCE_SUBSECTION_GRADE_RECALCULATION, waffle
 from ..constants import ScoreDatabaseTableEnum
 from ..course_grade_factory import CourseGradeFactory
+from ..debounce import RECALCULATION_DEBOUNCE_SECONDS, register_recalculation
 from ..scores import weighted_score
 from ..tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
@@ -218,22 +220,27 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     enqueueing a subsection update operation to occur asynchronously.
     """
     events.grade_updated(**kwargs)
-    recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=six.text_type(get_event_transaction_id()),
-            event_transaction_type=six.text_type(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-            force_update_subsections=kwargs.get('force_update_subsections', False),
-        ),
-        countdown=RECALCULATE_GRADE_DELAY_SECONDS,
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=six.text_type(get_event_transaction_id()),
+        event_transaction_type=six.text_type(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
+        force_update_subsections=kwargs.get('force_update_subsections', False),
     )
+    countdown = RECALCULATE_GRADE_DELAY_SECONDS
+    if waffle().is_enabled(DEBOUNCE_SUBSECTION_GRADE_RECALCULATION):
+        # Requests for the same learner and problem that follow within the
+        # delay are coalesced into the last one.
+        task_kwargs['debounce_token'] = register_recalculation(task_kwargs)
+        countdown = max(countdown, RECALCULATION_DEBOUNCE_SECONDS)
+
+    recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=countdown)
 
 
 @receiver(SUBSECTION_SCORE_CHANGED)
@@ -30,6 +30,7 @@ from xmodule.modulestore.django import modulestore
 from .config.waffle import DISABLE_REGRADE_ON_POLICY_CHANGE, waffle
 from .constants import ScoreDatabaseTableEnum
 from .course_grade_factory import CourseGradeFactory
+from .debounce import is_recalculation_superseded
 from .exceptions import DatabaseNotReadyError
 from .grade_utils import are_grades_frozen
 from .signals.signals import SUBSECTION_SCORE_CHANGED
@@ -202,6 +203,9 @@ def _recalculate_subsection_grade(self, **kwargs):
             event at the root of the current event transaction.
         score_db_table (ScoreDatabaseTableEnum): database table that houses
             the changed score. Used in conjunction with expected_modified_time.
+        debounce_token (string, OPTIONAL): token identifying the request for
+            this recalculation, which is skipped if a later request for the
+            same recalculation was made since (see grades/debounce.py).
     """
     try:
         course_key = CourseLocator.from_string(kwargs['course_id'])
@@ -209,6 +213,10 @@ def _recalculate_subsection_grade(self, **kwargs):
             log.info(u"Attempted _recalculate_subsection_grade for course '%s', but grades are frozen.", course_key)
             return
 
+        if is_recalculation_superseded(kwargs):
+            set_custom_metric('recalculate_subsection_grade_superseded', True)
+            return
+
         scored_block_usage_key = UsageKey.from_string(kwargs['usage_id']).replace(course_key=course_key)
 
         set_custom_metrics_for_course_key(course_key)
@@ -13,11 +13,12 @@ from six import text_type
 from courseware.access import has_access
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangoapps.content.block_structure.manager import BlockStructureManager
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
-from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
+from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, SHARE_COURSE_STRUCTURES, waffle
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
@@ -243,6 +244,7 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertEqual(expected_summary, actual_summary)
 
 
+@ddt.ddt
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
     Test iteration through student course grades.
@@ -297,6 +299,24 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             self.assertIsNone(course_grade.letter_grade)
             self.assertEqual(course_grade.percent, 0.0)
 
+    @ddt.data(True, False)
+    def test_shared_course_structures(self, share_course_structures):
+        """
+        The students, who all have the same access to the course, share a
+        transformed course structure if the switch is enabled.
+        """
+        with waffle().override(SHARE_COURSE_STRUCTURES, active=share_course_structures):
+            with patch.object(
+                BlockStructureManager,
+                'get_transformed',
+                autospec=True,
+                side_effect=BlockStructureManager.get_transformed,
+            ) as mock_get_transformed:
+                grade_results = list(CourseGradeFactory().iter(self.students, self.course, force_update=True))
+
+        self.assertEqual([error for _, _, error in grade_results], [None] * len(self.students))
+        self.assertEqual(mock_get_transformed.call_count, 1 if share_course_structures else len(self.students))
+
     @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
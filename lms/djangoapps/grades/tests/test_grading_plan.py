@@ -0,0 +1,70 @@
+"""
+Tests for the GradingPlan class.
+"""
+from __future__ import absolute_import
+
+from copy import deepcopy
+
+import ddt
+from mock import patch
+
+from student.tests.factories import UserFactory
+from xmodule.graders import grader_from_conf
+
+from ..course_data import CourseData
+from ..course_grade import CourseGrade
+from ..course_grade_factory import CourseGradeFactory
+from ..grading_plan import GradingPlan, clear_grading_plan_cache, get_grading_plan
+from .base import GradeTestBase
+
+
+@ddt.ddt
+class TestGradingPlan(GradeTestBase):
+    """
+    Tests for the GradingPlan shared by all learners in a course.
+    """
+    def setUp(self):
+        super(TestGradingPlan, self).setUp()
+        clear_grading_plan_cache()
+        self.addCleanup(clear_grading_plan_cache)
+
+    def _get_grading_plan(self):
+        """
+        Returns the grading plan for the current version of the course.
+        """
+        course_data = CourseData(None, course=self.course)
+        return get_grading_plan(self.course, course_data.version, course_data.edited_on)
+
+    def test_create(self):
+        grading_plan = GradingPlan.create(self.course)
+        self.assertEqual(grading_plan.grader_config, self.course.raw_grader)
+        self.assertEqual(grading_plan.grade_cutoffs, self.course.grade_cutoffs)
+        self.assertEqual(
+            [subgrader[1] for subgrader in grading_plan.grader.subgraders],
+            [subgrader[1] for subgrader in self.course.grader.subgraders],
+        )
+
+    @ddt.data(0.0, 0.49, 0.5, 0.51, 1.0)
+    def test_letter_grade(self, percent):
+        grading_plan = GradingPlan.create(self.course)
+        grade_cutoffs = self.course.grade_cutoffs
+        self.assertEqual(grading_plan.letter_grade(percent), CourseGrade._compute_letter_grade(grade_cutoffs, percent))
+        self.assertEqual(grading_plan.passed(percent), CourseGrade._compute_passed(grade_cutoffs, percent))
+
+    def test_cached(self):
+        grading_plan = self._get_grading_plan()
+        self.assertIs(self._get_grading_plan(), grading_plan)
+        self.assertIs(deepcopy(grading_plan), grading_plan)
+
+        self._set_grading_policy(passing=0.75)
+        new_grading_plan = self._get_grading_plan()
+        self.assertIsNot(new_grading_plan, grading_plan)
+        self.assertEqual(new_grading_plan.grade_cutoffs, {'Pass': 0.75})
+
+    def test_shared_by_learners(self):
+        users = [UserFactory.create() for _ in range(3)]
+        with patch('lms.djangoapps.grades.grading_plan.grader_from_conf', wraps=grader_from_conf) as mock_grader:
+            for result in CourseGradeFactory().iter(users, course=self.course, force_update=True):
+                self.assertIsNone(result.error)
+                self.assertIsNotNone(result.course_grade)
+        self.assertEqual(mock_grader.call_count, 1)
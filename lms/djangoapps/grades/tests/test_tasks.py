@@ -20,8 +20,14 @@ from six.moves import range
 
 from lms.djangoapps.grades import tasks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
-from lms.djangoapps.grades.config.waffle import ENFORCE_FREEZE_GRADE_AFTER_COURSE_END, waffle_flags
+from lms.djangoapps.grades.config.waffle import (
+    DEBOUNCE_SUBSECTION_GRADE_RECALCULATION,
+    ENFORCE_FREEZE_GRADE_AFTER_COURSE_END,
+    waffle,
+    waffle_flags
+)
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
+from lms.djangoapps.grades.debounce import RECALCULATION_DEBOUNCE_SECONDS
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.services import GradesService
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
@@ -157,6 +163,43 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
             PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
             mock_task_apply.assert_called_once_with(countdown=RECALCULATE_GRADE_DELAY_SECONDS, kwargs=local_task_args)
 
+    def _enqueue_debounced_recalculations(self, only_if_higher_values):
+        """
+        Sends a PROBLEM_WEIGHTED_SCORE_CHANGED signal for each of the given
+        only_if_higher values with debouncing enabled, and returns the kwargs
+        of the enqueued tasks.
+        """
+        with waffle().override(DEBOUNCE_SUBSECTION_GRADE_RECALCULATION, active=True):
+            with patch(
+                'lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async',
+                return_value=None
+            ) as mock_task_apply:
+                for only_if_higher in only_if_higher_values:
+                    send_args = dict(self.problem_weighted_score_changed_kwargs, only_if_higher=only_if_higher)
+                    PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
+
+        for call in mock_task_apply.call_args_list:
+            self.assertEqual(call[1]['countdown'], RECALCULATION_DEBOUNCE_SECONDS)
+        return [call[1]['kwargs'] for call in mock_task_apply.call_args_list]
+
+    @ddt.data(
+        ([None, None, None], 1),
+        ([None, True, None], 2),
+    )
+    @ddt.unpack
+    def test_debounced_recalculation(self, only_if_higher_values, expected_updates):
+        self.set_up_course()
+        enqueued_task_kwargs = self._enqueue_debounced_recalculations(only_if_higher_values)
+        self.assertEqual(len(enqueued_task_kwargs), len(only_if_higher_values))
+
+        with self.mock_csm_get_score(), patch('lms.djangoapps.grades.tasks._update_subsection_grades') as mock_update:
+            for task_kwargs in enqueued_task_kwargs:
+                recalculate_subsection_grade_v3.apply(kwargs=task_kwargs)
+
+        # The last request is always processed.
+        self.assertEqual(mock_update.call_count, expected_updates)
+        self.assertEqual(mock_update.call_args[0][2], only_if_higher_values[-1])
+
     @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
     def test_triggers_subsection_score_signal(self, mock_subsection_signal):
         """
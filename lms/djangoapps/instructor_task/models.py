@@ -20,13 +20,15 @@ import hashlib
 import json
 import logging
 import os.path
+import shutil
+import tempfile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.db import models, transaction
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
@@ -276,6 +278,47 @@ class DjangoStorageReportStore(ReportStore):
         output_buffer.seek(0)
         self.store(course_id, filename, output_buffer)
 
+    def store_concatenated_rows(self, course_id, filename, header_rows, fragment_filenames):
+        """
+        Given a course_id, filename, header rows and the filenames of csv
+        fragments previously written with `store_rows`, write the header rows
+        followed by the rows of each fragment, in the given order, to the
+        storage backend in csv format.  The fragments are copied through a
+        temporary file, so the whole report is never held in memory.
+        """
+        with tempfile.TemporaryFile() as output_file:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            output_file.write(codecs.BOM_UTF8)
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(header_rows))
+            for fragment_filename in fragment_filenames:
+                with self.storage.open(self.path_to(course_id, fragment_filename)) as fragment_file:
+                    # Each fragment starts with its own BOM, which is skipped.
+                    if fragment_file.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+                        fragment_file.seek(0)
+                    shutil.copyfileobj(fragment_file, output_file)
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file, name=filename))
+
+    def filenames_in(self, course_id, dirname):
+        """
+        For a given `course_id`, return the sorted list of names (relative
+        to the course directory) of the files stored in `dirname`.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.path_to(course_id, dirname))
+        except OSError:
+            # Django's FileSystemStorage fails with an OSError if the
+            # directory does not exist.
+            return []
+        return sorted(os.path.join(dirname, filename) for filename in filenames)
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file named `filename` for the given `course_id`.
+        """
+        self.storage.delete(self.path_to(course_id, filename))
+
     def links_for(self, course_id):
         """
         For a given `course_id`, return a list of `(filename, url)` tuples.
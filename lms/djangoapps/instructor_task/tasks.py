@@ -37,7 +37,13 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_may_enroll_csv,
     upload_students_csv
 )
-from lms.djangoapps.instructor_task.tasks_helper.grades import CourseGradeReport, ProblemGradeReport, ProblemResponses
+from lms.djangoapps.instructor_task.tasks_helper.grades import (
+    PARALLELIZE_COURSE_GRADE_REPORT,
+    WAFFLE_SWITCHES,
+    CourseGradeReport,
+    ProblemGradeReport,
+    ProblemResponses
+)
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
@@ -79,7 +85,7 @@ def rescore_problem(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('rescored')
     update_fcn = partial(rescore_problem_module_state, xmodule_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, prefetch_field_data=True)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
@@ -92,7 +98,7 @@ def override_problem_score(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('overridden')
     update_fcn = partial(override_score_module_state, xmodule_instance_args)
 
-    visit_fcn = partial(perform_module_state_update, update_fcn, None)
+    visit_fcn = partial(perform_module_state_update, update_fcn, None, prefetch_field_data=True)
     return run_main_task(entry_id, visit_fcn, action_name)
 
 
@@ -185,10 +191,26 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    if WAFFLE_SWITCHES.is_enabled(PARALLELIZE_COURSE_GRADE_REPORT):
+        task_fn = partial(CourseGradeReport.generate_in_subtasks, calculate_grades_csv_subtask, xmodule_instance_args)
+    else:
+        task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
+def calculate_grades_csv_subtask(entry_id, xmodule_instance_args, user_ids, subtask_status_dict):
+    """
+    Grade a batch of users of a course, as a subtask of `calculate_grades_csv`,
+    and push the results to the report store as CSV fragments.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('graded')
+    return CourseGradeReport.generate_for_users(
+        xmodule_instance_args, entry_id, user_ids, subtask_status_dict, action_name
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
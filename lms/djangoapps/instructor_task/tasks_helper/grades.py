@@ -3,16 +3,20 @@ Functionality for generating grade reports.
 """
 from __future__ import absolute_import
 
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from itertools import chain
 from time import time
 
 import six
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -28,6 +32,13 @@ from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCe
 from lms.djangoapps.grades.api import CourseGradeFactory
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -41,11 +52,16 @@ from xmodule.partitions.partitions_service import PartitionService
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import upload_csv_fragments_to_report_store, upload_csv_to_report_store
 
 WAFFLE_NAMESPACE = 'instructor_task'
 WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = 'optimize_get_learners_for_course'
+PARALLELIZE_COURSE_GRADE_REPORT = 'parallelize_course_grade_report'
+
+# Directory, relative to the course directory of the report store, in which
+# the CSV fragments of grade reports generated by subtasks are stored.
+GRADE_REPORT_FRAGMENTS_DIR = u'grade_report_fragments'
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -197,6 +213,49 @@ class _CourseGradeBulkContext(object):
         BulkCourseTags.prefetch(context.course_id, users)
 
 
+def _fragments_dir(entry_id, csv_name):
+    """
+    Returns the directory in which the CSV fragments of the given report of
+    the given InstructorTask are stored.
+    """
+    return u'/'.join((GRADE_REPORT_FRAGMENTS_DIR, text_type(entry_id), csv_name))
+
+
+def _delete_fragments(course_id, entry_id):
+    """
+    Deletes the CSV fragments of all reports of the given InstructorTask.
+    """
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    for csv_name in ('grade_report', 'grade_report_err'):
+        for fragment_filename in report_store.filenames_in(course_id, _fragments_dir(entry_id, csv_name)):
+            report_store.delete(course_id, fragment_filename)
+
+
+def _log_unknown_completion(task_id, entry_id):
+    """
+    Logs that the status of the given subtask was saved, but that whether it
+    completed the given InstructorTask is unknown, so the grade report was
+    neither uploaded nor cleaned up.
+    """
+    TASK_LOG.error(
+        u'Grade report subtask %s for InstructorTask %s could not tell whether it completed the task, '
+        u'not uploading grades',
+        task_id, entry_id,
+    )
+
+
+@transaction.atomic
+def _set_task_state(entry_id, task_state, task_output=None):
+    """
+    Sets the state, and optionally the output, of the given InstructorTask.
+    """
+    entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+    entry.task_state = task_state
+    if task_output is not None:
+        entry.task_output = task_output
+    entry.save()
+
+
 class CourseGradeReport(object):
     """
     Class to encapsulate functionality related to generating Grade Reports.
@@ -213,6 +272,88 @@ class CourseGradeReport(object):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def generate_in_subtasks(cls, subtask, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+        """
+        Public method to generate a grade report by fanning the enrolled
+        users out into batches of settings.GRADES_DOWNLOAD_USERS_PER_TASK,
+        each of which is graded by the given celery subtask (see
+        `generate_for_users`).  The subtasks store their rows as CSV
+        fragments in the report store, and the last subtask to complete
+        concatenates them into the report.
+        """
+        enrolled_users = get_user_model().objects.filter(courseenrollment__course_id=course_id).order_by('id')
+        total_num_users = enrolled_users.count()
+        if total_num_users == 0:
+            # There are no subtasks to complete the report, so upload the
+            # (empty) report right away.
+            context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            report = CourseGradeReport()
+            report._upload(context, report._success_headers(context), [], report._error_headers(), [])
+            return context.update_status(u'Completed grades')
+
+        def _create_subtask(user_list, initial_subtask_status):
+            """Creates a subtask to generate the report rows of the given users."""
+            return subtask.subtask(
+                (
+                    _entry_id,
+                    _xmodule_instance_args,
+                    [user['pk'] for user in user_list],
+                    initial_subtask_status.to_dict(),
+                ),
+                task_id=initial_subtask_status.task_id,
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        return queue_subtasks_for_query(
+            entry,
+            action_name,
+            _create_subtask,
+            [enrolled_users],
+            [],
+            settings.GRADES_DOWNLOAD_USERS_PER_TASK,
+            total_num_users,
+        )
+
+    @classmethod
+    def generate_for_users(cls, _xmodule_instance_args, _entry_id, user_ids, subtask_status_dict, action_name):
+        """
+        Public method to generate the rows of a grade report for the given
+        users, as one of the subtasks queued by `generate_in_subtasks`.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(_entry_id, current_task_id, subtask_status)
+
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        try:
+            with modulestore().bulk_operations(course_id):
+                context = _CourseGradeReportContext(
+                    _xmodule_instance_args, _entry_id, course_id, json.loads(entry.task_input), action_name
+                )
+                report = CourseGradeReport()
+                success_rows, error_rows = report._store_fragments(context, _entry_id, user_ids)
+        except Exception:
+            TASK_LOG.exception(u'Grade report subtask %s for InstructorTask %s failed', current_task_id, _entry_id)
+            subtask_status.increment(failed=len(user_ids), state=FAILURE)
+            completed_task = update_subtask_status(_entry_id, current_task_id, subtask_status)
+            if completed_task is None:
+                _log_unknown_completion(current_task_id, _entry_id)
+            elif completed_task:
+                _delete_fragments(course_id, _entry_id)
+            raise
+
+        subtask_status.increment(succeeded=len(success_rows), failed=len(error_rows), state=SUCCESS)
+        # The task is only marked as succeeded once the report is uploaded.
+        completed_task = update_subtask_status(_entry_id, current_task_id, subtask_status, complete_task=False)
+        if completed_task is None:
+            _log_unknown_completion(current_task_id, _entry_id)
+        elif completed_task:
+            report._complete_subtasks(context, _entry_id)
+        return subtask_status.to_dict()
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -286,6 +427,66 @@ class CourseGradeReport(object):
             error_rows = [error_headers] + error_rows
             upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
 
+    def _store_fragments(self, context, entry_id, user_ids):
+        """
+        Computes the (success_rows, error_rows) for the given users, and
+        stores them as CSV fragments in the report store.  Fragments are
+        named after the smallest of the user ids, so that sorting them by
+        name orders the report by user id.
+        """
+        users = get_user_model().objects.filter(id__in=user_ids).select_related('profile').order_by('id')
+        success_rows, error_rows = self._rows_for_users(context, users)
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        fragment_name = u'{:012d}.csv'.format(min(user_ids))
+        for csv_name, rows in (('grade_report', success_rows), ('grade_report_err', error_rows)):
+            if rows:
+                fragment_filename = u'/'.join((_fragments_dir(entry_id, csv_name), fragment_name))
+                report_store.store_rows(context.course_id, fragment_filename, rows)
+        return success_rows, error_rows
+
+    def _complete_subtasks(self, context, entry_id):
+        """
+        Merges the CSV fragments stored by the subtasks of the given
+        InstructorTask into the grade report, and then marks the task as
+        succeeded, or as failed if the report could not be uploaded.
+        """
+        try:
+            self._merge_fragments(context, entry_id)
+        except Exception as exc:
+            TASK_LOG.exception(
+                u'%s, Task type: %s, failed to upload grades', context.task_info_string, context.action_name
+            )
+            _set_task_state(entry_id, FAILURE, InstructorTask.create_output_for_failure(exc, traceback.format_exc()))
+            raise
+        _set_task_state(entry_id, SUCCESS)
+
+    def _merge_fragments(self, context, entry_id):
+        """
+        Concatenates the CSV fragments stored by the subtasks of the given
+        InstructorTask into the grade report, and deletes the fragments.
+        The report is not uploaded if any of the subtasks failed.
+        """
+        subtasks = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+        if subtasks['failed']:
+            TASK_LOG.error(
+                u'%s, Task type: %s, %d subtasks failed, not uploading grades',
+                context.task_info_string, context.action_name, subtasks['failed'],
+            )
+        else:
+            report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+            date = datetime.now(UTC)
+            for csv_name, headers in (
+                ('grade_report', self._success_headers(context)),
+                ('grade_report_err', self._error_headers()),
+            ):
+                fragment_filenames = report_store.filenames_in(context.course_id, _fragments_dir(entry_id, csv_name))
+                if fragment_filenames or csv_name == 'grade_report':
+                    upload_csv_fragments_to_report_store(
+                        [headers], fragment_filenames, csv_name, context.course_id, date
+                    )
+        _delete_fragments(context.course_id, entry_id)
+
     def _grades_header(self, context):
         """
         Returns the applicable grades-related headers for this report.
@@ -351,55 +552,47 @@ class CourseGradeReport(object):
         batch_users = users_for_course(context.course_id)
         return batch_users
 
-    def _user_grades(self, course_grade, context):
+    def _user_grades(self, course_grades, context):
         """
-        Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
+        Returns a list of grade results for each of the given course_grades,
+        corresponding to the headers for this report.
         """
-        grade_results = []
+        grade_results = [[course_grade.percent] for course_grade in course_grades]
         for _, assignment_info in six.iteritems(context.graded_assignments):
+            subsection_percents = []
+            for user_grade_results, course_grade in zip(grade_results, course_grades):
+                subsection_grades = [
+                    course_grade.subsection_grade(subsection_location)
+                    for subsection_location in assignment_info['subsection_headers']
+                ]
+                user_grade_results.extend(
+                    subsection_grade.percent_graded if subsection_grade.attempted_graded else u'Not Attempted'
+                    for subsection_grade in subsection_grades
+                )
+                subsection_percents.append([subsection_grade.percent_graded for subsection_grade in subsection_grades])
 
-            subsection_grades, subsection_grades_results = self._user_subsection_grades(
-                course_grade,
-                assignment_info['subsection_headers'],
-            )
-            grade_results.extend(subsection_grades_results)
-
-            assignment_average = self._user_assignment_average(course_grade, subsection_grades, assignment_info)
-            if assignment_average is not None:
-                grade_results.append([assignment_average])
-
-        return [course_grade.percent] + _flatten(grade_results)
-
-    def _user_subsection_grades(self, course_grade, subsection_headers):
-        """
-        Returns a list of grade results for the given course_grade corresponding
-        to the headers for this report.
-        """
-        subsection_grades = []
-        grade_results = []
-        for subsection_location in subsection_headers:
-            subsection_grade = course_grade.subsection_grade(subsection_location)
-            if subsection_grade.attempted_graded:
-                grade_result = subsection_grade.percent_graded
-            else:
-                grade_result = u'Not Attempted'
-            grade_results.append([grade_result])
-            subsection_grades.append(subsection_grade)
-        return subsection_grades, grade_results
-
-    def _user_assignment_average(self, course_grade, subsection_grades, assignment_info):
-        if assignment_info['separate_subsection_avg_headers']:
-            if assignment_info['grader']:
-                if course_grade.attempted:
-                    subsection_breakdown = [
-                        {'percent': subsection_grade.percent_graded}
-                        for subsection_grade in subsection_grades
-                    ]
-                    assignment_average, _ = assignment_info['grader'].total_with_drops(subsection_breakdown)
-                else:
-                    assignment_average = 0.0
-                return assignment_average
+            if assignment_info['separate_subsection_avg_headers'] and assignment_info['grader']:
+                assignment_averages = self._user_assignment_averages(
+                    course_grades, subsection_percents, assignment_info['grader'],
+                )
+                for user_grade_results, assignment_average in zip(grade_results, assignment_averages):
+                    user_grade_results.append(assignment_average)
+
+        return grade_results
+
+    def _user_assignment_averages(self, course_grades, subsection_percents, grader):
+        """
+        Returns the assignment average of each of the given course_grades,
+        the drops of the assignment type's grader being applied to the
+        subsection percents of all the attempted course grades at once.
+        """
+        assignment_averages = [0.0] * len(course_grades)
+        attempted = [index for index, course_grade in enumerate(course_grades) if course_grade.attempted]
+        if attempted:
+            totals = grader.totals_with_drops([subsection_percents[index] for index in attempted])
+            for index, total in zip(attempted, totals.tolist()):
+                assignment_averages[index] = total
+        return assignment_averages
 
     def _user_cohort_group_names(self, user, context):
         """
@@ -479,20 +672,24 @@ class CourseGradeReport(object):
         with modulestore().bulk_operations(context.course_id):
             bulk_context = _CourseGradeBulkContext(context, users)
 
-            success_rows, error_rows = [], []
-            for user, course_grade, error in CourseGradeFactory().iter(
+            grade_results = list(CourseGradeFactory().iter(
                 users,
                 course=context.course,
                 collected_block_structure=context.course_structure,
                 course_key=context.course_id,
-            ):
+            ))
+            course_grades = [course_grade for _, course_grade, _ in grade_results if course_grade]
+            user_grades = iter(self._user_grades(course_grades, context))
+
+            success_rows, error_rows = [], []
+            for user, course_grade, error in grade_results:
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
                     success_rows.append(
                         [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
+                        next(user_grades) +
                         self._user_cohort_group_names(user, context) +
                         self._user_experiment_group_names(user, context) +
                         self._user_team_names(user, bulk_context.teams) +
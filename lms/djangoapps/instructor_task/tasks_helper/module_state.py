@@ -5,6 +5,7 @@ from __future__ import absolute_import
 
 import json
 import logging
+from collections import defaultdict
 from time import time
 
 import six
@@ -15,8 +16,8 @@ from xblock.scorable import Score
 
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
 from courseware.courses import get_course_by_id, get_problems_in_section
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache
-from courseware.models import StudentModule
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache, MultiUserFieldDataCache
+from courseware.models import StudentModule, chunks
 from courseware.module_render import get_module_for_descriptor_internal
 from lms.djangoapps.grades.api import events as grades_events
 from student.models import get_user_by_username_or_email
@@ -31,8 +32,12 @@ from .utils import UNKNOWN_TASK_ID, UPDATE_STATUS_FAILED, UPDATE_STATUS_SKIPPED,
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# Number of StudentModules whose field data is prefetched together.
+MODULE_STATE_UPDATE_BATCH_SIZE = 100
 
-def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name):
+
+def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, task_input, action_name,
+                                prefetch_field_data=False):
     """
     Performs generic update by visiting StudentModule instances with the update_fcn provided.
 
@@ -55,6 +60,10 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
               Pass-through of input `action_name`.
           'duration_ms': how long the task has (or had) been running.
 
+    If `prefetch_field_data` is True, the field data of the modules is loaded for batches of students
+    at once, and the update_fcn is also passed the FieldDataCache of the student as a `field_data_cache`
+    keyword argument.
+
     Because this is run internal to a task, it does not catch exceptions.  These are allowed to pass up to the
     next level, so that it can set the failure modes and capture the error trace in the InstructorTask and the
     result object.
@@ -89,28 +98,57 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, len(modules_to_update), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
-        task_progress.attempted += 1
-        module_descriptor = problems[six.text_type(module_to_update.module_state_key)]
-        # There is no try here:  if there's an error, we let it throw, and the task will
-        # be marked as FAILED, with a stack trace.
-        update_status = update_fcn(module_descriptor, module_to_update, task_input)
-        if update_status == UPDATE_STATUS_SUCCEEDED:
-            # If the update_fcn returns true, then it performed some kind of work.
-            # Logging of failures is left to the update_fcn itself.
-            task_progress.succeeded += 1
-        elif update_status == UPDATE_STATUS_FAILED:
-            task_progress.failed += 1
-        elif update_status == UPDATE_STATUS_SKIPPED:
-            task_progress.skipped += 1
-        else:
-            raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
+    for modules_batch in chunks(modules_to_update, MODULE_STATE_UPDATE_BATCH_SIZE):
+        if prefetch_field_data:
+            field_data_caches = _get_field_data_caches(course_id, problems, modules_batch)
+
+        for module_to_update in modules_batch:
+            task_progress.attempted += 1
+            module_state_key = six.text_type(module_to_update.module_state_key)
+            module_descriptor = problems[module_state_key]
+            update_kwargs = {}
+            if prefetch_field_data:
+                update_kwargs['field_data_cache'] = field_data_caches[module_state_key].for_user(
+                    module_to_update.student
+                )
+            # There is no try here:  if there's an error, we let it throw, and the task will
+            # be marked as FAILED, with a stack trace.
+            update_status = update_fcn(module_descriptor, module_to_update, task_input, **update_kwargs)
+            if update_status == UPDATE_STATUS_SUCCEEDED:
+                # If the update_fcn returns true, then it performed some kind of work.
+                # Logging of failures is left to the update_fcn itself.
+                task_progress.succeeded += 1
+            elif update_status == UPDATE_STATUS_FAILED:
+                task_progress.failed += 1
+            elif update_status == UPDATE_STATUS_SKIPPED:
+                task_progress.skipped += 1
+            else:
+                raise UpdateProblemModuleStateError(u"Unexpected update_status returned: {}".format(update_status))
 
     return task_progress.update_task_state()
 
 
+def _get_field_data_caches(course_id, problems, student_modules):
+    """
+    Returns a dict of MultiUserFieldDataCaches keyed by problem location, each
+    holding the field data of the given problem and its descendants for the
+    students of the given StudentModules of that problem.
+    """
+    students_by_problem = defaultdict(list)
+    for student_module in student_modules:
+        students_by_problem[six.text_type(student_module.module_state_key)].append(student_module.student)
+
+    return {
+        problem_url: MultiUserFieldDataCache.cache_for_descriptor_descendents(
+            course_id, students, problems[problem_url],
+        )
+        for problem_url, students in six.iteritems(students_by_problem)
+    }
+
+
 @outer_atomic
-def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def rescore_problem_module_state(xmodule_instance_args, module_descriptor, student_module, task_input,
+                                 field_data_cache=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs rescoring on the student's problem submission.
@@ -121,6 +159,9 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
 
     Returns True if problem was successfully rescored for the given student, and False
     if problem encountered some kind of error in rescoring.
+
+    If a `field_data_cache` holding the student's data for the module is given, it is used
+    instead of loading that data again.
     '''
     # unpack the StudentModule:
     course_id = student_module.course_id
@@ -138,7 +179,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
             module_descriptor,
             xmodule_instance_args,
             grade_bucket_type='rescore',
-            course=course
+            course=course,
+            field_data_cache=field_data_cache,
         )
 
         if instance is None:
@@ -197,7 +239,8 @@ def rescore_problem_module_state(xmodule_instance_args, module_descriptor, stude
 
 
 @outer_atomic
-def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input):
+def override_score_module_state(xmodule_instance_args, module_descriptor, student_module, task_input,
+                                field_data_cache=None):
     '''
     Takes an XModule descriptor and a corresponding StudentModule object, and
     performs an override on the student's problem score.
@@ -210,6 +253,9 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
 
     Returns True if problem was successfully overriden for the given student, and False
     if problem encountered some kind of error in overriding.
+
+    If a `field_data_cache` holding the student's data for the module is given, it is used
+    instead of loading that data again.
     '''
     # unpack the StudentModule:
     course_id = student_module.course_id
@@ -223,7 +269,8 @@ def override_score_module_state(xmodule_instance_args, module_descriptor, studen
             student,
             module_descriptor,
             xmodule_instance_args,
-            course=course
+            course=course,
+            field_data_cache=field_data_cache,
         )
 
         if instance is None:
@@ -319,16 +366,19 @@ def delete_problem_module_state(xmodule_instance_args, _module_descriptor, stude
 
 
 def _get_module_instance_for_task(course_id, student, module_descriptor, xmodule_instance_args=None,
-                                  grade_bucket_type=None, course=None):
+                                  grade_bucket_type=None, course=None, field_data_cache=None):
     """
     Fetches a StudentModule instance for a given `course_id`, `student` object, and `module_descriptor`.
 
     `xmodule_instance_args` is used to provide information for creating a track function and an XQueue callback.
     These are passed, along with `grade_bucket_type`, to get_module_for_descriptor_internal, which sidesteps
     the need for a Request object when instantiating an xmodule instance.
+
+    `field_data_cache` is the student's FieldDataCache for the module, which is loaded if not given.
     """
     # reconstitute the problem's corresponding XModule:
-    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_id, student, module_descriptor)
+    if field_data_cache is None:
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(course_id, student, module_descriptor)
     student_data = KvsFieldData(DjangoKeyValueStore(field_data_cache))
 
     # get request-related tracking information from args passthrough, and supplement with task-specific
@@ -420,7 +470,7 @@ def _get_modules_to_update(course_id, usage_keys, student_identifier, filter_fcn
     if student:
         module_query_params['student_id'] = student.id
 
-    student_modules = StudentModule.get_state_by_params(**module_query_params)
+    student_modules = StudentModule.get_state_by_params(**module_query_params).select_related('student')
     if filter_fcn is not None:
         student_modules = filter_fcn(student_modules)
 
@@ -37,17 +37,49 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         report_name: string - Name of the generated report
     """
     report_store = ReportStore.from_config(config_name)
-    report_name = u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-        course_prefix=course_filename_prefix_generator(course_id),
-        csv_name=csv_name,
-        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-    )
+    report_name = _report_name(csv_name, course_id, timestamp)
 
     report_store.store_rows(course_id, report_name, rows)
     tracker_emit(csv_name)
     return report_name
 
 
+def upload_csv_fragments_to_report_store(
+    header_rows, fragment_filenames, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'
+):
+    """
+    Upload data as a CSV using ReportStore, concatenating CSV fragments
+    that were previously stored in the same ReportStore.
+
+    Arguments:
+        header_rows: rows to write before the contents of the fragments,
+            in the same format as the `rows` of upload_csv_to_report_store
+        fragment_filenames: names of the fragments to concatenate, in order
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store = ReportStore.from_config(config_name)
+    report_name = _report_name(csv_name, course_id, timestamp)
+
+    report_store.store_concatenated_rows(course_id, report_name, header_rows, fragment_filenames)
+    tracker_emit(csv_name)
+    return report_name
+
+
+def _report_name(csv_name, course_id, timestamp):
+    """
+    Returns the name of the CSV report with the given name for the given course.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
@@ -17,8 +17,10 @@ from django.utils.translation import ugettext_noop
 from mock import MagicMock, Mock, patch
 from opaque_keys.edx.locations import i4xEncoder
 from six.moves import range
+from xblock.fields import Scope
 
 from course_modes.models import CourseMode
+from courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from lms.djangoapps.instructor_task.exceptions import UpdateProblemModuleStateError
@@ -490,6 +492,37 @@ class TestRescoreInstructorTask(TestInstructorTasks):
             action_name='rescored'
         )
 
+    def test_rescoring_prefetched_field_data(self):
+        """
+        Tests that the field data of all students is loaded before rescoring.
+        """
+        mock_instance = MagicMock()
+        getattr(mock_instance, 'rescore').return_value = None
+        mock_instance.has_submitted_answer.return_value = True
+
+        num_students = 3
+        students = self._create_students_with_state(num_students, json.dumps({'done': True}))
+        task_entry = self._create_input_entry()
+        with patch(
+                'lms.djangoapps.instructor_task.tasks_helper.module_state.get_module_for_descriptor_internal'
+        ) as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            with patch.object(FieldDataCache, 'cache_for_descriptor_descendents') as mock_cache:
+                self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        self.assertFalse(mock_cache.called)
+
+        self.assertEqual(
+            sorted(call[1]['user'].id for call in mock_get_module.call_args_list),
+            sorted(student.id for student in students),
+        )
+        for call in mock_get_module.call_args_list:
+            user = call[1]['user']
+            field_data_cache = call[1]['student_data']._kvs._field_data_cache  # pylint: disable=protected-access
+            self.assertEqual(field_data_cache.user, user)
+            self.assertTrue(
+                field_data_cache.get(DjangoKeyValueStore.Key(Scope.user_state, user.id, self.location, 'done'))
+            )
+
 
 class TestResetAttemptsInstructorTask(TestInstructorTasks):
     """Tests instructor task that resets problem attempts."""
@@ -9,6 +9,7 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 from __future__ import absolute_import, unicode_literals
 
+import json
 import os
 import shutil
 import tempfile
@@ -52,11 +53,13 @@ from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ProblemGradeReport,
     ProblemResponses
 )
+from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_subtask
 from lms.djangoapps.instructor_task.tasks_helper.misc import (
     cohort_students_and_upload,
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -86,7 +89,7 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.partitions.partitions import Group, UserPartition
 
-from ..models import ReportStore
+from ..models import InstructorTask, ReportStore
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 
@@ -477,6 +480,112 @@ class TestTeamGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(self.student2.username, self.course.id, 'Team Name', team2.name)
 
 
+@override_settings(GRADES_DOWNLOAD_USERS_PER_TASK=2)
+class TestCourseGradeReportSubtasks(InstructorGradeReportTestCase):
+    """
+    Tests that CSV grade reports can be generated in subtasks.
+    """
+    def setUp(self):
+        super(TestCourseGradeReportSubtasks, self).setUp()
+        self.course = CourseFactory.create()
+        self.entry = InstructorTaskFactory.create(course_id=self.course.id, task_type='grade_course')
+
+    def _generate_in_subtasks(self):
+        """
+        Generates the grade report of the course in (eagerly executed) subtasks.
+        """
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            return CourseGradeReport.generate_in_subtasks(
+                calculate_grades_csv_subtask, None, self.entry.id, self.course.id, None, 'graded'
+            )
+
+    def test_report_rows(self):
+        students = [self.create_student('student{}'.format(i), 'student{}@example.com'.format(i)) for i in range(5)]
+
+        self._generate_in_subtasks()
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.task_state, 'SUCCESS')
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5}, json.loads(self.entry.task_output)
+        )
+        self.assertDictContainsSubset({'total': 3, 'succeeded': 3, 'failed': 0}, json.loads(self.entry.subtasks))
+
+        # only the concatenated report is listed, and the fragments are removed
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+        self.assertEqual(report_store.filenames_in(self.course.id, 'grade_report_fragments/{}/grade_report'.format(
+            self.entry.id
+        )), [])
+        self.verify_rows_in_csv(
+            [
+                {'Student ID': text_type(student.id), 'Username': student.username}
+                for student in students
+            ],
+            ignore_other_columns=True,
+        )
+
+    def test_task_completed_after_upload(self):
+        self.create_student('student', 'student@example.com')
+        task_states = []
+
+        def merge_fragments(report, context, entry_id):  # pylint: disable=unused-argument
+            task_states.append(InstructorTask.objects.get(pk=entry_id).task_state)
+
+        with patch.object(CourseGradeReport, '_merge_fragments', autospec=True, side_effect=merge_fragments):
+            self._generate_in_subtasks()
+
+        self.assertEqual(len(task_states), 1)
+        self.assertNotEqual(task_states[0], 'SUCCESS')
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.task_state, 'SUCCESS')
+
+    @patch.object(CourseGradeReport, '_merge_fragments', side_effect=IOError('Cannot upload report'))
+    def test_upload_failure(self, _mock_merge_fragments):
+        self.create_student('student', 'student@example.com')
+
+        self._generate_in_subtasks()
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.task_state, 'FAILURE')
+        self.assertDictContainsSubset(
+            {'exception': 'IOError', 'message': 'Cannot upload report'}, json.loads(self.entry.task_output)
+        )
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.update_subtask_status', return_value=None)
+    def test_unknown_completion(self, _mock_update_subtask_status):
+        self.create_student('student', 'student@example.com')
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.grades.TASK_LOG') as mock_log:
+            with patch.object(CourseGradeReport, '_merge_fragments') as mock_merge_fragments:
+                self._generate_in_subtasks()
+
+        self.assertTrue(mock_log.error.called)
+        self.assertFalse(mock_merge_fragments.called)
+
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter')
+    def test_grading_failure(self, mock_grades_iter):
+        student = self.create_student('username', 'student@example.com')
+        mock_grades_iter.return_value = [(student, None, TypeError('Cannot grade student'))]
+
+        self._generate_in_subtasks()
+
+        self.entry.refresh_from_db()
+        self.assertDictContainsSubset(
+            {'attempted': 1, 'succeeded': 0, 'failed': 1}, json.loads(self.entry.task_output)
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
+
+    def test_no_enrollments(self):
+        result = self._generate_in_subtasks()
+
+        self.assertDictContainsSubset({'attempted': 0, 'succeeded': 0, 'failed': 0}, result)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.subtasks, '')
+        self.verify_rows_in_csv([])
+
+
 # pylint: disable=protected-access
 class TestProblemResponsesReport(TestReportMixin, InstructorTaskModuleTestCase):
     """
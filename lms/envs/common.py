@@ -373,6 +373,10 @@ FEATURES = {
     # making multiple queries.
     'ENABLE_READING_FROM_MULTIPLE_HISTORY_TABLES': True,
 
+    # Write XBlock user state for many blocks with a single multi-row
+    # upsert, rather than a get_or_create and save per block.
+    'ENABLE_BULK_USER_STATE_UPSERT': False,
+
     # Set this to False to facilitate cleaning up invalid xml from your modulestore.
     'ENABLE_XBLOCK_XML_VALIDATION': True,
 
@@ -548,6 +552,11 @@ CACHES = {
     },
 }
 
+# Maximum total size, in bytes, of the pickled course structures
+# kept in each process' local cache in front of 'course_structure_cache'.
+# Set to 0 to disable the local cache.
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = 64 * 1024 * 1024
+
 ############################ OpenID Provider  ##################################
 OPENID_PROVIDER_TRUSTED_ROOTS = ['cs50.net', '*.cs50.net']
 
@@ -993,6 +1002,26 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Serving of course assets by the contentserver middleware.
+# Stream assets from the contentstore, caching only their metadata instead of
+# the whole content of small assets.
+CONTENTSERVER_STREAM_ASSETS = False
+# Directory of a local disk cache of assets, which are then sent by the web
+# server: the response has an X-Accel-Redirect header pointing to
+# CONTENTSERVER_SENDFILE_URL, an internal location of the web server serving
+# this directory. None disables it.
+CONTENTSERVER_SENDFILE_ROOT = None
+CONTENTSERVER_SENDFILE_URL = '/protected-course-assets/'
+# Larger assets are never copied to the local disk cache.
+CONTENTSERVER_SENDFILE_MAX_SIZE = 100 * 1024 * 1024
+# Assets are copied to the local disk cache once they have been requested this
+# many times.
+CONTENTSERVER_SENDFILE_MIN_REQUESTS = 2
+# Maximum total size of the local disk cache.  The least recently sent assets
+# are deleted first, by the evict_asset_copies management command, which is
+# meant to be run on a schedule on each web server.
+CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE = 10 * 1024 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1082,6 +1111,24 @@ CODE_JAIL = {
     },
 }
 
+# Pool of warm sandbox processes, which import numpy and the other modules
+# that problems use once, instead of starting a new sandbox for each
+# execution of jailed code (see capa.safe_exec.sandbox_pool).
+CODE_JAIL_POOL = {
+    # How many idle sandbox processes each process keeps. 0 disables the pool.
+    'size': 0,
+    # How many executions a sandbox process runs before being replaced.
+    'max_uses': 100,
+}
+
+# How many results of jailed code each process keeps in memory, in front of
+# the shared cache (see capa.safe_exec.result_cache). 0 disables it.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 2000
+
+# Total length of the XML of the parsed problems each process keeps in memory
+# (see capa.parsed_problem_cache). 0 disables the cache.
+PARSED_PROBLEM_CACHE_SIZE = 5 * 1024 * 1024
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -2176,6 +2223,11 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of persistent connections over which each bulk email task sends its
+# emails concurrently.  While a task is being rate limited, it sends one email
+# at a time whatever this value.
+BULK_EMAIL_SEND_CONCURRENCY = 1
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2781,6 +2833,10 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Number of users graded by each subtask of a course grade report, when the
+# instructor_task.parallelize_course_grade_report waffle switch is enabled.
+GRADES_DOWNLOAD_USERS_PER_TASK = 1000
+
 POLICY_CHANGE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
@@ -3284,6 +3340,12 @@ JOURNALS_API_URL = 'https://journals-localhost:18000/api/v1/'
 
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
+# Number of connections to the comments service kept open by each process,
+# 0 to open a new connection for each request.
+COMMENTS_SERVICE_POOL_SIZE = 10
+# Send identical GET requests to the comments service only once while handling
+# a request.
+COMMENTS_SERVICE_COALESCE_REQUESTS = True
 
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
@@ -267,6 +267,7 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_SEND_CONCURRENCY = ENV_TOKENS.get('BULK_EMAIL_SEND_CONCURRENCY', BULK_EMAIL_SEND_CONCURRENCY)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -365,6 +366,10 @@ LOGGING = get_logger_config(LOG_DIR,
 COURSE_LISTINGS = ENV_TOKENS.get('COURSE_LISTINGS', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_SIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_SIZE', COMMENTS_SERVICE_POOL_SIZE)
+COMMENTS_SERVICE_COALESCE_REQUESTS = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_COALESCE_REQUESTS', COMMENTS_SERVICE_COALESCE_REQUESTS
+)
 CERT_NAME_SHORT = ENV_TOKENS.get('CERT_NAME_SHORT', CERT_NAME_SHORT)
 CERT_NAME_LONG = ENV_TOKENS.get('CERT_NAME_LONG', CERT_NAME_LONG)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
@@ -394,6 +399,10 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
     else:
         CODE_JAIL[name] = value
 
+CODE_JAIL_POOL.update(ENV_TOKENS.get("CODE_JAIL_POOL", {}))
+SAFE_EXEC_LOCAL_CACHE_SIZE = ENV_TOKENS.get("SAFE_EXEC_LOCAL_CACHE_SIZE", SAFE_EXEC_LOCAL_CACHE_SIZE)
+PARSED_PROBLEM_CACHE_SIZE = ENV_TOKENS.get("PARSED_PROBLEM_CACHE_SIZE", PARSED_PROBLEM_CACHE_SIZE)
+
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
@@ -569,6 +578,17 @@ CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
+CONTENTSERVER_STREAM_ASSETS = ENV_TOKENS.get('CONTENTSERVER_STREAM_ASSETS', CONTENTSERVER_STREAM_ASSETS)
+CONTENTSERVER_SENDFILE_ROOT = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_ROOT', CONTENTSERVER_SENDFILE_ROOT)
+CONTENTSERVER_SENDFILE_URL = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_URL', CONTENTSERVER_SENDFILE_URL)
+CONTENTSERVER_SENDFILE_MAX_SIZE = ENV_TOKENS.get('CONTENTSERVER_SENDFILE_MAX_SIZE', CONTENTSERVER_SENDFILE_MAX_SIZE)
+CONTENTSERVER_SENDFILE_MIN_REQUESTS = ENV_TOKENS.get(
+    'CONTENTSERVER_SENDFILE_MIN_REQUESTS', CONTENTSERVER_SENDFILE_MIN_REQUESTS
+)
+CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE', CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE
+)
+
 EMAIL_HOST_USER = AUTH_TOKENS.get('EMAIL_HOST_USER', '')  # django default is ''
 EMAIL_HOST_PASSWORD = AUTH_TOKENS.get('EMAIL_HOST_PASSWORD', '')  # django default is ''
 
@@ -646,6 +666,7 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADES_DOWNLOAD_USERS_PER_TASK = ENV_TOKENS.get('GRADES_DOWNLOAD_USERS_PER_TASK', GRADES_DOWNLOAD_USERS_PER_TASK)
 
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
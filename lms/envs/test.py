@@ -134,6 +134,9 @@ MOCK_STAFF_GRADING = True
 MOCK_PEER_GRADING = True
 
 COMMENTS_SERVICE_URL = 'http://localhost:4567'
+# The tests mock requests.request, and count the requests sent to the comments service.
+COMMENTS_SERVICE_POOL_SIZE = 0
+COMMENTS_SERVICE_COALESCE_REQUESTS = False
 
 DJFS = {
     'type': 'osfs',
@@ -235,6 +238,9 @@ CACHES = {
     },
 }
 
+# Structures cached locally would persist across tests.
+COURSE_STRUCTURE_CACHE_LOCAL_MAX_BYTES = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -11,7 +11,6 @@ The following internal data structures are implemented:
 from __future__ import absolute_import
 
 from copy import deepcopy
-from functools import partial
 from logging import getLogger
 
 import six
@@ -19,6 +18,7 @@ import six
 from openedx.core.lib.graph_traversals import traverse_post_order, traverse_topologically
 
 from .exceptions import TransformerException
+from .masks import RemovalFilter, UniversalFilter
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -646,9 +646,9 @@ class BlockStructureBlockData(BlockStructure):
         """
         Returns a filter function that always returns True for all blocks.
         """
-        return lambda block_key: True
+        return UniversalFilter(self)
 
-    def create_removal_filter(self, removal_condition, keep_descendants=False):
+    def create_removal_filter(self, removal_condition, keep_descendants=False, removal_mask=None):
         """
         Returns a filter function that automatically removes blocks that satisfy
         the removal_condition.
@@ -660,12 +660,14 @@ class BlockStructureBlockData(BlockStructure):
 
             keep_descendants (bool) - See the description in
                 remove_block.
+
+            removal_mask ((BlockIndex)->int) - Optional function that
+                takes a masks.BlockIndex of the block structure as input
+                and returns the bitset of the blocks satisfying the
+                removal_condition, when it can be computed without
+                calling removal_condition for each block.
         """
-        return partial(
-            self.retain_or_remove,
-            removal_condition=removal_condition,
-            keep_descendants=keep_descendants,
-        )
+        return RemovalFilter(self, removal_condition, keep_descendants, removal_mask)
 
     def retain_or_remove(self, block_key, removal_condition, keep_descendants=False):
         """
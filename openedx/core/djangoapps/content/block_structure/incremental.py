@@ -0,0 +1,144 @@
+"""
+Module for incrementally re-collecting data for BlockStructures.
+
+When a course is published, the newly published structure is compared with
+the previously collected one, using the edit timestamps recorded for each
+block.  Only the changed blocks, their subtrees and their ancestors are then
+re-collected; the previously collected data of all other blocks is reused.
+
+This is only valid for transformers whose collected data for a block depends
+solely on that block and its ancestors (see SUPPORTS_INCREMENTAL_COLLECT in
+BlockStructureTransformer).  Transformers may still read the xBlocks of the
+children of the blocks they collect, as the split_test transformer does, so
+those children are included in the partial structure that is collected.
+"""
+from __future__ import absolute_import
+
+from .block_structure import BlockStructureModulestoreData
+
+# Name of the xBlock field that is collected for every block in order to
+# detect which blocks changed since they were last collected.
+EDITED_ON_FIELD = 'edited_on'
+
+
+def get_changed_blocks(block_structure, collected_block_structure):
+    """
+    Returns the set of usage keys of the blocks in the given (newly created)
+    block_structure that were added, edited or moved since the given
+    collected_block_structure was collected.
+
+    Blocks whose edit timestamps are unknown are always considered changed.
+
+    Arguments:
+        block_structure (BlockStructureModulestoreData) - The block
+            structure newly created from the modulestore.
+
+        collected_block_structure (BlockStructureBlockData) - The block
+            structure previously collected for the same root.
+    """
+    changed_blocks = set()
+    for block_key in block_structure:
+        edited_on = getattr(block_structure.get_xblock(block_key), EDITED_ON_FIELD, None)
+        if (
+                edited_on is None or
+                block_key not in collected_block_structure or
+                collected_block_structure.get_xblock_field(block_key, EDITED_ON_FIELD) != edited_on or
+                collected_block_structure.get_children(block_key) != block_structure.get_children(block_key) or
+                set(collected_block_structure.get_parents(block_key)) != set(block_structure.get_parents(block_key))
+        ):
+            changed_blocks.add(block_key)
+    return changed_blocks
+
+
+def get_blocks_to_collect(block_structure, changed_blocks):
+    """
+    Returns the set of usage keys of the blocks whose data needs to be
+    re-collected for the given changed blocks: the changed blocks, all of
+    their descendants, and all ancestors of those blocks (including the
+    root block).
+
+    Arguments:
+        block_structure (BlockStructure) - The newly created block
+            structure.
+
+        changed_blocks (set(UsageKey)) - The blocks that changed.
+    """
+    subtree_blocks = _closure(changed_blocks, block_structure.get_children)
+    blocks_to_collect = _closure(subtree_blocks, block_structure.get_parents)
+    blocks_to_collect.add(block_structure.root_block_usage_key)
+    return blocks_to_collect
+
+
+def create_partial_block_structure(block_structure, blocks_to_collect):
+    """
+    Returns a new BlockStructureModulestoreData with the same root, containing
+    only the given blocks and their children (with their xBlocks) and the
+    relations between them.
+
+    Since blocks_to_collect is closed under the ancestor relation, each
+    of those blocks has all of its parents and all of its children in the
+    partial structure.  The children that are not in blocks_to_collect are
+    leaves of the partial structure, whose newly collected data is ignored
+    by merge_collected_data.
+
+    Arguments:
+        block_structure (BlockStructureModulestoreData) - The newly
+            created block structure.
+
+        blocks_to_collect (set(UsageKey)) - The blocks to include.
+    """
+    # pylint: disable=protected-access
+    partial_block_structure = BlockStructureModulestoreData(block_structure.root_block_usage_key)
+    for block_key in block_structure.topological_traversal():
+        if block_key not in blocks_to_collect:
+            continue
+        partial_block_structure._add_xblock(block_key, block_structure.get_xblock(block_key))
+        for child_key in block_structure.get_children(block_key):
+            partial_block_structure._add_xblock(child_key, block_structure.get_xblock(child_key))
+            partial_block_structure._add_relation(block_key, child_key)
+    return partial_block_structure
+
+
+def merge_collected_data(block_structure, partial_block_structure, collected_block_structure, blocks_to_collect):
+    """
+    Updates the given block_structure with the newly collected data of the
+    given blocks_to_collect from partial_block_structure, and the previously
+    collected data of all other blocks from collected_block_structure.
+
+    Arguments:
+        block_structure (BlockStructureModulestoreData) - The newly
+            created block structure, to be updated.
+
+        partial_block_structure (BlockStructureModulestoreData) - The
+            partial structure whose data was just collected.
+
+        collected_block_structure (BlockStructureBlockData) - The block
+            structure previously collected for the same root.
+
+        blocks_to_collect (set(UsageKey)) - The blocks whose data was
+            re-collected.
+    """
+    # pylint: disable=protected-access
+    for block_key in block_structure:
+        if block_key in blocks_to_collect:
+            block_data = partial_block_structure._block_data_map.get(block_key)
+        else:
+            block_data = collected_block_structure._block_data_map.get(block_key)
+        if block_data is not None:
+            block_structure._block_data_map[block_key] = block_data
+    block_structure.transformer_data = partial_block_structure.transformer_data
+
+
+def _closure(block_keys, get_related):
+    """
+    Returns the given block keys together with all blocks reachable from
+    them using the given get_related function.
+    """
+    closure = set(block_keys)
+    stack = list(block_keys)
+    while stack:
+        for related_key in get_related(stack.pop()):
+            if related_key not in closure:
+                closure.add(related_key)
+                stack.append(related_key)
+    return closure
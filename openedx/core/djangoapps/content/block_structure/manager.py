@@ -128,10 +128,31 @@ class BlockStructureManager(object):
                 self.root_block_usage_key,
                 self.modulestore,
             )
-            BlockStructureTransformers.collect(block_structure)
+            collected_block_structure = self._get_collected_for_incremental_update()
+            if collected_block_structure is not None:
+                BlockStructureTransformers.collect_incrementally(block_structure, collected_block_structure)
+            else:
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _get_collected_for_incremental_update(self):
+        """
+        Returns the previously collected Block Structure to incrementally
+        update, or None if the block structure is to be fully collected.
+        """
+        if not config.waffle().is_enabled(config.INCREMENTAL_COLLECT):
+            return None
+        if not BlockStructureTransformers.supports_incremental_collect():
+            return None
+        try:
+            collected_block_structure = self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+        if not BlockStructureTransformers.is_collected_by_current_versions(collected_block_structure):
+            return None
+        return collected_block_structure
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,144 @@
+"""
+Module for applying the filters of BlockStructureTransformers with bitsets.
+
+The blocks of a block structure are interned in a BlockIndex, in topological
+order, so that a set of blocks is an int whose bit at the position of a block
+in the index is set if the block is in the set.  Each removal filter gives
+the set of blocks it removes as such a bitset, so that combining the filters
+of all transformers and determining which removed blocks are still reachable
+from the root are done with integer operations, instead of calling a chain
+of filter functions for each block of a topological traversal.
+"""
+from __future__ import absolute_import
+
+from six.moves import range
+
+
+class BlockIndex(object):
+    """
+    Index of the blocks of a block structure that are reachable from its
+    root, in topological order.  The root block is at position 0.
+    """
+    def __init__(self, block_structure):
+        self.block_keys = list(block_structure.topological_traversal())
+        self._positions = {block_key: position for position, block_key in enumerate(self.block_keys)}
+        self._parent_masks = [
+            self.mask(block_structure.get_parents(block_key)) for block_key in self.block_keys
+        ]
+
+    def __len__(self):
+        return len(self.block_keys)
+
+    def mask(self, block_keys):
+        """
+        Returns the bitset of the given block keys.  Block keys which
+        aren't in the index are ignored.
+        """
+        mask = 0
+        for block_key in block_keys:
+            position = self._positions.get(block_key)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def mask_where(self, condition):
+        """
+        Returns the bitset of the blocks that satisfy the given condition.
+
+        Arguments:
+            condition ((usage_key)->bool) - A function that takes a
+                block's usage key as input and returns whether the block
+                is in the bitset.
+        """
+        bits = ''.join('1' if condition(block_key) else '0' for block_key in reversed(self.block_keys))
+        return int(bits or '0', 2)
+
+    def block_keys_in(self, mask):
+        """
+        Returns the usage keys of the blocks in the given bitset, in
+        topological order.
+        """
+        bits = bin(mask)[:1:-1] if mask > 0 else ''
+        return [block_key for block_key, bit in zip(self.block_keys, bits) if bit == '1']
+
+    def reachable_mask(self, passable_mask):
+        """
+        Returns the bitset of the blocks reachable from the root block
+        through the blocks in the given bitset, as in a topological
+        traversal in which the descendants of the other blocks aren't
+        yielded.  The root block is always reachable.
+        """
+        reachable = passed = 0
+        for position in range(len(self.block_keys)):
+            if position == 0 or self._parent_masks[position] & passed:
+                bit = 1 << position
+                reachable |= bit
+                if passable_mask & bit:
+                    passed |= bit
+        return reachable
+
+
+class RemovalFilter(object):
+    """
+    Filter function that removes the blocks satisfying a removal condition
+    from a block structure, and returns whether the given block is retained.
+    See BlockStructureBlockData.create_removal_filter.
+    """
+    def __init__(self, block_structure, removal_condition, keep_descendants=False, removal_mask=None):
+        self.block_structure = block_structure
+        self.removal_condition = removal_condition
+        self.keep_descendants = keep_descendants
+        self._removal_mask = removal_mask
+
+    def __call__(self, block_key):
+        return self.block_structure.retain_or_remove(block_key, self.removal_condition, self.keep_descendants)
+
+    def removal_mask(self, block_index):
+        """
+        Returns the bitset of the blocks of the given BlockIndex that
+        satisfy the removal condition.
+        """
+        if self._removal_mask is not None:
+            return self._removal_mask(block_index)
+        return block_index.mask_where(self.removal_condition)
+
+
+class UniversalFilter(RemovalFilter):
+    """
+    Filter function that retains all blocks.
+    """
+    def __init__(self, block_structure):
+        super(UniversalFilter, self).__init__(block_structure, lambda block_key: False)
+
+    def __call__(self, block_key):
+        return True
+
+    def removal_mask(self, block_index):
+        return 0
+
+
+def apply_removal_filters(block_structure, removal_filters):
+    """
+    Removes the blocks of the given block structure that the given removal
+    filters would remove if they were combined and used in a single
+    topological traversal.
+
+    A block is removed by the first filter whose removal condition it
+    satisfies, and the filters aren't applied to the blocks that are no
+    longer reachable from the root once the removed blocks are removed.
+    The unreachable blocks are left for the block structure to prune.
+    """
+    block_index = BlockIndex(block_structure)
+    removed = removed_keeping_descendants = 0
+    for removal_filter in removal_filters:
+        mask = removal_filter.removal_mask(block_index) & ~(removed | removed_keeping_descendants)
+        if removal_filter.keep_descendants:
+            removed_keeping_descendants |= mask
+        else:
+            removed |= mask
+
+    reachable = block_index.reachable_mask(~removed)
+    for block_key in block_index.block_keys_in(reachable & removed):
+        block_structure.remove_block(block_key, keep_descendants=False)
+    for block_key in block_index.block_keys_in(reachable & removed_keeping_descendants):
+        block_structure.remove_block(block_key, keep_descendants=True)
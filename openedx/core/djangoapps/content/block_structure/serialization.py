@@ -0,0 +1,299 @@
+"""
+Module for the columnar serialization format of collected BlockStructures.
+
+Rather than pickling the entire graph of BlockData/FieldData objects as a
+single blob, the data of a block structure is split into:
+
+    * an index: the interned list of block usage keys, the parent/child
+      adjacency lists expressed as integer arrays over that list, and the
+      (small) non-block-specific transformer data.
+
+    * one column per collected field: each xBlock field and each
+      transformer block field is stored as its own separately compressed
+      blob, mapping block indices to values.
+
+When deserialized, only the index is decoded eagerly.  Each column is
+decoded the first time any block's value for that field is read, so a
+request only pays for the fields that its transformers actually access.
+"""
+from __future__ import absolute_import
+
+import collections
+from array import array
+
+import six
+from six.moves import cPickle as pickle
+from six.moves import range
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import _BlockRelations, BlockData, TransformerData
+
+# Prefix identifying data serialized in the columnar format, followed by
+# the format's version number.  Data without this prefix is assumed to be
+# in the legacy format (a zpickle of the block structure's internal maps).
+FORMAT_MAGIC = b'BSCOL'
+FORMAT_VERSION = 1
+_FORMAT_HEADER = FORMAT_MAGIC + six.b(str(FORMAT_VERSION))
+
+# Type code of the integer arrays used for adjacency lists.
+_INDEX_TYPECODE = 'l'
+
+
+class BlockKeyIndex(object):
+    """
+    Interned list of the usage keys of a block structure, mapping each
+    usage key to a dense integer index and back.
+    """
+    def __init__(self, block_keys):
+        # List of usage keys, in index order.
+        # list [UsageKey]
+        self.block_keys = list(block_keys)
+
+        # Map of a block's usage key to its index.
+        # dict {UsageKey: int}
+        self._index_of = {block_key: index for index, block_key in enumerate(self.block_keys)}
+
+    def __len__(self):
+        return len(self.block_keys)
+
+    def __contains__(self, block_key):
+        return block_key in self._index_of
+
+    def index_of(self, block_key):
+        """
+        Returns the integer index of the given usage key.
+
+        Raises KeyError if the usage key is not in the index.
+        """
+        return self._index_of[block_key]
+
+    def key_at(self, index):
+        """
+        Returns the usage key at the given integer index.
+        """
+        return self.block_keys[index]
+
+
+class _ColumnStore(object):
+    """
+    Holds the compressed columns of a deserialized block structure and
+    decodes each of them lazily, upon first access.
+    """
+    def __init__(self, encoded_columns):
+        # Map of a column's name to its compressed serialization.
+        # dict {(transformer name or None, field name): bytes}
+        self._encoded_columns = encoded_columns
+
+        # Map of a column's name to its decoded values.
+        # dict {(transformer name or None, field name): {int: any picklable type}}
+        self._decoded_columns = {}
+
+    def column_names(self, transformer_name=None):
+        """
+        Returns the names of the fields stored for the given transformer,
+        or for xBlock fields if transformer_name is None.
+        """
+        return [
+            field_name
+            for (column_transformer, field_name) in self._encoded_columns
+            if column_transformer == transformer_name
+        ]
+
+    def get_column(self, transformer_name, field_name):
+        """
+        Returns the decoded column for the given field, or None if the
+        field was not collected for any block.
+        """
+        column_name = (transformer_name, field_name)
+        try:
+            return self._decoded_columns[column_name]
+        except KeyError:
+            encoded_column = self._encoded_columns.get(column_name)
+            if encoded_column is None:
+                return None
+            column = zunpickle(encoded_column)
+            self._decoded_columns[column_name] = column
+            return column
+
+    @property
+    def num_decoded_columns(self):
+        """
+        Returns the number of columns decoded so far.
+        """
+        return len(self._decoded_columns)
+
+
+class _ColumnarFields(collections.MutableMapping):
+    """
+    Mapping of field names to values for a single block (or a single
+    transformer's data for a single block), backed by a _ColumnStore.
+
+    Values that are set or deleted are recorded locally, without
+    modifying the shared columns.
+    """
+    _DELETED = object()
+
+    def __init__(self, column_store, block_index, transformer_name=None):
+        self._column_store = column_store
+        self._block_index = block_index
+        self._transformer_name = transformer_name
+        self._overrides = {}
+
+    def __getitem__(self, field_name):
+        if field_name in self._overrides:
+            value = self._overrides[field_name]
+        else:
+            column = self._column_store.get_column(self._transformer_name, field_name)
+            value = self._DELETED if column is None else column.get(self._block_index, self._DELETED)
+        if value is self._DELETED:
+            raise KeyError(field_name)
+        return value
+
+    def __setitem__(self, field_name, value):
+        self._overrides[field_name] = value
+
+    def __delitem__(self, field_name):
+        if field_name not in self:
+            raise KeyError(field_name)
+        self._overrides[field_name] = self._DELETED
+
+    def __iter__(self):
+        for field_name in self._column_store.column_names(self._transformer_name):
+            if field_name not in self._overrides and field_name in self:
+                yield field_name
+        for field_name, value in six.iteritems(self._overrides):
+            if value is not self._DELETED:
+                yield field_name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        # Pickle (and deepcopy) as a plain dict so the copies never share
+        # mutable values with the decoded columns.
+        return (dict, (dict(self),))
+
+
+def serialize(block_structure):
+    """
+    Serializes the collected data of the given block structure into the
+    columnar format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    related_keys = list(block_relations)
+    other_keys = [block_key for block_key in block_data_map if block_key not in block_relations]
+    block_index = BlockKeyIndex(related_keys + other_keys)
+
+    parents_offsets, parents = _encode_adjacency(
+        block_index, (block_relations[block_key].parents for block_key in related_keys),
+    )
+    children_offsets, children = _encode_adjacency(
+        block_index, (block_relations[block_key].children for block_key in related_keys),
+    )
+
+    columns = collections.defaultdict(dict)
+    blocks_with_data = array(_INDEX_TYPECODE)
+    blocks_with_transformer_data = collections.defaultdict(lambda: array(_INDEX_TYPECODE))
+    for index, block_key in enumerate(block_index.block_keys):
+        block_data = block_data_map.get(block_key)
+        if block_data is None:
+            continue
+        blocks_with_data.append(index)
+        for field_name, value in six.iteritems(block_data.fields):
+            columns[(None, field_name)][index] = value
+        for transformer_name, transformer_data in six.iteritems(block_data.transformer_data):
+            blocks_with_transformer_data[transformer_name].append(index)
+            for field_name, value in six.iteritems(transformer_data.fields):
+                columns[(transformer_name, field_name)][index] = value
+
+    index_data = dict(
+        block_keys=block_index.block_keys,
+        num_related_blocks=len(related_keys),
+        parents_offsets=parents_offsets,
+        parents=parents,
+        children_offsets=children_offsets,
+        children=children,
+        blocks_with_data=blocks_with_data,
+        blocks_with_transformer_data=dict(blocks_with_transformer_data),
+        transformer_data=block_structure.transformer_data,
+    )
+    encoded_columns = {column_name: zpickle(column) for column_name, column in six.iteritems(columns)}
+    return _FORMAT_HEADER + pickle.dumps((zpickle(index_data), encoded_columns), pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(serialized_data):
+    """
+    Deserializes the given data into the internal data structures of a
+    block structure.  Data serialized in the legacy (non-columnar) format
+    is also supported.
+
+    Arguments:
+        serialized_data (bytes) - Data previously returned by serialize.
+
+    Returns:
+        tuple (block_relations, transformer_data, block_data_map) - The
+            arguments expected by BlockStructureFactory.create_new.
+    """
+    if not is_columnar(serialized_data):
+        return zunpickle(serialized_data)
+
+    encoded_index, encoded_columns = pickle.loads(serialized_data[len(_FORMAT_HEADER):])
+    index_data = zunpickle(encoded_index)
+    block_keys = index_data['block_keys']
+
+    block_relations = {}
+    parents_offsets, parents = index_data['parents_offsets'], index_data['parents']
+    children_offsets, children = index_data['children_offsets'], index_data['children']
+    for index in range(index_data['num_related_blocks']):
+        relations = _BlockRelations()
+        relations.parents = [block_keys[i] for i in parents[parents_offsets[index]:parents_offsets[index + 1]]]
+        relations.children = [block_keys[i] for i in children[children_offsets[index]:children_offsets[index + 1]]]
+        block_relations[block_keys[index]] = relations
+
+    column_store = _ColumnStore(encoded_columns)
+    block_data_map = {}
+    for index in index_data['blocks_with_data']:
+        block_data = BlockData(block_keys[index])
+        block_data.fields = _ColumnarFields(column_store, index)
+        block_data_map[block_keys[index]] = block_data
+
+    for transformer_name, indices in six.iteritems(index_data['blocks_with_transformer_data']):
+        for index in indices:
+            transformer_data = TransformerData()
+            transformer_data.fields = _ColumnarFields(column_store, index, transformer_name)
+            block_data_map[block_keys[index]].transformer_data[transformer_name] = transformer_data
+
+    return block_relations, index_data['transformer_data'], block_data_map
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given serialized data is in the current
+    columnar format.
+    """
+    return serialized_data[:len(_FORMAT_HEADER)] == _FORMAT_HEADER
+
+
+def _encode_adjacency(block_index, adjacency_lists):
+    """
+    Encodes the given lists of usage keys as a pair of integer arrays,
+    (offsets, indices), such that the list for the block at index i is
+    indices[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array(_INDEX_TYPECODE, [0])
+    indices = array(_INDEX_TYPECODE)
+    for adjacent_keys in adjacency_lists:
+        indices.extend(block_index.index_of(block_key) for block_key in adjacent_keys)
+        offsets.append(len(indices))
+    return offsets, indices
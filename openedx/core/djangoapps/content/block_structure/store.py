@@ -8,9 +8,7 @@ from logging import getLogger
 
 import six
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -54,7 +52,7 @@ class BlockStructureStore(object):
 
     def add(self, block_structure):
         """
-        Stores and caches a compressed and pickled serialization of
+        Stores and caches a compressed, columnar serialization of
         the given block structure.
 
         The data stored includes the structure's
@@ -194,18 +192,15 @@ class BlockStructureStore(object):
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return serialization.serialize(block_structure)
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+
+        Field data is decoded lazily, column by column, as it is accessed.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+        block_relations, transformer_data, block_data_map = serialization.deserialize(serialized_data)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
@@ -0,0 +1,205 @@
+"""
+Tests for block_structure/incremental.py
+"""
+from __future__ import absolute_import
+
+import ddt
+from django.test import TestCase
+
+from ..config import INCREMENTAL_COLLECT, waffle
+from ..manager import BlockStructureManager
+from .helpers import (
+    ChildrenMapTestMixin,
+    MockCache,
+    MockModulestoreFactory,
+    MockTransformer,
+    UsageKeyFactoryMixin,
+    mock_registered_transformers
+)
+
+
+class IncrementalTestTransformer(MockTransformer):
+    """
+    Test Transformer that percolates the 'value' field of each block down
+    to its descendants, and records which blocks it collected.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collected_blocks = set()
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the merged values of each block and its ancestors.
+        """
+        for block_key in block_structure.topological_traversal():
+            cls.collected_blocks.add(block_key)
+            merged_values = set()
+            for parent_key in block_structure.get_parents(block_key):
+                merged_values |= block_structure.get_transformer_block_field(parent_key, cls, 'merged_values')
+            value = getattr(block_structure.get_xblock(block_key), 'value', None)
+            if value is not None:
+                merged_values.add(value)
+            block_structure.set_transformer_block_field(block_key, cls, 'merged_values', merged_values)
+
+    @classmethod
+    def summarize(cls, block_structure):
+        """
+        Records the blocks that have merged values.
+        """
+        block_structure.set_transformer_data(cls, 'blocks_with_values', {
+            block_key for block_key in block_structure
+            if block_structure.get_transformer_block_field(block_key, cls, 'merged_values')
+        })
+
+
+class ChildrenTestTransformer(IncrementalTestTransformer):
+    """
+    Same as IncrementalTestTransformer, also reading the xBlocks of the
+    children of each block, as the split_test transformer does.
+    """
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the merged values of each block and its ancestors, after
+        reading the xBlocks of its children.
+        """
+        for block_key in block_structure:
+            for child_key in block_structure.get_children(block_key):
+                block_structure.get_xblock(child_key)
+        super(ChildrenTestTransformer, cls).collect(block_structure)
+
+
+class NonIncrementalTestTransformer(IncrementalTestTransformer):
+    """
+    Same as IncrementalTestTransformer, without support for incremental
+    collection.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
+
+@ddt.ddt
+class TestIncrementalCollect(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for incrementally collecting block structures.
+    """
+    #     0
+    #    / \
+    #   1  2
+    #   \ / \
+    #    3  4
+    #   / \
+    #  5  6
+    CHILDREN_MAP = ChildrenMapTestMixin.DAG_CHILDREN_MAP
+
+    def setUp(self):
+        super(TestIncrementalCollect, self).setUp()
+        self.modulestore = MockModulestoreFactory.create(self.CHILDREN_MAP, self.block_key_factory)
+        for block_id in range(len(self.CHILDREN_MAP)):
+            self.edit_block(block_id, edited_on=1)
+        self.bs_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, MockCache())
+
+    def edit_block(self, block_id, edited_on, value=None):
+        """
+        Updates the edit timestamp and value of the given block in the modulestore.
+        """
+        xblock = self.modulestore.get_item(self.block_key_factory(block_id))
+        xblock.field_map['edited_on'] = edited_on
+        xblock.field_map['value'] = value if value is not None else u'v{}'.format(block_id)
+
+    def block_keys(self, block_ids):
+        """
+        Returns the set of usage keys for the given block ids.
+        """
+        return {self.block_key_factory(block_id) for block_id in block_ids}
+
+    def update_collected(self, transformer=IncrementalTestTransformer, incremental=True):
+        """
+        Re-collects the block structure, returning it along with the set of
+        blocks whose data was collected.
+        """
+        transformer.collected_blocks = set()
+        with mock_registered_transformers([transformer]):
+            with waffle().override(INCREMENTAL_COLLECT, active=incremental):
+                self.bs_manager.update_collected_if_needed()
+                block_structure = self.bs_manager.get_collected()
+        return block_structure, transformer.collected_blocks
+
+    def assert_merged_values(self, block_structure, block_id, expected_values, transformer=IncrementalTestTransformer):
+        """
+        Verifies the collected merged values of the given block.
+        """
+        self.assertEqual(
+            block_structure.get_transformer_block_field(
+                self.block_key_factory(block_id), transformer, 'merged_values',
+            ),
+            set(expected_values),
+        )
+
+    def test_unchanged(self):
+        _, collected_blocks = self.update_collected()
+        self.assertEqual(collected_blocks, self.block_keys(range(7)))
+
+        block_structure, collected_blocks = self.update_collected()
+        # the root block and its children
+        self.assertEqual(collected_blocks, self.block_keys([0, 1, 2]))
+        self.assert_block_structure(block_structure, self.CHILDREN_MAP)
+        self.assert_merged_values(block_structure, 5, [u'v0', u'v1', u'v2', u'v3', u'v5'])
+
+    def test_changed_block(self):
+        self.update_collected()
+        self.edit_block(3, edited_on=2, value=u'new')
+
+        block_structure, collected_blocks = self.update_collected()
+
+        # the changed block, its subtree, the ancestors of those blocks, and their children
+        self.assertEqual(collected_blocks, self.block_keys([0, 1, 2, 3, 4, 5, 6]))
+        self.assert_block_structure(block_structure, self.CHILDREN_MAP)
+        self.assert_merged_values(block_structure, 3, [u'v0', u'v1', u'v2', u'new'])
+        self.assert_merged_values(block_structure, 6, [u'v0', u'v1', u'v2', u'new', u'v6'])
+        self.assert_merged_values(block_structure, 4, [u'v0', u'v2', u'v4'])
+
+    def test_summarize(self):
+        self.update_collected()
+        self.edit_block(4, edited_on=2, value=u'new')
+
+        block_structure, collected_blocks = self.update_collected()
+
+        # summarized from the data of all blocks, not only the collected ones
+        self.assertNotIn(self.block_key_factory(5), collected_blocks)
+        self.assertEqual(
+            block_structure.get_transformer_data(IncrementalTestTransformer, 'blocks_with_values'),
+            self.block_keys(range(7)),
+        )
+
+    def test_changed_children(self):
+        self.update_collected()
+        self.modulestore.get_item(self.block_key_factory(2)).children.remove(self.block_key_factory(4))
+
+        block_structure, collected_blocks = self.update_collected()
+
+        self.assertEqual(collected_blocks, self.block_keys([0, 1, 2, 3, 5, 6]))
+        self.assert_block_structure(block_structure, [[1, 2], [3], [3], [5, 6], [], [], []], missing_blocks=[4])
+
+    def test_children_xblocks(self):
+        self.update_collected(ChildrenTestTransformer)
+        self.edit_block(5, edited_on=2, value=u'new')
+
+        block_structure, _ = self.update_collected(ChildrenTestTransformer)
+
+        self.assert_block_structure(block_structure, self.CHILDREN_MAP)
+        self.assert_merged_values(
+            block_structure, 5, [u'v0', u'v1', u'v2', u'v3', u'new'], transformer=ChildrenTestTransformer,
+        )
+        self.assert_merged_values(block_structure, 4, [u'v0', u'v2', u'v4'], transformer=ChildrenTestTransformer)
+
+    @ddt.data(
+        (NonIncrementalTestTransformer, True),
+        (IncrementalTestTransformer, False),
+    )
+    @ddt.unpack
+    def test_full_collect(self, transformer, incremental):
+        self.update_collected(transformer, incremental)
+        self.edit_block(3, edited_on=2)
+
+        _, collected_blocks = self.update_collected(transformer, incremental)
+        self.assertEqual(collected_blocks, self.block_keys(range(7)))
@@ -0,0 +1,128 @@
+"""
+Tests for masks.py
+"""
+from __future__ import absolute_import
+
+import functools
+from unittest import TestCase
+
+import ddt
+
+from ..masks import BlockIndex, apply_removal_filters
+from .helpers import ChildrenMapTestMixin
+
+
+@ddt.ddt
+class TestBlockIndex(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockIndex.
+    """
+    def setUp(self):
+        super(TestBlockIndex, self).setUp()
+        self.block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        self.block_index = BlockIndex(self.block_structure)
+
+    def test_topological_order(self):
+        self.assertEqual(len(self.block_index), len(self.DAG_CHILDREN_MAP))
+        self.assertEqual(self.block_index.block_keys[0], 0)
+        for position, block_key in enumerate(self.block_index.block_keys):
+            for parent in self.block_structure.get_parents(block_key):
+                self.assertLess(self.block_index.block_keys.index(parent), position)
+
+    def test_masks(self):
+        mask = self.block_index.mask([3, 4, 'unknown'])
+        self.assertEqual(mask, self.block_index.mask_where(lambda block_key: block_key in (3, 4)))
+        self.assertEqual(sorted(self.block_index.block_keys_in(mask)), [3, 4])
+        self.assertEqual(self.block_index.block_keys_in(0), [])
+
+    @ddt.data(
+        ([], [0, 1, 2, 3, 4, 5, 6]),
+        ([0], [0]),
+        ([1], [0, 1, 2, 3, 4, 5, 6]),
+        ([1, 2], [0, 1, 2]),
+        ([3], [0, 1, 2, 3, 4]),
+    )
+    @ddt.unpack
+    def test_reachable_mask(self, impassable_blocks, expected_reachable_blocks):
+        reachable = self.block_index.reachable_mask(~self.block_index.mask(impassable_blocks))
+        self.assertEqual(sorted(self.block_index.block_keys_in(reachable)), expected_reachable_blocks)
+
+
+@ddt.ddt
+class TestApplyRemovalFilters(ChildrenMapTestMixin, TestCase):
+    """
+    Tests that applying removal filters with bitsets gives the same block
+    structure as combining them in a topological traversal.
+    """
+    @ddt.data(
+        # (block keys removed, block keys removed keeping their descendants)
+        ([], []),
+        ([0], []),
+        ([1], []),
+        ([2], []),
+        ([3], []),
+        ([1, 4], []),
+        ([], [1]),
+        ([], [2, 3]),
+        ([3], [1]),
+        ([1], [1, 2]),
+        ([5], [3]),
+    )
+    @ddt.unpack
+    def test_same_as_traversal(self, removed_blocks, removed_blocks_keeping_descendants):
+        for children_map in (self.SIMPLE_CHILDREN_MAP, self.LINEAR_CHILDREN_MAP, self.DAG_CHILDREN_MAP):
+            expected = self.create_block_structure(children_map)
+            filters = self._create_filters(expected, removed_blocks, removed_blocks_keeping_descendants)
+            expected.filter_topological_traversal(
+                functools.reduce(
+                    lambda accumulated, additional: lambda block_key: accumulated(block_key) and additional(block_key),
+                    filters,
+                )
+            )
+            expected._prune_unreachable()  # pylint: disable=protected-access
+
+            block_structure = self.create_block_structure(children_map)
+            apply_removal_filters(
+                block_structure,
+                self._create_filters(block_structure, removed_blocks, removed_blocks_keeping_descendants),
+            )
+            block_structure._prune_unreachable()  # pylint: disable=protected-access
+
+            self.assertEqual(set(block_structure), set(expected))
+            for block_key in expected:
+                self.assertEqual(set(block_structure.get_children(block_key)), set(expected.get_children(block_key)))
+                self.assertEqual(set(block_structure.get_parents(block_key)), set(expected.get_parents(block_key)))
+
+    def test_dag_block_with_unreachable_parent(self):
+        # Block 3 is only reachable through block 1, which is removed, but
+        # block 4 is still reachable through the root, so it is filtered.
+        block_structure = self.create_block_structure([[1, 4], [2], [3], [4], []])
+        apply_removal_filters(block_structure, self._create_filters(block_structure, [1, 4], []))
+        block_structure._prune_unreachable()  # pylint: disable=protected-access
+        self.assert_block_structure(block_structure, [[], [], [], [], []], missing_blocks=[1, 2, 3, 4])
+
+    def test_removal_mask(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        apply_removal_filters(block_structure, [
+            block_structure.create_removal_filter(
+                lambda block_key: self.fail('The removal condition is not called when a removal mask is given.'),
+                removal_mask=lambda block_index: block_index.mask([1]),
+            ),
+        ])
+        block_structure._prune_unreachable()  # pylint: disable=protected-access
+        self.assert_block_structure(block_structure, [[2], [], [], [], []], missing_blocks=[1, 3, 4])
+
+    def _create_filters(self, block_structure, removed_blocks, removed_blocks_keeping_descendants):
+        """
+        Returns the filters removing the given blocks from the given block
+        structure, the blocks removed keeping their descendants being removed
+        by the second filter.
+        """
+        return [
+            block_structure.create_universal_filter(),
+            block_structure.create_removal_filter(lambda block_key: block_key in removed_blocks),
+            block_structure.create_removal_filter(
+                lambda block_key: block_key in removed_blocks_keeping_descendants,
+                keep_descendants=True,
+            ),
+        ]
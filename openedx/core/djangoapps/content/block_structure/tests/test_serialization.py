@@ -0,0 +1,112 @@
+"""
+Tests for block_structure/serialization.py
+"""
+from __future__ import absolute_import
+
+from copy import deepcopy
+from unittest import TestCase
+
+import ddt
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import serialization
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@ddt.ddt
+class TestColumnarSerialization(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format of block structures.
+    """
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map, with
+        xBlock and transformer data set on each block.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        for block_key in block_structure:
+            block_data = block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+            block_data.display_name = u'block {}'.format(block_key)
+            if block_key % 2:
+                block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', [block_key])
+        return block_structure
+
+    def round_trip(self, block_structure):
+        """
+        Serializes and deserializes the given block structure.
+        """
+        return BlockStructureFactory.create_new(
+            block_structure.root_block_usage_key,
+            *serialization.deserialize(serialization.serialize(block_structure))
+        )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        deserialized = self.round_trip(block_structure)
+
+        self.assert_block_structure(deserialized, children_map)
+        for block_key in block_structure:
+            self.assertEqual(deserialized.get_parents(block_key), block_structure.get_parents(block_key))
+            self.assertEqual(deserialized.get_children(block_key), block_structure.get_children(block_key))
+            self.assertEqual(deserialized.get_xblock_field(block_key, 'display_name'), u'block {}'.format(block_key))
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'odd'),
+                [block_key] if block_key % 2 else None,
+            )
+        self.assertEqual(
+            deserialized.get_transformer_data(MockTransformer, '_version'),
+            MockTransformer.WRITE_VERSION,
+        )
+
+    def test_columns_decoded_lazily(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        _, _, block_data_map = serialization.deserialize(serialization.serialize(block_structure))
+        column_store = block_data_map[0].fields._column_store  # pylint: disable=protected-access
+
+        self.assertEqual(column_store.num_decoded_columns, 0)
+        self.assertEqual(block_data_map[1].display_name, u'block 1')
+        self.assertEqual(block_data_map[2].display_name, u'block 2')
+        self.assertEqual(column_store.num_decoded_columns, 1)
+
+    def test_edits_after_deserialization(self):
+        deserialized = self.round_trip(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        deserialized.override_xblock_field(1, 'display_name', u'edited')
+        delattr(deserialized[2], 'display_name')
+
+        self.assertEqual(deserialized.get_xblock_field(1, 'display_name'), u'edited')
+        self.assertIsNone(deserialized.get_xblock_field(2, 'display_name'))
+        self.assertEqual(deserialized.get_xblock_field(3, 'display_name'), u'block 3')
+
+        # edits are preserved by copies and by re-serialization
+        for structure in (deserialized.copy(), self.round_trip(deserialized)):
+            self.assertEqual(structure.get_xblock_field(1, 'display_name'), u'edited')
+            self.assertIsNone(structure.get_xblock_field(2, 'display_name'))
+
+    def test_copy_does_not_share_values(self):
+        deserialized = self.round_trip(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        copied_block_data_map = deepcopy(deserialized._block_data_map)  # pylint: disable=protected-access
+        copied_block_data_map[1].transformer_data[MockTransformer].odd.append(5)
+
+        self.assertEqual(deserialized.get_transformer_block_field(1, MockTransformer, 'odd'), [1])
+
+    def test_legacy_format(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        legacy_data = zpickle((
+            block_structure._block_relations,  # pylint: disable=protected-access
+            block_structure.transformer_data,
+            block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+        self.assertFalse(serialization.is_columnar(legacy_data))
+        self.assertTrue(serialization.is_columnar(serialization.serialize(block_structure)))
+
+        deserialized = BlockStructureFactory.create_new(0, *serialization.deserialize(legacy_data))
+        self.assert_block_structure(deserialized, self.SIMPLE_CHILDREN_MAP)
+        self.assertEqual(deserialized.get_xblock_field(3, 'display_name'), u'block 3')
@@ -57,6 +57,17 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method can be run on a partial
+    # block structure, containing only the blocks that changed since
+    # the last collection along with their subtrees and ancestors.
+    #
+    # This holds when the data collected for each block depends only
+    # on the block itself and its ancestors (including any data that
+    # is percolated down from the root), and not on its descendants or
+    # siblings. Data collected for other blocks is then reused as is.
+    #
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -107,6 +118,27 @@ class BlockStructureTransformer(object):
         """
         pass
 
+    @classmethod
+    def summarize(cls, block_structure):
+        """
+        Stores any course-wide data derived from the data collected for
+        each block, such as the blocks whose collected field has a given
+        value, so that the transform phase doesn't need to look at every
+        block. Transformers should store such data using
+        set_transformer_data.
+
+        This is called once the collect phase is complete for all
+        blocks: when collecting incrementally, the collect method only
+        sees the changed blocks, whereas this method sees the whole
+        block structure, including the previously collected data of the
+        other blocks.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - A mutable
+                block structure with the data collected for all blocks.
+        """
+        pass
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
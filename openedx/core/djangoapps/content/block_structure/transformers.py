@@ -6,7 +6,9 @@ from __future__ import absolute_import
 import functools
 from logging import getLogger
 
+from . import incremental
 from .exceptions import TransformerDataIncompatible, TransformerException
+from .masks import RemovalFilter, apply_removal_filters
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
 
@@ -80,9 +82,83 @@ class BlockStructureTransformers(object):
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
 
+        # Collect the edit timestamps used to detect changed blocks
+        # when collecting incrementally.
+        block_structure.request_xblock_fields(incremental.EDITED_ON_FIELD)
+
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+        cls._summarize(block_structure)
+
+    @classmethod
+    def collect_incrementally(cls, block_structure, collected_block_structure):
+        """
+        Collects data for each registered transformer, only for the blocks
+        that changed since the given collected_block_structure was collected,
+        along with their subtrees and ancestors.  The previously collected
+        data is reused for all other blocks.
+
+        Should only be called if supports_incremental_collect returns True
+        and collected_block_structure was collected by the current versions
+        of the registered transformers.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The block
+                structure newly created from the modulestore, which is
+                updated with the collected data.
+
+            collected_block_structure (BlockStructureBlockData) - The block
+                structure previously collected for the same root.
+        """
+        changed_blocks = incremental.get_changed_blocks(block_structure, collected_block_structure)
+        blocks_to_collect = incremental.get_blocks_to_collect(block_structure, changed_blocks)
+        partial_block_structure = incremental.create_partial_block_structure(block_structure, blocks_to_collect)
+
+        cls.collect(partial_block_structure)
+        incremental.merge_collected_data(
+            block_structure, partial_block_structure, collected_block_structure, blocks_to_collect,
+        )
+        cls._summarize(block_structure)
+        logger.info(
+            u'BlockStructure: Incrementally collected %d of %d blocks for %s (%d changed).',
+            len(blocks_to_collect),
+            len(block_structure),
+            block_structure.root_block_usage_key,
+            len(changed_blocks),
+        )
+
+    @classmethod
+    def _summarize(cls, block_structure):
+        """
+        Stores the course-wide data of each registered transformer, once
+        the data of all blocks is collected.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            transformer.summarize(block_structure)
+
+    @classmethod
+    def supports_incremental_collect(cls):
+        """
+        Returns whether all registered transformers support incremental
+        collection.
+        """
+        return all(
+            transformer.SUPPORTS_INCREMENTAL_COLLECT
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
+    @classmethod
+    def is_collected_by_current_versions(cls, block_structure):
+        """
+        Returns whether the collected data in the block structure was
+        written by the current version of each registered transformer.
+        """
+        return all(
+            block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION  # pylint: disable=protected-access
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -131,6 +207,13 @@ class BlockStructureTransformers(object):
         for transformer in self._transformers['supports_filter']:
             filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
 
+        # Filters created with create_removal_filter or create_universal_filter
+        # are combined as bitsets, without traversing the block structure with
+        # each of them.
+        if all(isinstance(block_filter, RemovalFilter) for block_filter in filters):
+            apply_removal_filters(block_structure, filters)
+            return
+
         combined_filters = functools.reduce(
             self._filter_chain,
             filters,
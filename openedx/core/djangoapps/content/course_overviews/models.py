@@ -10,6 +10,7 @@ import six
 from ccx_keys.locator import CCXLocator
 from config_models.models import ConfigurationModel
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, FloatField, IntegerField, TextField
 from django.db.utils import IntegrityError
@@ -53,6 +54,14 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 6
 
+    # How long overviews loaded by get_from_ids stay in the cache, in seconds.
+    # Saving or deleting an overview invalidates its cached copy earlier (see
+    # signals.py).
+    CACHE_TIMEOUT = 60 * 60
+
+    # How long to wait before enqueuing another refresh of a stale overview.
+    STALE_REFRESH_TIMEOUT = 5 * 60
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -331,6 +340,93 @@ class CourseOverview(TimeStampedModel):
             )
         }
 
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, with their
+        image_set and tabs loaded.
+
+        Unlike calling get_from_id for each course, this takes a fixed number
+        of queries: overviews are read from the cache first, and the rest are
+        read from the database with their image sets and tabs, then cached.
+        CourseOverviews which don't exist are loaded from the modulestore, as
+        in get_from_id, but outdated ones are returned as they are, while
+        their update is done by a background task.
+
+        Courses which can't be loaded from the modulestore are left out of the
+        returned dict.
+        """
+        course_ids = set(course_ids)
+        cached = cache.get_many([cls._cache_key(course_id) for course_id in course_ids])
+        overviews = {overview.id: overview for overview in six.itervalues(cached)}
+
+        loaded = list(
+            cls.objects.select_related('image_set').prefetch_related('tabs').filter(
+                id__in=course_ids - set(overviews)
+            )
+        )
+        # The missing image sets are created along with the updated overviews
+        # when thumbnails are enabled, as creating them is slow.
+        check_image_sets = any(not hasattr(overview, 'image_set') for overview in loaded) and (
+            CourseOverviewImageConfig.current().enabled
+        )
+
+        to_cache = {}
+        stale_course_ids = []
+        for overview in loaded:
+            overviews[overview.id] = overview
+            if overview.version < cls.VERSION or (check_image_sets and not hasattr(overview, 'image_set')):
+                stale_course_ids.append(overview.id)
+            else:
+                to_cache[cls._cache_key(overview.id)] = overview
+
+        cache.set_many(to_cache, cls.CACHE_TIMEOUT)
+        cls._enqueue_refresh(stale_course_ids)
+
+        for course_id in course_ids - set(overviews):
+            try:
+                overviews[course_id] = cls.load_from_module_store(course_id)
+            except (cls.DoesNotExist, IOError):
+                log.warning(u'Could not load CourseOverview for course %s', course_id, exc_info=True)
+
+        return overviews
+
+    @classmethod
+    def invalidate_cache(cls, course_ids):
+        """
+        Remove the CourseOverviews of the given course_ids from the cache used
+        by get_from_ids.
+        """
+        cache.delete_many([cls._cache_key(course_id) for course_id in course_ids])
+
+    @classmethod
+    def _cache_key(cls, course_id):
+        """
+        Return the cache key of the CourseOverview of course_id, which
+        changes with the version of the model.
+        """
+        return u'course_overview.v{}.{}'.format(cls.VERSION, course_id)
+
+    @classmethod
+    def _enqueue_refresh(cls, course_ids):
+        """
+        Update the CourseOverviews of the given course_ids in the background,
+        unless their update was enqueued recently.
+        """
+        course_ids = [
+            course_id for course_id in course_ids
+            if cache.add(u'{}.refresh'.format(cls._cache_key(course_id)), True, cls.STALE_REFRESH_TIMEOUT)
+        ]
+        if course_ids:
+            # Imported here, as the tasks module imports this one.
+            from openedx.core.djangoapps.content.course_overviews.tasks import (
+                enqueue_async_course_overview_update_tasks
+            )
+            enqueue_async_course_overview_update_tasks(
+                [six.text_type(course_id) for course_id in course_ids],
+                force_update=True,
+            )
+
     @classmethod
     def get_from_id_if_exists(cls, course_id):
         """
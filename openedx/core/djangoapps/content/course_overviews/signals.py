@@ -5,12 +5,14 @@ from __future__ import absolute_import
 
 import logging
 
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal
 from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
-from .models import CourseOverview
+from .models import CourseOverview, CourseOverviewImageSet
 
 LOG = logging.getLogger(__name__)
 
@@ -30,6 +32,36 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     _check_for_course_changes(previous_course_overview, updated_course_overview)
 
 
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _invalidate_cached_course_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes a saved or deleted CourseOverview from the cache used by
+    CourseOverview.get_from_ids.
+    """
+    _invalidate_cache_on_commit(instance.id)
+
+
+@receiver(post_save, sender=CourseOverviewImageSet)
+@receiver(post_delete, sender=CourseOverviewImageSet)
+def _invalidate_cached_course_overview_image_set(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Removes the CourseOverview of a saved or deleted CourseOverviewImageSet
+    from the cache used by CourseOverview.get_from_ids.
+    """
+    _invalidate_cache_on_commit(instance.course_overview_id)
+
+
+def _invalidate_cache_on_commit(course_id):
+    """
+    Removes the CourseOverview of course_id from the cache right away, and
+    again once the transaction is committed, in case a concurrent request
+    cached the previous version in the meantime.
+    """
+    CourseOverview.invalidate_cache([course_id])
+    transaction.on_commit(lambda: CourseOverview.invalidate_cache([course_id]))
+
+
 @receiver(SignalHandler.course_deleted)
 def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
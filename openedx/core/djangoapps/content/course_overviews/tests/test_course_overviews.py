@@ -561,6 +561,81 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         self.assertEqual(course_id_to_overview, None)
 
 
+class CourseOverviewGetFromIdsTestCase(ModuleStoreTestCase, CacheIsolationTestCase):
+    """
+    Tests for CourseOverview.get_from_ids.
+    """
+    ENABLED_CACHES = ['default']
+    ENABLED_SIGNALS = ['course_published']
+
+    @mock.patch(
+        'openedx.core.djangoapps.content.course_overviews.tasks.enqueue_async_course_overview_update_tasks'
+    )
+    def test_get_from_ids(self, mock_enqueue):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        course_ids = [course_with_overview.id, course_without_overview.id]
+
+        overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(set(overviews), set(course_ids))
+        self.assertEqual(overviews[course_without_overview.id].version, CourseOverview.VERSION)
+
+        # Once read from the database, both overviews are cached, with their tabs.
+        CourseOverview.get_from_ids(course_ids)
+        with self.assertNumQueries(0):
+            overviews = CourseOverview.get_from_ids(course_ids)
+            tab_ids = [tab.tab_id for tab in overviews[course_with_overview.id].tabs.all()]
+        self.assertEqual(tab_ids, [tab.tab_id for tab in course_with_overview.tabs])
+        self.assertFalse(mock_enqueue.called)
+
+    @mock.patch(
+        'openedx.core.djangoapps.content.course_overviews.tasks.enqueue_async_course_overview_update_tasks'
+    )
+    def test_get_from_ids_outdated(self, mock_enqueue):
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverview.objects.filter(id=course.id).update(version=CourseOverview.VERSION - 1)
+
+        for _ in range(2):
+            overviews = CourseOverview.get_from_ids([course.id])
+            # The outdated overview is returned, and only updated in the background.
+            self.assertEqual(overviews[course.id].version, CourseOverview.VERSION - 1)
+        mock_enqueue.assert_called_once_with([six.text_type(course.id)], force_update=True)
+
+        CourseOverview.load_from_module_store(course.id)
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].version, CourseOverview.VERSION)
+
+    def test_get_from_ids_publish_invalidates_cache(self):
+        course = CourseFactory.create(emit_signals=True, display_name='Old name')
+        CourseOverview.get_from_ids([course.id])
+
+        course.display_name = 'New name'
+        self.update_course(course, self.user.id)
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].display_name, 'New name')
+
+    def test_get_from_ids_save_invalidates_cache(self):
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverview.get_from_ids([course.id])
+
+        overview = CourseOverview.objects.get(id=course.id)
+        overview.marketing_url = 'https://example.com/course'
+        overview.save()
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].marketing_url, overview.marketing_url)
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.models.CourseOverview.load_from_module_store')
+    def test_get_from_ids_delete_invalidates_cache(self, mock_load_from_module_store):
+        mock_load_from_module_store.side_effect = CourseOverview.DoesNotExist
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverview.get_from_ids([course.id])
+
+        CourseOverview.objects.filter(id=course.id).delete()
+        self.assertEqual(CourseOverview.get_from_ids([course.id]), {})
+
+    def test_get_from_ids_non_existent_course(self):
+        course_key = self.store.make_course_key('Non', 'Existent', 'Course')
+        self.assertEqual(CourseOverview.get_from_ids([course_key]), {})
+
+
+
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
     """
@@ -9,7 +9,7 @@ from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContent
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -33,6 +33,49 @@ def get_cached_content(location):
     return CONTENT_CACHE.get(six.text_type(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
 
 
+def set_cached_content_metadata(content):
+    """
+    Stores the metadata of the given piece of content in the cache, without
+    its data, using its location as the key.
+    """
+    metadata = StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+    CONTENT_CACHE.set(_metadata_key(content.location), metadata, version=STATIC_CONTENT_VERSION)
+
+
+def get_cached_content_metadata(location):
+    """
+    Retrieves the metadata of the given piece of content by its location if
+    cached, as a StaticContent without data.
+    """
+    return CONTENT_CACHE.get(_metadata_key(location), version=STATIC_CONTENT_VERSION)
+
+
+def _metadata_key(location):
+    """
+    Returns the cache key of the metadata of the content at location.
+    """
+    return u'{}/metadata'.format(location).encode("utf-8")
+
+
+def count_content_request(key):
+    """
+    Counts a request for the content with the given key, returning the number
+    of requests counted so far (as long as the count stays in the cache).
+    """
+    cache_key = u'{}/requests'.format(key).encode("utf-8")
+    CONTENT_CACHE.add(cache_key, 0, version=STATIC_CONTENT_VERSION)
+    try:
+        return CONTENT_CACHE.incr(cache_key, version=STATIC_CONTENT_VERSION)
+    except ValueError:
+        # The count was evicted in the meantime.
+        return 1
+
+
 def del_cached_content(location):
     """
     Delete content for the given location, as well versions of the content without a run.
@@ -44,9 +87,10 @@ def del_cached_content(location):
         """Force the location to a Unicode string."""
         return six.text_type(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    locations = [location_str(location), _metadata_key(location)]
     try:
         locations.append(location_str(location.replace(run=None)))
+        locations.append(_metadata_key(location.replace(run=None)))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
@@ -0,0 +1,35 @@
+"""
+Management command to bound the local disk cache of course assets sent by the web server.
+"""
+from __future__ import absolute_import
+
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from openedx.core.djangoapps.contentserver.middleware import evict_copies
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Deletes the least recently sent copies in the local disk cache of assets
+    (CONTENTSERVER_SENDFILE_ROOT) while its total size is over
+    CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE.
+
+    The cache is local to each web server, so this is meant to be run on a
+    schedule on each of them.
+
+    Example usage:
+        $ ./manage.py lms evict_asset_copies
+    """
+    help = 'Deletes the least recently sent copies in the local disk cache of course assets.'
+
+    def handle(self, *args, **options):
+        root = settings.CONTENTSERVER_SENDFILE_ROOT
+        if not root:
+            log.info(u'CONTENTSERVER_SENDFILE_ROOT is not set, there is no local disk cache of assets.')
+            return
+        evict_copies(root, settings.CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE)
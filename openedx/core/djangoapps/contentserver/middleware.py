@@ -4,27 +4,40 @@ Middleware to serve assets.
 
 from __future__ import absolute_import
 
+import calendar
+import hashlib
 import logging
 import datetime
+import os
+import tempfile
+import uuid
 import six
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
+from django.conf import settings
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect, StreamingHttpResponse)
+from django.utils.http import parse_http_date_safe, quote_etag
 from six import text_type
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    count_content_request,
+    get_cached_content,
+    get_cached_content_metadata,
+    set_cached_content,
+    set_cached_content_metadata
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -35,6 +48,9 @@ from .models import CourseAssetCacheTtlConfig, CdnUserAgentsConfig
 
 HTTP_DATE_FORMAT = u"%a, %d %b %Y %H:%M:%S GMT"
 
+# Requests for more ranges than this get the full content.
+MAX_RANGES = 20
+
 
 class StaticContentServer(object):
     """
@@ -112,11 +128,23 @@ class StaticContentServer(object):
 
             # Figure out if the client sent us a conditional request, and let them know
             # if this asset has changed since then.
-            last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
-                if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
-                if if_modified_since == last_modified_at_str:
-                    return HttpResponseNotModified()
+            if self.is_not_modified(request, content):
+                response = HttpResponseNotModified()
+                self.set_caching_headers(content, response)
+                return response
+
+            # Let the web server send the asset from the local disk cache, if there is one.
+            if request.method in ('GET', 'HEAD'):
+                sendfile_url = self.get_sendfile_url(content, loc)
+                if sendfile_url is not None:
+                    response = HttpResponse()
+                    response['X-Accel-Redirect'] = sendfile_url
+                    response['Content-Type'] = content.content_type
+                    response['X-Frame-Options'] = 'ALLOW'
+                    self.set_caching_headers(content, response)
+                    if newrelic:
+                        newrelic.agent.add_custom_parameter('contentserver.sendfile', True)
+                    return response
 
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
@@ -125,6 +153,7 @@ class StaticContentServer(object):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
+            content_type = content.content_type
             if request.META.get('HTTP_RANGE'):
                 # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
                 if isinstance(content, StaticContent):
@@ -143,25 +172,36 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
+                    elif len(ranges) > MAX_RANGES:
+                        # The spec allows ignoring the Range header, which we do for requests
+                        # of so many ranges that they would cost more than the full content.
                         log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
+                            u"Too many ranges in Range header: %s for content: %s", header_value, text_type(loc)
                         )
                     else:
-                        first, last = ranges[0]
+                        satisfiable_ranges = [
+                            (first, last) for first, last in ranges if 0 <= first <= last < content.length
+                        ]
 
-                        if 0 <= first <= last < content.length:
+                        if len(satisfiable_ranges) == 1:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            first, last = satisfiable_ranges[0]
+                            response = self.response_class(content.stream_data_in_range(first, last))
                             response['Content-Range'] = b'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
                             response.status_code = 206  # Partial Content
 
+                            if newrelic:
+                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                        elif satisfiable_ranges:
+                            # According to Http/1.1 spec content for multiple ranges is sent as a multipart message.
+                            # https://tools.ietf.org/html/rfc7233#section-4.1
+                            boundary = uuid.uuid4().hex
+                            content_type = u'multipart/byteranges; boundary={}'.format(boundary)
+                            response = self.multipart_byteranges_response(content, satisfiable_ranges, boundary)
+
                             if newrelic:
                                 newrelic.agent.add_custom_parameter('contentserver.ranged', True)
                         else:
@@ -173,7 +213,10 @@ class StaticContentServer(object):
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if not isinstance(content, StaticContentStream) and content.data is None:
+                    # Only the metadata of this content was cached.
+                    content = AssetManager.find(loc, as_stream=True)
+                response = self.response_class(content.stream_data())
                 response['Content-Length'] = content.length
 
             if newrelic:
@@ -182,7 +225,7 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
+            response['Content-Type'] = content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -193,6 +236,139 @@ class StaticContentServer(object):
 
             return response
 
+    @property
+    def response_class(self):
+        """
+        The class of the responses with the data of assets: streaming
+        responses when assets are streamed, so that their data isn't all read
+        into memory.
+        """
+        return StreamingHttpResponse if settings.CONTENTSERVER_STREAM_ASSETS else HttpResponse
+
+    def multipart_byteranges_response(self, content, ranges, boundary):
+        """
+        Returns a response with the data of content in each of ranges, a list
+        of (first, last) tuples, as a multipart message separated by boundary.
+        """
+        part_headers = [
+            u'{separator}--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {first}-{last}/{length}'
+            u'\r\n\r\n'.format(
+                separator=u'\r\n' if index else u'', boundary=boundary, content_type=content.content_type,
+                first=first, last=last, length=content.length,
+            ).encode('utf-8')
+            for index, (first, last) in enumerate(ranges)
+        ]
+        end = u'\r\n--{boundary}--\r\n'.format(boundary=boundary).encode('utf-8')
+
+        def stream_parts():
+            """
+            Yields the parts of the message, with the data of each range.
+            """
+            for part_header, (first, last) in zip(part_headers, ranges):
+                yield part_header
+                for chunk in content.stream_data_in_range(first, last):
+                    yield chunk
+            yield end
+
+        response = self.response_class(stream_parts())
+        response['Content-Length'] = str(
+            sum(len(part_header) for part_header in part_headers) +
+            sum(last - first + 1 for first, last in ranges) +
+            len(end)
+        )
+        response.status_code = 206  # Partial Content
+        return response
+
+    def is_not_modified(self, request, content):
+        """
+        Determines whether the client of a conditional request already has the
+        current version of the given content, from its ETag or last
+        modification date.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is sent.
+            etags = [etag.strip() for etag in if_none_match.split(',')]
+            if '*' in etags:
+                return True
+            # Weak comparison: W/"etag" matches "etag".
+            etags = [etag[2:] if etag.startswith('W/') else etag for etag in etags]
+            return bool(content.content_digest) and quote_etag(content.content_digest) in etags
+
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since is None or content.last_modified_at is None:
+            return False
+        # Last-Modified is sent with a precision of a second.
+        return calendar.timegm(content.last_modified_at.utctimetuple()) <= if_modified_since
+
+    def get_sendfile_url(self, content, location):
+        """
+        Returns the URL the web server serves the given content from, with
+        X-Accel-Redirect, copying it to the local disk cache if needed.
+
+        Returns None if the content isn't served this way: if there is no
+        local disk cache, the content is too large, it hasn't been requested
+        often enough yet to be copied, or it can't be copied.
+        """
+        root = settings.CONTENTSERVER_SENDFILE_ROOT
+        if not root or content.length is None or content.length > settings.CONTENTSERVER_SENDFILE_MAX_SIZE:
+            return None
+
+        # Each asset has its own directory, holding a copy of its latest version.  The
+        # name of the copy changes with the content, so that outdated copies are never sent.
+        directory_name = hashlib.sha1(text_type(location).encode('utf-8')).hexdigest()
+        name = hashlib.sha1(
+            u'{}@{}'.format(content.content_digest, content.last_modified_at).encode('utf-8')
+        ).hexdigest()
+        relative_path = u'{}/{}/{}'.format(directory_name[:2], directory_name, name)
+        path = os.path.join(root, relative_path)
+        try:
+            # The modification time of the copies orders them by last use, for eviction.
+            os.utime(path, None)
+        except OSError:
+            if count_content_request(relative_path) < settings.CONTENTSERVER_SENDFILE_MIN_REQUESTS:
+                return None
+            try:
+                self.copy_to_disk(location, path)
+            except (EnvironmentError, ItemNotFoundError, NotFoundError):
+                log.exception(u"Could not copy asset %s to %s", text_type(location), path)
+                return None
+            if not os.path.exists(path):
+                return None
+
+        return settings.CONTENTSERVER_SENDFILE_URL + relative_path
+
+    def copy_to_disk(self, location, path):
+        """
+        Copies the content at location to path, atomically, and deletes the
+        outdated copies of the content.
+        """
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # Unless it was created by another process in the meantime.
+            if not os.path.isdir(directory):
+                raise
+
+        content = AssetManager.find(location, as_stream=True)
+        # Files being copied are hidden, so that they aren't evicted.
+        file_descriptor, temp_path = tempfile.mkstemp(prefix='.', dir=directory)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                for chunk in content.stream_data():
+                    temp_file.write(chunk)
+            os.rename(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        finally:
+            content.close()
+
+        for filename in os.listdir(directory):
+            if not filename.startswith('.') and filename != os.path.basename(path):
+                _remove_copy(os.path.join(directory, filename))
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -219,6 +395,8 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        if content.content_digest:
+            response['ETag'] = quote_etag(content.content_digest)
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -278,6 +456,15 @@ class StaticContentServer(object):
         or loading it directly from the contentstore.
         """
 
+        if settings.CONTENTSERVER_STREAM_ASSETS:
+            # Only the metadata is cached: the data is streamed from the contentstore when
+            # the asset is sent, rather than kept in memory.
+            content = get_cached_content_metadata(location)
+            if content is None:
+                content = AssetManager.find(location, as_stream=True)
+                set_cached_content_metadata(content)
+            return content
+
         # See if we can load this item from cache.
         content = get_cached_content(location)
         if content is None:
@@ -297,6 +484,46 @@ class StaticContentServer(object):
         return content
 
 
+def evict_copies(root, max_total_size):
+    """
+    Deletes the least recently sent copies in the local disk cache at root
+    while its total size is over max_total_size.
+
+    This walks the whole cache, so it is run periodically (see the
+    evict_asset_copies management command) rather than when serving assets.
+    """
+    copies = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Deleted by another process in the meantime.
+                continue
+            copies.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in copies)
+    for _, size, path in sorted(copies):
+        if total_size <= max_total_size:
+            break
+        _remove_copy(path)
+        total_size -= size
+
+
+def _remove_copy(path):
+    """
+    Deletes a copy from the local disk cache, unless another process already did.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        if os.path.exists(path):
+            raise
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
@@ -8,11 +8,15 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import six
+import tempfile
 import unittest
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.management import call_command
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -245,13 +249,36 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with the content of each range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE=b'bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
+        self.assertEqual(resp.status_code, 206)
+        self.assertNotIn('Content-Range', resp)
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+        self.assertEqual(resp['Content-Length'], str(len(resp.content)))
+
+        boundary = resp['Content-Type'].split('boundary=')[1]
+        data = self.client.get(self.url_unlocked).content
+        parts = resp.content.split(b'--' + boundary)
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(parts[3], b'--\r\n')
+        expected_ranges = [(first_byte, last_byte), (max(0, self.length_unlocked - 100), self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:3], expected_ranges):
+            headers, body = part.split(b'\r\n\r\n', 1)
+            self.assertIn(b'Content-Range: bytes {}-{}/{}'.format(first, last, self.length_unlocked), headers)
+            # Each part ends with the line break before the next boundary.
+            self.assertEqual(body, data[first:last + 1] + b'\r\n')
+
+    def test_range_request_too_many_ranges(self):
+        """
+        Test that requests with too many ranges output the full content.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=' + ', '.join(['0-0'] * 21))
+
         self.assertEqual(resp.status_code, 200)
         self.assertNotIn('Content-Range', resp)
         self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
@@ -288,6 +315,152 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
             first=(self.length_unlocked), last=(self.length_unlocked)))
         self.assertEqual(resp.status_code, 416)
 
+    def test_if_none_match(self):
+        """
+        Test that conditional requests with the ETag of the asset get a 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=u'"other", W/{}'.format(etag))
+        self.assertEqual(resp.status_code, 304)
+
+        # If-Modified-Since is ignored when If-None-Match is sent.
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH='"other"', HTTP_IF_MODIFIED_SINCE=resp['Last-Modified']
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_if_modified_since(self):
+        """
+        Test that conditional requests get a 304 Not Modified unless the asset was modified since the given date.
+        """
+        resp = self.client.get(self.url_unlocked)
+        last_modified = datetime.datetime.strptime(resp['Last-Modified'], HTTP_DATE_FORMAT)
+
+        for if_modified_since, status_code in (
+                (last_modified, 304),
+                (last_modified + datetime.timedelta(days=1), 304),
+                (last_modified - datetime.timedelta(seconds=1), 200),
+        ):
+            resp = self.client.get(
+                self.url_unlocked, HTTP_IF_MODIFIED_SINCE=if_modified_since.strftime(HTTP_DATE_FORMAT)
+            )
+            self.assertEqual(resp.status_code, status_code)
+
+    def test_locked_asset_conditional_request(self):
+        """
+        Test that conditional requests for locked assets are authorized first.
+        """
+        resp = self.client.get(self.url_locked, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(resp.status_code, 403)
+
+    @override_settings(CONTENTSERVER_STREAM_ASSETS=True)
+    def test_stream_assets(self):
+        """
+        Test that assets are streamed, with only their metadata cached, when CONTENTSERVER_STREAM_ASSETS is set.
+        """
+        expected = AssetManager.find(self.unlocked_asset).data
+        for _ in range(2):
+            with patch('openedx.core.djangoapps.contentserver.middleware.set_cached_content') as mock_set_cached:
+                resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertTrue(resp.streaming)
+            self.assertEqual(b''.join(resp.streaming_content), expected)
+            self.assertFalse(mock_set_cached.called)
+
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=1-4')
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(b''.join(resp.streaming_content), expected[1:5])
+
+    def test_sendfile(self):
+        """
+        Test that assets are copied to the local disk cache and sent by the web server when
+        CONTENTSERVER_SENDFILE_ROOT is set.
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        with override_settings(CONTENTSERVER_SENDFILE_ROOT=root, CONTENTSERVER_SENDFILE_MIN_REQUESTS=1):
+            resp = self.client.get(self.url_unlocked)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.content, b'')
+            url = resp['X-Accel-Redirect']
+            self.assertTrue(url.startswith(settings.CONTENTSERVER_SENDFILE_URL))
+
+            path = os.path.join(root, url[len(settings.CONTENTSERVER_SENDFILE_URL):])
+            with open(path, 'rb') as sent_file:
+                self.assertEqual(sent_file.read(), AssetManager.find(self.unlocked_asset).data)
+
+            # The copy is reused.
+            with patch.object(StaticContentServer, 'copy_to_disk') as mock_copy_to_disk:
+                self.assertEqual(self.client.get(self.url_unlocked)['X-Accel-Redirect'], url)
+            self.assertFalse(mock_copy_to_disk.called)
+
+        with override_settings(CONTENTSERVER_SENDFILE_ROOT=root, CONTENTSERVER_SENDFILE_MAX_SIZE=1):
+            resp = self.client.get(self.url_unlocked)
+            self.assertNotIn('X-Accel-Redirect', resp)
+            self.assertEqual(len(resp.content), self.length_unlocked)
+
+    @override_settings(CONTENTSERVER_SENDFILE_MIN_REQUESTS=2)
+    @patch('openedx.core.djangoapps.contentserver.middleware.count_content_request')
+    def test_sendfile_after_min_requests(self, mock_count_content_request):
+        """
+        Test that assets are only copied to the local disk cache once they have been
+        requested CONTENTSERVER_SENDFILE_MIN_REQUESTS times.
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        with override_settings(CONTENTSERVER_SENDFILE_ROOT=root):
+            mock_count_content_request.return_value = 1
+            resp = self.client.get(self.url_unlocked)
+            self.assertNotIn('X-Accel-Redirect', resp)
+            self.assertEqual(os.listdir(root), [])
+
+            mock_count_content_request.return_value = 2
+            self.assertIn('X-Accel-Redirect', self.client.get(self.url_unlocked))
+
+    @override_settings(CONTENTSERVER_SENDFILE_MIN_REQUESTS=1)
+    def test_sendfile_eviction(self):
+        """
+        Test that outdated copies are deleted when an asset is copied, and that the
+        evict_asset_copies command deletes the least recently sent copies when the local
+        disk cache is over CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE.
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        with override_settings(
+            CONTENTSERVER_SENDFILE_ROOT=root, CONTENTSERVER_SENDFILE_MAX_TOTAL_SIZE=self.length_unlocked,
+        ):
+            url = self.client.get(self.url_unlocked)['X-Accel-Redirect']
+            path = os.path.join(root, url[len(settings.CONTENTSERVER_SENDFILE_URL):])
+
+            # An outdated copy of the asset, and the copy of another asset, sent long ago.
+            outdated_path = os.path.join(os.path.dirname(path), 'outdated')
+            other_path = os.path.join(root, 'other', 'copy')
+            os.makedirs(os.path.dirname(other_path))
+            for old_path in (outdated_path, other_path):
+                with open(old_path, 'wb') as old_file:
+                    old_file.write(b'old')
+                os.utime(old_path, (0, 0))
+            os.remove(path)
+
+            self.assertEqual(self.client.get(self.url_unlocked)['X-Accel-Redirect'], url)
+            self.assertTrue(os.path.exists(path))
+            self.assertFalse(os.path.exists(outdated_path))
+            # The cache isn't walked when serving assets.
+            self.assertTrue(os.path.exists(other_path))
+
+            call_command('evict_asset_copies')
+            self.assertTrue(os.path.exists(path))
+            self.assertFalse(os.path.exists(other_path))
+
     def test_vary_header_sent(self):
         """
         Tests that we're properly setting the Vary header to ensure browser requests don't get
@@ -2,17 +2,35 @@
 """" Common utilities for comment client wrapper """
 from __future__ import absolute_import
 
+import json
 import logging
+import os
+import threading
+from copy import deepcopy
 from uuid import uuid4
 
+import crum
 import requests
 import six
+from django.conf import settings
 from django.utils.translation import get_language
+from edx_django_utils.cache import RequestCache
+from requests.adapters import HTTPAdapter
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# Number of connections to the comments service kept open by each process,
+# unless the COMMENTS_SERVICE_POOL_SIZE setting is defined.
+DEFAULT_POOL_SIZE = 10
+
+RESPONSES_CACHE_NAMESPACE = u'comment_client.responses'
+
+_session_lock = threading.Lock()
+_session = None
+_session_key = None
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in six.iteritems(dic) if v is not None])
@@ -56,6 +74,18 @@ def perform_request(method, url, data_or_params=None, raw=False,
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
 
+    responses_cache = _get_responses_cache()
+    if responses_cache is not None:
+        if method.lower() != 'get':
+            # The responses of the previous requests may be changed by this one.
+            responses_cache.clear()
+        else:
+            cache_key = (
+                url, raw, headers['Accept-Language'], json.dumps(data_or_params, sort_keys=True, default=six.text_type)
+            )
+            if cache_key in responses_cache:
+                return deepcopy(responses_cache[cache_key])
+
     if method in ['post', 'put', 'patch']:
         data = data_or_params
         params = request_id_dict
@@ -63,7 +93,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+    session = _get_session()
+    response = (session or requests).request(
         method,
         url,
         data=data,
@@ -87,7 +118,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
-            return response.text
+            data = response.text
         else:
             try:
                 data = response.json()
@@ -98,7 +129,44 @@ def perform_request(method, url, data_or_params=None, raw=False,
                         content=response.text[:100]
                     )
                 )
-            return data
+        if responses_cache is not None and method.lower() == 'get':
+            responses_cache[cache_key] = deepcopy(data)
+        return data
+
+
+def _get_session():
+    """
+    Return the session whose pool of connections to the comments service is
+    shared by the requests of this process, or None if COMMENTS_SERVICE_POOL_SIZE
+    is 0, to open a new connection for each request.
+    """
+    global _session, _session_key  # pylint: disable=global-statement
+    pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', DEFAULT_POOL_SIZE)
+    if not pool_size:
+        return None
+    # The connections of the parent of a forked process can't be shared with it.
+    session_key = (os.getpid(), pool_size)
+    if _session_key != session_key:
+        with _session_lock:
+            if _session_key != session_key:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session, _session_key = session, session_key
+    return _session
+
+
+def _get_responses_cache():
+    """
+    Return the dict in which the responses to the GET requests made while
+    handling the current Django request are kept, so that identical requests
+    are only sent once, or None outside of a request or if
+    COMMENTS_SERVICE_COALESCE_REQUESTS is disabled.
+    """
+    if not getattr(settings, 'COMMENTS_SERVICE_COALESCE_REQUESTS', True) or crum.get_current_request() is None:
+        return None
+    return RequestCache(RESPONSES_CACHE_NAMESPACE).data
 
 
 class CommentClientError(Exception):
@@ -20,3 +20,7 @@ COURSE_UPDATE_WAFFLE_FLAG = CourseWaffleFlag(
 )
 
 DEBUG_MESSAGE_WAFFLE_FLAG = WaffleFlag(WAFFLE_FLAG_NAMESPACE, u'enable_debugging')
+
+# When enabled, the messages of each bin are enqueued in batches, with a task
+# sending each batch, rather than with a task per message.
+BATCH_SEND_WAFFLE_FLAG = WaffleFlag(WAFFLE_FLAG_NAMESPACE, u'send_messages_in_batches')
@@ -43,16 +43,22 @@ def course_has_highlights(course_key):
         return highlights_are_available
 
 
-def get_week_highlights(user, course_key, week_num):
+def get_week_highlights(user, course_key, week_num, course_cache=None):
     """
     Get highlights (list of unicode strings) for a given week.
     week_num starts at 1.
 
+    When getting the highlights of many learners, pass the same dict as
+    course_cache to load each course only once.
+
     Raises:
         CourseUpdateDoesNotExist: if highlights do not exist for
             the requested week_num.
     """
-    course_descriptor = _get_course_with_highlights(course_key)
+    if course_cache is None:
+        course_descriptor = _get_course_with_highlights(course_key)
+    else:
+        course_descriptor = _get_cached_course_with_highlights(course_key, course_cache)
     course_module = _get_course_module(course_descriptor, user)
     sections_with_highlights = _get_sections_with_highlights(course_module)
     highlights = _get_highlights_for_week(
@@ -81,6 +87,21 @@ def _get_course_with_highlights(course_key):
     return course_descriptor
 
 
+def _get_cached_course_with_highlights(course_key, course_cache):
+    """
+    Like _get_course_with_highlights, remembering the course, or the reason
+    it has no highlights, in course_cache.
+    """
+    if course_key not in course_cache:
+        try:
+            course_cache[course_key] = _get_course_with_highlights(course_key)
+        except CourseUpdateDoesNotExist as error:
+            course_cache[course_key] = error
+    if isinstance(course_cache[course_key], CourseUpdateDoesNotExist):
+        raise course_cache[course_key]
+    return course_cache[course_key]
+
+
 def _get_course_descriptor(course_key):
     course_descriptor = modulestore().get_course(course_key, depth=1)
     if course_descriptor is None:
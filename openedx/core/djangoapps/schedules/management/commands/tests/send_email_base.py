@@ -27,11 +27,12 @@ from course_modes.tests.factories import CourseModeFactory
 from courseware.models import DynamicUpgradeDeadlineConfiguration
 from lms.djangoapps.commerce.models import CommerceConfiguration
 from openedx.core.djangoapps.schedules import resolvers, tasks
+from openedx.core.djangoapps.schedules.config import BATCH_SEND_WAFFLE_FLAG
 from openedx.core.djangoapps.schedules.resolvers import _get_datetime_beginning_of_day
 from openedx.core.djangoapps.schedules.tests.factories import ScheduleConfigFactory, ScheduleFactory
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteConfigurationFactory, SiteFactory
 from openedx.core.djangoapps.theming.tests.test_util import with_comprehensive_theme
-from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES
+from openedx.core.djangoapps.waffle_utils.testutils import WAFFLE_TABLES, override_waffle_flag
 from openedx.core.djangolib.testing.utils import FilteredQueryCountMixin
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
@@ -235,6 +236,42 @@ class ScheduleSendEmailTestMixin(FilteredQueryCountMixin):
             self.assertEqual(mock_schedule_send.apply_async.call_count, schedule_count)
             self.assertFalse(mock_ace.send.called)
 
+    @override_waffle_flag(BATCH_SEND_WAFFLE_FLAG, True)
+    @patch.object(tasks, 'ace')
+    def test_send_in_batches(self, mock_ace):
+        first_user_id = self._next_user_id()
+        for user_index in range(3):
+            self._schedule_factory(
+                enrollment__user=UserFactory.create(id=first_user_id + user_index * self.task.num_bins),
+            )
+        _, offset, target_day, _ = self._get_dates()
+
+        with patch.object(self.resolver, 'send_batch_size', 2):
+            with patch.object(self.task, 'async_send_task') as mock_schedule_send:
+                with patch.object(self.task, 'async_send_batch_task') as mock_schedule_send_batch:
+                    self.task().apply(kwargs=dict(
+                        site_id=self.site_config.site.id, target_day_str=serialize(target_day), day_offset=offset,
+                        bin_num=first_user_id % self.task.num_bins,
+                    ))
+
+        self.assertFalse(mock_schedule_send.apply_async.called)
+        batches = [args[1] for (args,), _kwargs in mock_schedule_send_batch.apply_async.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertFalse(mock_ace.send.called)
+
+        with patch('openedx.core.djangoapps.schedules.tasks.segment.track') as mock_segment_track:
+            self.task.async_send_batch_task(self.site_config.site.id, batches[0])
+        self.assertEqual(mock_ace.send.call_count, 2)
+        self.assertEqual(mock_segment_track.call_count, 2)
+
+        # A message that fails to be sent doesn't keep the others from being sent.
+        mock_ace.send.reset_mock()
+        mock_ace.send.side_effect = [Exception('Failed to send'), None]
+        with patch('openedx.core.djangoapps.schedules.tasks.segment.track') as mock_segment_track:
+            self.task.async_send_batch_task(self.site_config.site.id, batches[0])
+        self.assertEqual(mock_ace.send.call_count, 2)
+        self.assertEqual(mock_segment_track.call_count, 1)
+
     def test_no_course_overview(self):
         current_day, offset, target_day, upgrade_deadline = self._get_dates()
         # Don't use CourseEnrollmentFactory since it creates a course overview
@@ -16,6 +16,7 @@ from edx_django_utils.monitoring import function_trace, set_custom_metric
 
 from courseware.date_summary import verified_upgrade_deadline_link, verified_upgrade_link_is_valid
 from openedx.core.djangoapps.ace_common.template_context import get_base_template_context
+from openedx.core.djangoapps.schedules.config import BATCH_SEND_WAFFLE_FLAG
 from openedx.core.djangoapps.schedules.content_highlights import get_week_highlights
 from openedx.core.djangoapps.schedules.exceptions import CourseUpdateDoesNotExist
 from openedx.core.djangoapps.schedules.models import Schedule, ScheduleExperience
@@ -31,6 +32,9 @@ RECURRING_NUDGE_NUM_BINS = DEFAULT_NUM_BINS
 UPGRADE_REMINDER_NUM_BINS = DEFAULT_NUM_BINS
 COURSE_UPDATE_NUM_BINS = DEFAULT_NUM_BINS
 
+# The number of messages sent by each task, when they are sent in batches.
+SEND_BATCH_SIZE = 100
+
 
 @attr.s
 class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
@@ -38,7 +42,11 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
     Identifies learners to send messages to, pulls all needed context and sends a message to each learner.
 
     Note that for performance reasons, it actually enqueues a task to send the message instead of sending the message
-    directly.
+    directly. When the BATCH_SEND_WAFFLE_FLAG is enabled and an async_send_batch_task is given, the messages are
+    enqueued in batches of send_batch_size instead, as they are built.
+
+    The values which only depend on the course, such as the course home URL, are computed once per course and shared
+    by all the messages of the bin.
 
     Arguments:
         async_send_task -- celery task function that sends the message
@@ -52,12 +60,14 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
                         org_list or strictly include (False) them (default: False)
         override_recipient_email -- string email address that should receive all emails instead of the normal
                                     recipient. (default: None)
+        async_send_batch_task -- celery task function that sends a list of messages (default: None)
 
     Static attributes:
         schedule_date_field -- the name of the model field that represents the date that offsets should be computed
                                relative to. For example, if this resolver finds schedules that started 7 days ago
                                this variable should be set to "start".
         num_bins -- the int number of bins to split the users into
+        send_batch_size -- the int number of messages enqueued at once, when they are sent in batches
         experience_filter -- a queryset filter used to select only the users who should be getting this message as part
                              of their experience. This defaults to users without a specified experience type and those
                              in the "recurring nudges and upgrade reminder" experience.
@@ -68,17 +78,52 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
     day_offset = attr.ib()
     bin_num = attr.ib()
     override_recipient_email = attr.ib(default=None)
+    async_send_batch_task = attr.ib(default=None)
 
     schedule_date_field = None
     num_bins = DEFAULT_NUM_BINS
+    send_batch_size = SEND_BATCH_SIZE
     experience_filter = (Q(experience__experience_type=ScheduleExperience.EXPERIENCES.default)
                          | Q(experience__isnull=True))
 
     def __attrs_post_init__(self):
         # TODO: in the next refactor of this task, pass in current_datetime instead of reproducing it here
         self.current_datetime = self.target_datetime - datetime.timedelta(days=self.day_offset)
+        self._course_values = {}
 
     def send(self, msg_type):
+        if self.async_send_batch_task is not None and BATCH_SEND_WAFFLE_FLAG.is_enabled():
+            self._send_in_batches(msg_type)
+            return
+
+        for msg_str in self._personalized_messages(msg_type):
+            with function_trace('enqueue_send_task'):
+                self.async_send_task.apply_async((self.site.id, msg_str), retry=False)
+
+    def _send_in_batches(self, msg_type):
+        """
+        Enqueue the messages in batches of `send_batch_size`, as they are built.
+        """
+        batch = []
+        for msg_str in self._personalized_messages(msg_type):
+            batch.append(msg_str)
+            if len(batch) >= self.send_batch_size:
+                self._enqueue_batch(batch)
+                batch = []
+        if batch:
+            self._enqueue_batch(batch)
+
+    def _enqueue_batch(self, batch):
+        # pylint: disable=missing-docstring
+        with function_trace('enqueue_send_batch_task'):
+            self.async_send_batch_task.apply_async((self.site.id, batch), retry=False)
+
+    def _personalized_messages(self, msg_type):
+        """
+        Yield the serialized message for each recipient of the bin.
+
+        The messages are serialized as they are built, as the template context is shared between them.
+        """
         for (user, language, context) in self.schedules_for_bin():
             msg = msg_type.personalize(
                 Recipient(
@@ -88,8 +133,37 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
                 language,
                 context,
             )
-            with function_trace('enqueue_send_task'):
-                self.async_send_task.apply_async((self.site.id, str(msg)), retry=False)
+            yield str(msg)
+
+    def get_course_value(self, name, course_id, compute):
+        """
+        Return the value `name` of the course `course_id`, computed by calling `compute` the first time it is needed
+        by this resolver, so that it is shared by all the messages of the bin.
+        """
+        key = (name, course_id)
+        if key not in self._course_values:
+            self._course_values[key] = compute()
+        return self._course_values[key]
+
+    def get_course_language(self, course):
+        """
+        Return the released language closest to the language of the `course` overview.
+        """
+        return self.get_course_value('language', course.id, lambda: course.closest_released_language)
+
+    def get_course_home_url(self, course_id):
+        """
+        Return the trackable home page URL of the course.
+        """
+        return self.get_course_value('home_url', course_id, lambda: _get_trackable_course_home_url(course_id))
+
+    def get_upsell_information(self, user, schedule):
+        """
+        Return the upsell context of the user's schedule, see `_get_upsell_information_for_schedule`.
+        """
+        return _get_upsell_information_for_schedule(
+            user, schedule, language=self.get_course_language(schedule.enrollment.course)
+        )
 
     def get_schedules_with_target_date_by_bin_and_orgs(
         self, order_by='enrollment__user__id'
@@ -196,7 +270,7 @@ class BinnedSchedulesBaseResolver(PrefixedDebugLoggerMixin, RecipientResolver):
             except InvalidContextError:
                 continue
 
-            yield (user, first_schedule.enrollment.course.closest_released_language, template_context)
+            yield (user, self.get_course_language(first_schedule.enrollment.course), template_context)
 
     def get_template_context(self, user, user_schedules):
         """
@@ -246,11 +320,11 @@ class RecurringNudgeResolver(BinnedSchedulesBaseResolver):
         first_schedule = user_schedules[0]
         context = {
             'course_name': first_schedule.enrollment.course.display_name,
-            'course_url': _get_trackable_course_home_url(first_schedule.enrollment.course_id),
+            'course_url': self.get_course_home_url(first_schedule.enrollment.course_id),
         }
 
         # Information for including upsell messaging in template.
-        context.update(_get_upsell_information_for_schedule(user, first_schedule))
+        context.update(self.get_upsell_information(user, first_schedule))
 
         return context
 
@@ -276,7 +350,7 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
         first_valid_upsell_context = None
         first_schedule = None
         for schedule in user_schedules:
-            upsell_context = _get_upsell_information_for_schedule(user, schedule)
+            upsell_context = self.get_upsell_information(user, schedule)
             if not upsell_context['show_upsell']:
                 continue
 
@@ -286,7 +360,7 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
             course_id_str = str(schedule.enrollment.course_id)
             course_id_strs.append(course_id_str)
             course_links.append({
-                'url': _get_trackable_course_home_url(schedule.enrollment.course_id),
+                'url': self.get_course_home_url(schedule.enrollment.course_id),
                 'name': schedule.enrollment.course.display_name
             })
 
@@ -304,10 +378,12 @@ class UpgradeReminderResolver(BinnedSchedulesBaseResolver):
         return context
 
 
-def _get_upsell_information_for_schedule(user, schedule):
+def _get_upsell_information_for_schedule(user, schedule, language=None):
     template_context = {}
     enrollment = schedule.enrollment
     course = enrollment.course
+    if language is None:
+        language = course.closest_released_language
 
     verified_upgrade_link = _get_verified_upgrade_link(user, schedule)
     has_verified_upgrade_link = verified_upgrade_link is not None
@@ -316,7 +392,7 @@ def _get_upsell_information_for_schedule(user, schedule):
         template_context['upsell_link'] = verified_upgrade_link
         template_context['user_schedule_upgrade_deadline_time'] = translate_date(
             date=enrollment.dynamic_upgrade_deadline,
-            language=course.closest_released_language,
+            language=language,
         )
 
     template_context['show_upsell'] = has_verified_upgrade_link
@@ -345,13 +421,18 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
             order_by='enrollment__course',
         )
 
+        # The courses with their highlights, loaded once for all the learners of each course.
+        highlight_courses = {}
+
         template_context = get_base_template_context(self.site)
         for schedule in schedules:
             enrollment = schedule.enrollment
             user = enrollment.user
 
             try:
-                week_highlights = get_week_highlights(user, enrollment.course_id, week_num)
+                week_highlights = get_week_highlights(
+                    user, enrollment.course_id, week_num, course_cache=highlight_courses,
+                )
             except CourseUpdateDoesNotExist:
                 LOG.warning(
                     u'Weekly highlights for user {} in week {} of course {} does not exist or is disabled'.format(
@@ -362,7 +443,7 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
             else:
                 template_context.update({
                     'course_name': schedule.enrollment.course.display_name,
-                    'course_url': _get_trackable_course_home_url(enrollment.course_id),
+                    'course_url': self.get_course_home_url(enrollment.course_id),
 
                     'week_num': week_num,
                     'week_highlights': week_highlights,
@@ -370,9 +451,9 @@ class CourseUpdateResolver(BinnedSchedulesBaseResolver):
                     # This is used by the bulk email optout policy
                     'course_ids': [str(enrollment.course_id)],
                 })
-                template_context.update(_get_upsell_information_for_schedule(user, schedule))
+                template_context.update(self.get_upsell_information(user, schedule))
 
-                yield (user, schedule.enrollment.course.closest_released_language, template_context)
+                yield (user, self.get_course_language(schedule.enrollment.course), template_context)
 
 
 def _get_trackable_course_home_url(course_id):
@@ -69,6 +69,7 @@ class ScheduleMessageBaseTask(LoggedTask):
     log_prefix = None
     resolver = None  # define in subclass
     async_send_task = None  # define in subclass
+    async_send_batch_task = None  # define in subclass
 
     @classmethod
     def log_debug(cls, message, *args, **kwargs):
@@ -128,6 +129,7 @@ class ScheduleMessageBaseTask(LoggedTask):
                 day_offset,
                 bin_num,
                 override_recipient_email=override_recipient_email,
+                async_send_batch_task=self.async_send_batch_task,
             ).send(msg_type)
 
     def make_message_type(self, day_offset):
@@ -144,6 +146,16 @@ def _recurring_nudge_schedule_send(site_id, msg_str):
     )
 
 
+@task(base=LoggedTask, ignore_result=True, routing_key=ROUTING_KEY)
+def _recurring_nudge_schedule_send_batch(site_id, msg_strs):
+    _schedule_send_batch(
+        msg_strs,
+        site_id,
+        'deliver_recurring_nudge',
+        RECURRING_NUDGE_LOG_PREFIX,
+    )
+
+
 @task(base=LoggedTask, ignore_result=True, routing_key=ROUTING_KEY)
 def _upgrade_reminder_schedule_send(site_id, msg_str):
     _schedule_send(
@@ -154,6 +166,16 @@ def _upgrade_reminder_schedule_send(site_id, msg_str):
     )
 
 
+@task(base=LoggedTask, ignore_result=True, routing_key=ROUTING_KEY)
+def _upgrade_reminder_schedule_send_batch(site_id, msg_strs):
+    _schedule_send_batch(
+        msg_strs,
+        site_id,
+        'deliver_upgrade_reminder',
+        UPGRADE_REMINDER_LOG_PREFIX,
+    )
+
+
 @task(base=LoggedTask, ignore_result=True, routing_key=ROUTING_KEY)
 def _course_update_schedule_send(site_id, msg_str):
     _schedule_send(
@@ -164,12 +186,23 @@ def _course_update_schedule_send(site_id, msg_str):
     )
 
 
+@task(base=LoggedTask, ignore_result=True, routing_key=ROUTING_KEY)
+def _course_update_schedule_send_batch(site_id, msg_strs):
+    _schedule_send_batch(
+        msg_strs,
+        site_id,
+        'deliver_course_update',
+        COURSE_UPDATE_LOG_PREFIX,
+    )
+
+
 class ScheduleRecurringNudge(ScheduleMessageBaseTask):
     num_bins = resolvers.RECURRING_NUDGE_NUM_BINS
     enqueue_config_var = 'enqueue_recurring_nudge'
     log_prefix = RECURRING_NUDGE_LOG_PREFIX
     resolver = resolvers.RecurringNudgeResolver
     async_send_task = _recurring_nudge_schedule_send
+    async_send_batch_task = _recurring_nudge_schedule_send_batch
 
     def make_message_type(self, day_offset):
         return message_types.RecurringNudge(abs(day_offset))
@@ -181,6 +214,7 @@ class ScheduleUpgradeReminder(ScheduleMessageBaseTask):
     log_prefix = UPGRADE_REMINDER_LOG_PREFIX
     resolver = resolvers.UpgradeReminderResolver
     async_send_task = _upgrade_reminder_schedule_send
+    async_send_batch_task = _upgrade_reminder_schedule_send_batch
 
     def make_message_type(self, day_offset):
         return message_types.UpgradeReminder()
@@ -192,6 +226,7 @@ class ScheduleCourseUpdate(ScheduleMessageBaseTask):
     log_prefix = COURSE_UPDATE_LOG_PREFIX
     resolver = resolvers.CourseUpdateResolver
     async_send_task = _course_update_schedule_send
+    async_send_batch_task = _course_update_schedule_send_batch
 
     def make_message_type(self, day_offset):
         return message_types.CourseUpdate()
@@ -203,11 +238,38 @@ def _schedule_send(msg_str, site_id, delivery_config_var, log_prefix):
         msg = Message.from_string(msg_str)
 
         user = User.objects.get(username=msg.recipient.username)
-        with emulate_http_request(site=site, user=user):
-            _annonate_send_task_for_monitoring(msg)
-            LOG.debug(u'%s: Sending message = %s', log_prefix, msg_str)
-            ace.send(msg)
-            _track_message_sent(site, user, msg)
+        _send_message(site, user, msg, msg_str, log_prefix)
+
+
+def _schedule_send_batch(msg_strs, site_id, delivery_config_var, log_prefix):
+    """
+    Send each of the serialized messages, loading the site, its configuration
+    and the recipients once for all of them.
+    """
+    site = Site.objects.select_related('configuration').get(pk=site_id)
+    if _is_delivery_enabled(site, delivery_config_var, log_prefix):
+        messages = [(Message.from_string(msg_str), msg_str) for msg_str in msg_strs]
+        usernames = [msg.recipient.username for msg, _ in messages]
+        users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+        for msg, msg_str in messages:
+            user = users.get(msg.recipient.username)
+            if user is None:
+                LOG.warning(u'%s: No user %s to send message %s to', log_prefix, msg.recipient.username, msg.uuid)
+                continue
+            try:
+                _send_message(site, user, msg, msg_str, log_prefix)
+            except Exception:  # pylint: disable=broad-except
+                # Keep sending the rest of the batch.
+                LOG.exception(u'%s: Failed to send message %s', log_prefix, msg.uuid)
+
+
+def _send_message(site, user, msg, msg_str, log_prefix):
+    # pylint: disable=missing-docstring
+    with emulate_http_request(site=site, user=user):
+        _annonate_send_task_for_monitoring(msg)
+        LOG.debug(u'%s: Sending message = %s', log_prefix, msg_str)
+        ace.send(msg)
+        _track_message_sent(site, user, msg)
 
 
 def _track_message_sent(site, user, msg):
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+from mock import patch
+
 from openedx.core.djangoapps.schedules.config import COURSE_UPDATE_WAFFLE_FLAG
+from openedx.core.djangoapps.schedules import content_highlights
 from openedx.core.djangoapps.schedules.content_highlights import course_has_highlights, get_week_highlights
 from openedx.core.djangoapps.schedules.exceptions import CourseUpdateDoesNotExist
 from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
@@ -69,6 +72,28 @@ class TestContentHighlights(ModuleStoreTestCase):
             highlights,
         )
 
+    @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
+    def test_course_cache(self):
+        with self.store.bulk_operations(self.course_key):
+            self._create_chapter(highlights=[u'highlights'])
+        other_user = UserFactory.create()
+        CourseEnrollment.enroll(other_user, self.course_key)
+        nonexistent_course_key = self.course_key.replace(run='no_such_run')
+
+        course_cache = {}
+        with patch.object(
+            content_highlights, '_get_course_descriptor', wraps=content_highlights._get_course_descriptor
+        ) as mock_get_course_descriptor:
+            for user in (self.user, other_user):
+                self.assertEqual(
+                    get_week_highlights(user, self.course_key, week_num=1, course_cache=course_cache),
+                    [u'highlights'],
+                )
+                with self.assertRaises(CourseUpdateDoesNotExist):
+                    get_week_highlights(user, nonexistent_course_key, week_num=1, course_cache=course_cache)
+
+        self.assertEqual(mock_get_course_descriptor.call_count, 2)
+
     @override_waffle_flag(COURSE_UPDATE_WAFFLE_FLAG, True)
     def test_highlights_disabled_for_messaging(self):
         highlights = [u'A test highlight.']
@@ -4,6 +4,7 @@ Configuration for the openedx.core.djangoapps.util Django application
 from __future__ import absolute_import
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UtilConfig(AppConfig):
@@ -16,6 +17,14 @@ class UtilConfig(AppConfig):
 
     def ready(self):
         """
-        Registers signal handlers at startup.
+        Registers signal handlers, and configures the sandbox pool, the
+        local cache of jailed code results and the cache of parsed problems
+        at startup.
         """
         import openedx.core.djangoapps.util.signals  # pylint: disable=unused-variable
+        from capa import parsed_problem_cache
+        from capa.safe_exec import configure_local_cache, configure_sandbox_pool
+
+        configure_sandbox_pool(settings.CODE_JAIL_POOL['size'], settings.CODE_JAIL_POOL['max_uses'])
+        configure_local_cache(settings.SAFE_EXEC_LOCAL_CACHE_SIZE)
+        parsed_problem_cache.configure_cache(settings.PARSED_PROBLEM_CACHE_SIZE)
@@ -0,0 +1,104 @@
+"""
+Django command to compare the latency of running jailed code in a new sandbox
+for each execution, and in the pool of warm sandbox processes.
+
+Example usage:
+    $ ./manage.py lms benchmark_safe_exec --iterations 200 --pool-size 2
+"""
+from __future__ import absolute_import, division
+
+import time
+
+from codejail import jail_code
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from six.moves import range
+
+from capa.safe_exec import configure_sandbox_pool, safe_exec
+
+# Typical problem code: numpy, math and random, as in a CustomResponse.
+DEFAULT_CODE = """\
+import numpy
+a = numpy.array([[random.randint(1, 9), 2], [3, random.randint(1, 9)]])
+b = numpy.array([1, 2])
+x = [float(v) for v in numpy.linalg.solve(a, b)]
+y = math.sqrt(sum(v * v for v in x))
+"""
+
+
+class Command(BaseCommand):
+    """
+    benchmark_safe_exec command
+    """
+    help = "Compare the latency of capa's safe_exec with and without the sandbox pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=100,
+            help='Number of executions in each mode.',
+        )
+        parser.add_argument(
+            '--pool-size',
+            type=int,
+            default=max(settings.CODE_JAIL_POOL['size'], 1),
+            help='Size of the sandbox pool.',
+        )
+        parser.add_argument(
+            '--code-file',
+            help='File with the code to run, instead of a sample of problem code.',
+        )
+
+    def handle(self, *args, **options):
+        code = DEFAULT_CODE
+        if options['code_file']:
+            with open(options['code_file']) as code_file:
+                code = code_file.read()
+
+        self._configure_codejail()
+        try:
+            configure_sandbox_pool(0, 0)
+            self._report('new sandbox per execution', self._run(code, options['iterations']))
+
+            configure_sandbox_pool(options['pool_size'], settings.CODE_JAIL_POOL['max_uses'])
+            self._report('sandbox pool', self._run(code, options['iterations']))
+        finally:
+            configure_sandbox_pool(settings.CODE_JAIL_POOL['size'], settings.CODE_JAIL_POOL['max_uses'])
+
+    def _configure_codejail(self):
+        """
+        Configures codejail from settings, as its middleware does for requests.
+        """
+        python_bin = settings.CODE_JAIL.get('python_bin')
+        if python_bin:
+            jail_code.configure('python', python_bin, user=settings.CODE_JAIL['user'])
+        for name, value in settings.CODE_JAIL.get('limits', {}).items():
+            jail_code.set_limit(name, value)
+
+    def _run(self, code, iterations):
+        """
+        Returns the sorted latencies of the executions of `code`, in seconds.
+        """
+        latencies = []
+        for iteration in range(iterations):
+            start = time.time()
+            safe_exec(code, {}, random_seed=iteration)
+            latencies.append(time.time() - start)
+        return sorted(latencies)
+
+    def _report(self, mode, latencies):
+        """
+        Prints the latency percentiles of a mode.
+        """
+        def percentile(value):
+            """
+            Returns the latency in milliseconds at the given percentile.
+            """
+            return latencies[min(len(latencies) - 1, int(len(latencies) * value / 100))] * 1000
+
+        self.stdout.write(
+            u'{}: p50 {:.1f} ms, p90 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms'.format(
+                mode, percentile(50), percentile(90), percentile(99), latencies[-1] * 1000,
+            )
+        )